@@ -42,11 +42,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "tasks.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "tasks.middleware.ReplicaRoutingMiddleware",
+    "tasks.middleware.EmployeeMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -74,14 +77,106 @@ WSGI_APPLICATION = "productivity_manager.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+# SQLITE_PRODUCTION=1 enables the production profile (tasks.sqlite): WAL
+# journaling, synchronous=NORMAL, a busy timeout, a larger page cache and
+# memory map, and persistent, health-checked connections.
+
+SQLITE_PRODUCTION = os.environ.get("SQLITE_PRODUCTION", "") == "1"
 
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": 600 if SQLITE_PRODUCTION else 0,
+        "CONN_HEALTH_CHECKS": SQLITE_PRODUCTION,
+    }
+}
+
+# Read replicas (tasks.routing)
+# List, dashboard and report views read from a replica whose lag is within
+# their tolerance; writes and a writing session's reads use "default".
+# To try it locally, set REPLICA_DATABASE to a second SQLite file and
+# refresh it from the primary with `manage.py sync_replicas`.
+
+REPLICA_DATABASE = os.environ.get("REPLICA_DATABASE", "")
+
+# The alias always exists, so tests can mirror it onto the test database;
+# REPLICA_DATABASES decides whether views read from it, and Django only
+# connects to it when it is used.
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "NAME": REPLICA_DATABASE or BASE_DIR / "db-replica.sqlite3",
+    "TEST": {"MIRROR": "default"},
+}
+
+DATABASE_ROUTERS = ["tasks.routing.ReplicaRouter"]
+
+REPLICA_DATABASES = ["replica"] if REPLICA_DATABASE else []
+
+# Seconds a session that wrote keeps reading from the primary; None pins it
+# for the rest of the session.
+REPLICA_PIN_SECONDS = None
+
+# Lag tolerated per URL name, in seconds, overriding the views' defaults.
+REPLICA_MAX_LAG = {}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) in production.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "task-management"),
     }
 }
 
+# Seconds rendered listing fragments stay cached.
+FRAGMENT_CACHE_TIMEOUT = 600
+
+# Request metrics (tasks.metrics)
+# Requests slower than this many seconds are logged with their worst SQL.
+SLOW_REQUEST_THRESHOLD = 1.0
+
+# Bearer token Prometheus sends to /metrics; without one only staff may read.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Change feed (tasks.outbox)
+# Bearer token consumers send to /changes; without one only staff may read.
+CHANGES_TOKEN = os.environ.get("CHANGES_TOKEN", "")
+
+# Most change events returned per /changes request.
+CHANGES_PAGE_SIZE = 1000
+
+# Largest page of rows the JSON API returns.
+API_PAGE_SIZE = 100
+
+# Background jobs (manage.py run_workers)
+# Reminder digests are printed to the console unless EMAIL_BACKEND is set.
+
+EMAIL_BACKEND = os.environ.get(
+    "EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend"
+)
+
+# Base URL of links in emails, e.g. onboarding password reset links.
+SITE_URL = os.environ.get("SITE_URL", "http://localhost:8000")
+
+# Days ahead the daily reminder digest looks for deadlines.
+REMINDER_DAYS = 1
+
+# Days ahead the dashboards list occurrences of recurring tasks.
+RECURRENCE_WINDOW_DAYS = 14
+
+# Seconds after which a running job is assumed abandoned and retried.
+JOB_LOCK_TIMEOUT = 900
+
+# Days after which completed tasks, and time logs, move to the archive tables.
+ARCHIVE_TASKS_AFTER_DAYS = 90
+ARCHIVE_TIME_LOGS_AFTER_DAYS = 365
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -0,0 +1,217 @@
+"""
+JSON API resources.
+
+``tasks.views`` serves every :data:`RESOURCES` entry as a list at
+``/api/<name>/`` and one row at ``/api/<name>/<id>/``. Rows are read with
+``values()`` and encoded from the dicts it returns, so no model instances
+are built:
+
+* ``?fields=a,b`` selects only those columns; the id is always included,
+* ``?include=x,y`` adds the rows referenced by the foreign keys ``x`` and
+  ``y`` under ``included``, loaded with one query per include for the page,
+* lists are keyset paginated by id through the ``cursor`` parameter of
+  ``tasks.pagination``; ``?limit=`` shortens pages,
+* responses carry an ``ETag`` built from the version of each resource's
+  cache namespace (see ``tasks.caching``), so clients revalidate with
+  ``If-None-Match`` and get ``304 Not Modified`` until a row changes.
+
+Users list the rows ``visible_to`` them (see ``tasks.permissions``) and
+every row those reference.
+"""
+
+import datetime
+from dataclasses import dataclass, field
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from .models import Department, Employee, Goal, JournalEntry, Task, TimeLog
+
+# Namespaces deciding which rows a user sees, part of every resource's ETag.
+SCOPE_NAMESPACES = ("departments", "employees", "users")
+
+
+@dataclass(frozen=True)
+class Resource:
+    """
+    Description of one API resource.
+
+    Attributes:
+        model (Model): Model whose rows are served.
+        columns (tuple): ``(name, lookup)`` pairs passed to ``values``; the
+            first is the id.
+        namespace (str): Cache namespace versioning the rows.
+        includes (dict): ``{column: resource}`` of the foreign keys that
+            ``?include=`` expands.
+    """
+
+    model: type
+    columns: tuple
+    namespace: str
+    includes: dict = field(default_factory=dict)
+
+    @property
+    def names(self):
+        """Names of the columns, in order."""
+        return [name for name, _ in self.columns]
+
+
+RESOURCES = {
+    "tasks": Resource(
+        model=Task,
+        columns=(
+            ("id", "id"),
+            ("title", "title"),
+            ("description", "description"),
+            ("assigned_to", "assigned_to"),
+            ("due_date", "due_date"),
+            ("completed", "completed"),
+            ("priority", "priority"),
+            ("recurrence", "recurrence"),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+        ),
+        namespace="tasks",
+        includes={"assigned_to": "employees"},
+    ),
+    "timelogs": Resource(
+        model=TimeLog,
+        columns=(
+            ("id", "id"),
+            ("task", "task"),
+            ("employee", "employee"),
+            ("start_time", "start_time"),
+            ("end_time", "end_time"),
+            ("duration_seconds", "duration"),
+        ),
+        namespace="timelogs",
+        includes={"task": "tasks", "employee": "employees"},
+    ),
+    "goals": Resource(
+        model=Goal,
+        columns=(
+            ("id", "id"),
+            ("employee", "employee"),
+            ("title", "title"),
+            ("description", "description"),
+            ("target_date", "target_date"),
+            ("achieved", "achieved"),
+        ),
+        namespace="goals",
+        includes={"employee": "employees"},
+    ),
+    "journals": Resource(
+        model=JournalEntry,
+        columns=(
+            ("id", "id"),
+            ("employee", "employee"),
+            ("entry_date", "entry_date"),
+            ("content", "content"),
+        ),
+        namespace="journals",
+        includes={"employee": "employees"},
+    ),
+    "employees": Resource(
+        model=Employee,
+        columns=(
+            ("id", "id"),
+            ("username", "user__username"),
+            ("first_name", "user__first_name"),
+            ("last_name", "user__last_name"),
+            ("department", "department"),
+            ("date_joined", "date_joined"),
+            ("position", "position"),
+            ("is_active", "is_active"),
+        ),
+        namespace="employees",
+        includes={"department": "departments"},
+    ),
+    "departments": Resource(
+        model=Department,
+        columns=(
+            ("id", "id"),
+            ("name", "name"),
+            ("hod", "hod"),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+        ),
+        namespace="departments",
+    ),
+}
+
+
+class Encoder(DjangoJSONEncoder):
+    """JSON encoder writing durations as seconds, like the exports."""
+
+    def default(self, o):
+        if isinstance(o, datetime.timedelta):
+            return o.total_seconds()
+        return super().default(o)
+
+
+def parse_list(value):
+    """Split a comma separated parameter into its non-empty items."""
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def select(resource, fields=(), include=()):
+    """
+    Return the columns of ``resource`` to read.
+
+    ``fields`` limits them to the named ones and ``include`` adds the
+    foreign keys to expand. Raises ``ValueError`` for unknown names.
+    """
+    unknown = [name for name in fields if name not in resource.names]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+    unknown = [name for name in include if name not in resource.includes]
+    if unknown:
+        raise ValueError(f"Cannot include: {', '.join(unknown)}.")
+    if not fields:
+        return resource.columns
+    wanted = {"id", *fields, *include}
+    return tuple(column for column in resource.columns if column[0] in wanted)
+
+
+def values(queryset, columns):
+    """Return ``queryset`` as dicts holding ``columns``."""
+    plain = [name for name, lookup in columns if name == lookup]
+    renamed = {name: F(lookup) for name, lookup in columns if name != lookup}
+    return queryset.values(*plain, **renamed)
+
+
+def included(resource, rows, include):
+    """
+    Return ``{resource name: [rows]}`` referenced by the ``include`` keys.
+
+    Runs one query per included resource, whatever the number of rows.
+    """
+    wanted = {}
+    for name in include:
+        ids = wanted.setdefault(resource.includes[name], set())
+        ids.update(row[name] for row in rows if row[name] is not None)
+    found = {}
+    for name, ids in wanted.items():
+        target = RESOURCES[name]
+        found[name] = (
+            list(
+                values(
+                    target.model.objects.filter(pk__in=ids).order_by("id"),
+                    target.columns,
+                )
+            )
+            if ids
+            else []
+        )
+    return found
+
+
+def namespaces(resource, include=()):
+    """Return the cache namespaces the rows and includes of ``resource`` follow."""
+    names = {resource.namespace, *SCOPE_NAMESPACES}
+    names.update(
+        RESOURCES[resource.includes[name]].namespace
+        for name in include
+        if name in resource.includes
+    )
+    return tuple(sorted(names))
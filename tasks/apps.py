@@ -12,3 +12,7 @@ class TasksConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "tasks"
+
+    def ready(self):
+        """Connect the signal handlers that maintain derived data."""
+        from . import signals, sqlite  # noqa: F401  pylint: disable=unused-import
@@ -0,0 +1,309 @@
+"""
+Archival tier and background deletes.
+
+Completed tasks and old time logs would otherwise stay in the hot ``Task``
+and ``TimeLog`` tables for good, slowing every dashboard and listing that
+scans them. The daily ``archive_sweep`` job (and ``manage.py archive_rows``)
+moves them to ``ArchivedTask`` and ``ArchivedTimeLog``:
+
+* tasks completed, and due, more than ``ARCHIVE_TASKS_AFTER_DAYS`` days ago
+  move together with their time logs; tasks with a running timer stay,
+* time logs started more than ``ARCHIVE_TIME_LOGS_AFTER_DAYS`` days ago move
+  on their own, whatever the state of their task.
+
+Rows move in batches of :data:`BATCH_SIZE`, one short transaction each, so
+the sweep can stop at any point. Archiving moves rows rather than deleting
+them: it bypasses the signal handlers, so counters, rollups and workloads
+keep the archived work and the change feed records no delete. Archived
+tasks are removed from the search index. :func:`task_history` and
+:func:`time_log_history` read both tiers, and counter and rollup rebuilds,
+productivity reports and exports include the archive.
+
+Deleting a department only marks it deleted; the ``department_delete`` job
+(:func:`purge_department`) then deletes its rows in batches instead of
+cascading through every employee, task and log in one request.
+"""
+
+import datetime
+import heapq
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from . import caching, outbox, search
+from .models import (
+    ActiveTimer,
+    ArchivedTask,
+    ArchivedTimeLog,
+    ChangeEvent,
+    DailyTimeRollup,
+    Department,
+    Employee,
+    Goal,
+    JournalEntry,
+    Recurrence,
+    Task,
+    TimeLog,
+)
+
+# Rows moved or deleted per transaction.
+BATCH_SIZE = 500
+
+# Fields copied to the archive and read by the history views.
+TASK_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "assigned_to_id",
+    "due_date",
+    "priority",
+    "recurrence_id",
+    "created_at",
+    "updated_at",
+)
+TIME_LOG_FIELDS = ("id", "task_id", "employee_id", "start_time", "end_time", "duration")
+
+# ``(model, employee lookup)`` in the order a department's rows are deleted:
+# dependent rows before the rows they reference.
+PURGE_ORDER = (
+    (TimeLog, "employee"),
+    (ArchivedTimeLog, "employee"),
+    (DailyTimeRollup, "employee"),
+    (Task, "assigned_to"),
+    (ArchivedTask, "assigned_to"),
+    (Recurrence, "assigned_to"),
+    (Goal, "employee"),
+    (JournalEntry, "employee"),
+)
+
+# Hot model of each archive model, named by the change feed.
+SOURCES = {ArchivedTask: Task, ArchivedTimeLog: TimeLog}
+
+
+# pylint: disable=protected-access
+
+
+def task_cutoff(today=None):
+    """Return the date before which completed tasks are archived."""
+    days = getattr(settings, "ARCHIVE_TASKS_AFTER_DAYS", 90)
+    return (today or timezone.localdate()) - datetime.timedelta(days=days)
+
+
+def time_log_cutoff(now=None):
+    """Return the time before which time logs are archived."""
+    days = getattr(settings, "ARCHIVE_TIME_LOGS_AFTER_DAYS", 365)
+    return (now or timezone.now()) - datetime.timedelta(days=days)
+
+
+def archivable_tasks(cutoff):
+    """Return the completed tasks last updated and due before ``cutoff``."""
+    return Task.objects.filter(
+        completed=True, updated_at__lt=cutoff, due_date__lt=cutoff
+    ).exclude(Exists(ActiveTimer.objects.filter(task=OuterRef("pk"))))
+
+
+def _move_logs(logs):
+    """Copy the ``logs`` queryset to the archive and delete it; return the count."""
+    rows = list(logs.values(*TIME_LOG_FIELDS))
+    if not rows:
+        return 0
+    ArchivedTimeLog.objects.bulk_create(ArchivedTimeLog(**row) for row in rows)
+    TimeLog.objects.filter(pk__in=[row["id"] for row in rows])._raw_delete(logs.db)
+    return len(rows)
+
+
+def _in_batches(queryset, batch_size, handle):
+    """
+    Call ``handle(ids)`` on the ids of ``queryset`` a batch at a time.
+
+    Each batch runs in its own transaction, and ``handle`` must take its
+    rows out of ``queryset``. Returns the sum of what ``handle`` returned.
+    """
+    total = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                queryset.order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return total
+            total += handle(ids)
+
+
+def archive_tasks(cutoff=None, batch_size=BATCH_SIZE):
+    """
+    Move the tasks completed before ``cutoff`` and their logs to the archive.
+
+    ``cutoff`` defaults to :func:`task_cutoff`. Returns ``(tasks, logs)``
+    moved.
+    """
+    candidates = archivable_tasks(cutoff or task_cutoff())
+    logs = 0
+
+    def move(ids):
+        nonlocal logs
+        rows = list(Task.objects.filter(pk__in=ids).values(*TASK_FIELDS))
+        logs += _move_logs(TimeLog.objects.filter(task__in=ids))
+        ArchivedTask.objects.bulk_create(ArchivedTask(**row) for row in rows)
+        Task.objects.filter(pk__in=ids)._raw_delete(candidates.db)
+        for row in rows:
+            search.unindex(Task(pk=row["id"]))
+        owners = {row["assigned_to_id"] for row in rows}
+        caching.bump("tasks", "timelogs", *{f"tasks:{owner}" for owner in owners})
+        return len(rows)
+
+    tasks = _in_batches(candidates, batch_size, move)
+    return tasks, logs
+
+
+def archive_time_logs(cutoff=None, batch_size=BATCH_SIZE):
+    """
+    Move the time logs started before ``cutoff`` to the archive.
+
+    ``cutoff`` defaults to :func:`time_log_cutoff`. Returns the number of
+    logs moved.
+    """
+    candidates = TimeLog.objects.filter(start_time__lt=cutoff or time_log_cutoff())
+    moved = _in_batches(
+        candidates,
+        batch_size,
+        lambda ids: _move_logs(TimeLog.objects.filter(pk__in=ids)),
+    )
+    if moved:
+        caching.bump("timelogs")
+    return moved
+
+
+def sweep(batch_size=BATCH_SIZE):
+    """Archive everything past its retention window; the ``archive_sweep`` job."""
+    tasks, logs = archive_tasks(batch_size=batch_size)
+    logs += archive_time_logs(batch_size=batch_size)
+    return {"tasks": tasks, "time_logs": logs}
+
+
+def _merge(hot, archived, key, limit):
+    """Merge two lists of rows sorted by descending ``key`` into one page."""
+    for row in hot:
+        row["archived"] = False
+    for row in archived:
+        row["archived"] = True
+    merged = heapq.merge(hot, archived, key=key, reverse=True)
+    return list(merged)[:limit]
+
+
+def _page(queryset, field, before, limit):
+    """Return up to ``limit`` rows of ``queryset`` by descending ``(field, id)``."""
+    queryset = queryset.order_by(f"-{field}", "-id")
+    if before is not None:
+        value, pk = before
+        queryset = queryset.filter(
+            Q(**{f"{field}__lt": value}) | Q(**{field: value, "id__lt": pk})
+        )
+    return list(queryset[:limit])
+
+
+def task_history(employee, before=None, limit=20):
+    """
+    Return the completed tasks of ``employee`` from both tiers, latest due first.
+
+    Rows are dicts of :data:`TASK_FIELDS` with ``archived`` set on those
+    read from the archive. ``before`` is the ``(due_date, id)`` of the last
+    row of the previous page. Runs one query per tier.
+    """
+    hot = _page(
+        Task.objects.filter(assigned_to=employee, completed=True).values(*TASK_FIELDS),
+        "due_date",
+        before,
+        limit,
+    )
+    archived = _page(
+        ArchivedTask.objects.filter(assigned_to=employee).values(*TASK_FIELDS),
+        "due_date",
+        before,
+        limit,
+    )
+    return _merge(hot, archived, lambda row: (row["due_date"], row["id"]), limit)
+
+
+def time_log_history(employee, before=None, limit=20):
+    """
+    Return the time logs of ``employee`` from both tiers, latest first.
+
+    Like :func:`task_history`, with ``before`` the ``(start_time, id)`` of
+    the last row of the previous page.
+    """
+    hot = _page(
+        TimeLog.objects.filter(employee=employee).values(*TIME_LOG_FIELDS),
+        "start_time",
+        before,
+        limit,
+    )
+    archived = _page(
+        ArchivedTimeLog.objects.filter(employee=employee).values(*TIME_LOG_FIELDS),
+        "start_time",
+        before,
+        limit,
+    )
+    return _merge(hot, archived, lambda row: (row["start_time"], row["id"]), limit)
+
+
+def task_titles(task_ids):
+    """Return ``{id: title}`` of the tasks ``task_ids`` in either tier."""
+    titles = dict(
+        ArchivedTask.objects.filter(pk__in=task_ids).values_list("pk", "title")
+    )
+    titles.update(Task.objects.filter(pk__in=task_ids).values_list("pk", "title"))
+    return titles
+
+
+def mark_deleted(department):
+    """Hide ``department`` and queue the job deleting its rows."""
+    from . import jobs
+
+    department.deleted_at = timezone.now()
+    department.save(update_fields=["deleted_at"])
+    return jobs.enqueue(
+        "department_delete",
+        {"department_id": department.pk},
+        key=f"department_delete:{department.pk}",
+    )
+
+
+def _delete(queryset, batch_size):
+    """Delete ``queryset`` in batches and return the number of rows deleted."""
+    model = queryset.model
+
+    def delete(ids):
+        outbox.lock()
+        if model in SOURCES:
+            outbox.record_many(
+                [SOURCES[model](pk=pk) for pk in ids], ChangeEvent.DELETE
+            )
+        return model.objects.filter(pk__in=ids).delete()[0]
+
+    return _in_batches(queryset, batch_size, delete)
+
+
+def purge_department(department_id, batch_size=BATCH_SIZE):
+    """
+    Delete a department marked deleted, with its employees and their rows.
+
+    Rows are deleted in batches, dependent rows first, through the ORM so
+    counters, rollups and the change feed follow. Safe to run again after
+    an interruption. Returns the number of rows deleted.
+    """
+    department = Department.objects.filter(
+        pk=department_id, deleted_at__isnull=False
+    ).first()
+    if department is None:
+        return 0
+    deleted = 0
+    for model, field in PURGE_ORDER:
+        rows = model.objects.filter(**{f"{field}__department_id": department_id})
+        deleted += _delete(rows, batch_size)
+    deleted += _delete(Employee.objects.filter(department_id=department_id), batch_size)
+    with transaction.atomic():
+        deleted += department.delete()[0]
+    return deleted
@@ -0,0 +1,78 @@
+"""
+Async (ASGI) versions of the read-only dashboard views.
+
+The views fetch the page's independent querysets concurrently with
+``asyncio.gather`` and Django's async ORM (``aget``, ``acount``,
+``async for``) and only render once everything is loaded. Django 4.2 still
+runs each query through ``sync_to_async`` on a database thread, so the win
+comes from not tying up a worker per request while it waits, not from
+parallel queries. ``manage.py loadtest`` compares them with the synchronous
+views under WSGI and ASGI servers.
+"""
+
+import asyncio
+import functools
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.shortcuts import render
+
+from . import caching, recurrence, routing
+from .models import Goal, JournalEntry, Task
+from .pagination import apaginate
+from .views import DASHBOARD_LAG, PAGE_SIZE
+
+
+def login_required(view):
+    """Async counterpart of ``django.contrib.auth.decorators.login_required``."""
+
+    @functools.wraps(view)
+    async def inner(request, *args, **kwargs):
+        authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+
+    return inner
+
+
+async def _listing(queryset):
+    """Evaluate ``queryset`` without blocking the event loop."""
+    return [row async for row in queryset]
+
+
+@login_required
+@routing.replica_reads(DASHBOARD_LAG)
+@caching.aconditional(caching.employee_namespaces)
+async def employee_dashboard(request):
+    """Display the employee's dashboard, loading its three lists concurrently."""
+    employee = request.employee
+    tasks, goals, journal_entries, recurring, fragment_key = await asyncio.gather(
+        apaginate(
+            request,
+            Task.objects.for_employee(employee),
+            PAGE_SIZE,
+            ("completed", "due_date"),
+        ),
+        _listing(Goal.objects.for_employee(employee)[:PAGE_SIZE]),
+        _listing(JournalEntry.objects.for_employee(employee)[:PAGE_SIZE]),
+        sync_to_async(recurrence.pending)(employee),
+        sync_to_async(caching.page_key)(request, *caching.employee_namespaces(request)),
+    )
+    context = {
+        "tasks": tasks,
+        "goals": goals,
+        "journal_entries": journal_entries,
+        "recurring": recurring,
+        "fragment_key": fragment_key,
+        "fragment_timeout": caching.fragment_timeout(),
+    }
+    return render(request, "tasks/employee_dashboard.html", context)
+
+
+@login_required
+@routing.replica_reads(DASHBOARD_LAG)
+async def goal_dashboard(request):
+    """Display the goals for the logged-in employee."""
+    goals = await _listing(Goal.objects.for_employee(request.employee))
+    return render(request, "tasks/goal_dashboard.html", {"goals": goals})
@@ -0,0 +1,252 @@
+"""
+Repeatable view benchmarks.
+
+:func:`run` drives views in-process with the Django test client, logged in
+as an employee or a staff user, and records latency percentiles and the
+number of queries of each. Results are plain JSON so they can be saved as a
+baseline; :func:`compare` reports the views whose latency grew by more than
+a tolerance or that run more queries than before. Run it against data from
+``manage.py seed_synthetic`` so baselines are comparable between runs.
+``manage.py benchmark`` is the command line front end.
+
+:func:`write_throughput` measures concurrent ``log_time`` writes with and
+without the SQLite production profile (``manage.py benchmark_writes``).
+"""
+
+import datetime
+import platform
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import OperationalError, connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import sqlite
+from .models import Department, Employee, Goal, JournalEntry, Task, TimeLog
+from .reports import percentiles
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Latency percentiles checked by :func:`compare`.
+COMPARED = ("p50", "p95")
+
+# Latency changes smaller than this are noise, whatever the tolerance.
+MIN_DELTA_MS = 1.0
+
+
+@dataclass(frozen=True)
+class View:
+    """
+    A page to benchmark.
+
+    Attributes:
+        name (str): URL name of the view.
+        query (str): Query string appended to the URL.
+        staff (bool): Whether to request it as the staff user.
+    """
+
+    name: str
+    query: str = ""
+    staff: bool = False
+
+    @property
+    def url(self):
+        """Path requested."""
+        return reverse(self.name) + (f"?{self.query}" if self.query else "")
+
+
+VIEWS = (
+    View("home"),
+    View("employee-dashboard"),
+    View("async-employee-dashboard"),
+    View("goal-dashboard"),
+    View("search", "q=report"),
+    View("user-list", staff=True),
+    View("employee-list", staff=True),
+    View("department-list", staff=True),
+)
+
+
+def _users():
+    """Return ``(employee user, staff user)`` to request the views as."""
+    employee = Employee.objects.select_related("user").order_by("pk").first()
+    admin = User.objects.filter(is_staff=True).order_by("pk").first()
+    if employee is None or admin is None:
+        raise ValueError(
+            "Benchmarks need an employee and a staff user; "
+            "run 'manage.py seed_synthetic' first."
+        )
+    return employee.user, admin
+
+
+def _row_counts():
+    """Return ``{model name: rows}`` describing the data set."""
+    models = (User, Department, Employee, Task, TimeLog, Goal, JournalEntry)
+    return {model.__name__: model.objects.count() for model in models}
+
+
+def measure(client, url, requests=50, warmup=5, cold=False):
+    """
+    Request ``url`` and return its latency percentiles and query count.
+
+    ``warmup`` requests run first and are not recorded. With ``cold`` the
+    cache is cleared before every request, so cached fragments and
+    conditional responses do not help.
+    """
+    latencies = array("d")
+    queries = errors = 0
+    for attempt in range(warmup + requests):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = time.perf_counter() - started
+        if attempt < warmup:
+            continue
+        latencies.append(elapsed * 1000)
+        queries = max(queries, len(captured))
+        errors += response.status_code != 200
+    return {
+        "url": url,
+        "requests": requests,
+        "errors": errors,
+        "queries": queries,
+        "latency_ms": {
+            f"p{point}": round(value, 3)
+            for point, value in percentiles(latencies, PERCENTILES).items()
+        },
+    }
+
+
+def run(views=VIEWS, requests=50, warmup=5, cold=False):
+    """
+    Benchmark ``views`` and return the results as a JSON-serialisable dict.
+
+    Raises ``ValueError`` when there is no employee or staff user to log in as.
+    """
+    employee, admin = _users()
+    clients = {False: Client(), True: Client()}
+    clients[False].force_login(employee)
+    clients[True].force_login(admin)
+    # The test client sends requests to "testserver".
+    with override_settings(ALLOWED_HOSTS=["testserver"]):
+        results = {
+            view.name: measure(
+                clients[view.staff], view.url, requests, warmup=warmup, cold=cold
+            )
+            for view in views
+        }
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "rows": _row_counts(),
+        },
+        "settings": {"requests": requests, "warmup": warmup, "cold": cold},
+        "views": results,
+    }
+
+
+def compare(baseline, current, tolerance=0.2):
+    """
+    Return ``(view, metric, before, after)`` for every regression.
+
+    A regression is a latency percentile in :data:`COMPARED` more than
+    ``tolerance`` (a fraction) and :data:`MIN_DELTA_MS` above the baseline,
+    or any extra query. Views missing from either run are ignored.
+    """
+    regressions = []
+    for name, after in current["views"].items():
+        before = baseline["views"].get(name)
+        if before is None:
+            continue
+        if after["queries"] > before["queries"]:
+            regressions.append((name, "queries", before["queries"], after["queries"]))
+        for point in COMPARED:
+            old, new = before["latency_ms"][point], after["latency_ms"][point]
+            if old is None or new is None:
+                continue
+            if new - old > max(old * tolerance, MIN_DELTA_MS):
+                regressions.append((name, point, old, new))
+    return regressions
+
+
+def _log_time(targets, writes, start, retry):
+    """Save ``writes`` time logs as ``log_time`` does; return ids and failures."""
+    created, failures = [], 0
+    try:
+        for index in range(writes):
+            task_id, employee_id = targets[(start + index) % len(targets)]
+            began = timezone.now()
+            log = TimeLog(
+                task_id=task_id,
+                employee_id=employee_id,
+                start_time=began,
+                end_time=began + datetime.timedelta(minutes=30),
+                duration=datetime.timedelta(minutes=30),
+            )
+            try:
+                if retry:
+                    sqlite.retry_on_lock(log.save)
+                else:
+                    with transaction.atomic():
+                        log.save()
+            except OperationalError:
+                failures += 1
+            else:
+                created.append(log.pk)
+    finally:
+        connection.close()
+    return created, failures
+
+
+def write_throughput(threads=8, writes=100, production=True):
+    """
+    Log time from ``threads`` threads at once and return the throughput.
+
+    With ``production`` the SQLite profile and :func:`sqlite.retry_on_lock`
+    are used; without, the database is switched back to the default
+    rollback journal first. The logs written are deleted afterwards.
+    """
+    targets = list(Task.objects.order_by("pk").values_list("pk", "assigned_to")[:1000])
+    if not targets:
+        raise ValueError("No tasks to log time on; run 'manage.py seed_synthetic'.")
+    connection.close()
+    with override_settings(SQLITE_PRODUCTION=production):
+        if connection.vendor == "sqlite" and not production:
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode = DELETE")
+            connection.close()
+        barrier = threading.Barrier(threads)
+
+        def work(start):
+            barrier.wait()
+            return _log_time(targets, writes, start, retry=production)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            outcomes = list(pool.map(work, range(0, threads * writes, writes)))
+        elapsed = time.perf_counter() - started
+        created = [pk for ids, _ in outcomes for pk in ids]
+        TimeLog.objects.filter(pk__in=created).delete()
+        connection.close()
+    return {
+        "profile": "production" if production else "default",
+        "threads": threads,
+        "writes": len(created),
+        "failures": sum(failures for _, failures in outcomes),
+        "elapsed": round(elapsed, 3),
+        "writes_per_second": round(len(created) / elapsed, 1) if elapsed else 0.0,
+    }
@@ -0,0 +1,160 @@
+"""
+Bulk task import for sprint planning.
+
+Rows are read from CSV or JSON, validated in a single pass against lookups
+prefetched with one query per related model, and inserted with
+``bulk_create`` in batches inside one transaction. Each row may contain:
+
+    title, description, assigned_to (username), due_date (YYYY-MM-DD),
+    priority, completed, department (name; optional consistency check)
+"""
+
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from . import caching, counters, outbox, search, workload
+from .models import ChangeEvent, Department, Employee, Task
+
+# Number of rows sent to the database per INSERT statement.
+BATCH_SIZE = 1000
+
+# Task fields validated with the model field's own ``clean``.
+MODEL_FIELDS = ("title", "description", "due_date", "priority", "completed")
+
+
+@dataclass
+class ImportResult:
+    """
+    Outcome of a bulk import.
+
+    Attributes:
+        created (int): Number of tasks inserted.
+        errors (list): ``{"row": n, "errors": {field: [messages]}}`` entries,
+            with rows numbered from 1.
+    """
+
+    created: int = 0
+    errors: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        """Whether every row was valid."""
+        return not self.errors
+
+
+def read_rows(stream, fmt):
+    """
+    Parse ``stream`` (text or bytes) as ``"csv"`` or ``"json"`` into dicts.
+
+    JSON input may be a list of objects or JSON Lines with one object each.
+    Raises ``ValueError`` for malformed or empty input.
+    """
+    text = stream.read()
+    if isinstance(text, bytes):
+        text = text.decode("utf-8-sig")
+    if fmt == "csv":
+        rows = list(csv.DictReader(io.StringIO(text)))
+    elif fmt == "json":
+        text = text.strip()
+        if text.startswith("["):
+            rows = json.loads(text)
+        else:
+            rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+        for number, row in enumerate(rows, start=1):
+            if not isinstance(row, dict):
+                raise ValueError(f"Row {number} is not an object.")
+    else:
+        raise ValueError(f"Unsupported format '{fmt}'; expected 'csv' or 'json'.")
+    if not rows:
+        raise ValueError("No rows to import.")
+    return rows
+
+
+def _lookups(rows):
+    """Fetch every employee and department the rows refer to, one query each."""
+    usernames = {str(row.get("assigned_to", "")).strip() for row in rows}
+    employees = {
+        employee.user.username: employee
+        for employee in Employee.objects.select_related("user").filter(
+            user__username__in=usernames
+        )
+    }
+    names = {str(row.get("department") or "").strip() for row in rows} - {""}
+    departments = dict(
+        Department.objects.filter(name__in=names).values_list("name", "pk")
+    )
+    return employees, departments
+
+
+def _build(row, employees, departments):
+    """Validate one row and return ``(task, errors)``."""
+    errors = {}
+    values = {}
+    for name in MODEL_FIELDS:
+        model_field = Task._meta.get_field(name)  # pylint: disable=protected-access
+        raw = row.get(name)
+        if raw in (None, "") and model_field.has_default():
+            raw = model_field.get_default()
+        if name == "completed" and isinstance(raw, str):
+            raw = raw.strip().lower() in ("1", "true", "yes")
+        try:
+            values[name] = model_field.clean(raw, None)
+        except ValidationError as exc:
+            errors[name] = exc.messages
+
+    username = str(row.get("assigned_to", "")).strip()
+    employee = employees.get(username)
+    if employee is None:
+        errors["assigned_to"] = [f"No employee with username '{username}'."]
+
+    department = str(row.get("department") or "").strip()
+    if department:
+        department_id = departments.get(department)
+        if department_id is None:
+            errors["department"] = [f"No department named '{department}'."]
+        elif employee is not None and employee.department_id != department_id:
+            errors["department"] = [f"'{username}' is not in '{department}'."]
+
+    if errors:
+        return None, errors
+    return Task(assigned_to=employee, **values), None
+
+
+def import_tasks(rows, batch_size=BATCH_SIZE, partial=False):
+    """
+    Validate ``rows`` and insert them as tasks.
+
+    By default nothing is inserted when any row is invalid; with ``partial``
+    the valid rows are inserted and the invalid ones reported.
+    """
+    employees, departments = _lookups(rows)
+    result = ImportResult()
+    tasks = []
+    for number, row in enumerate(rows, start=1):
+        task, errors = _build(row, employees, departments)
+        if errors:
+            result.errors.append({"row": number, "errors": errors})
+        else:
+            tasks.append(task)
+
+    if not tasks or (result.errors and not partial):
+        return result
+
+    with transaction.atomic():
+        outbox.lock()
+        Task.objects.bulk_create(tasks, batch_size=batch_size)
+        # bulk_create bypasses the signals that maintain counters, search,
+        # workloads and the change feed.
+        outbox.record_many(tasks, ChangeEvent.CREATE)
+        scopes = {counters.ORG} | {task.assigned_to.department_id for task in tasks}
+        counters.rebuild(scopes)
+        search.index_many(tasks)
+        workload.refresh({task.assigned_to_id for task in tasks})
+    caching.bump("tasks", *{f"tasks:{task.assigned_to_id}" for task in tasks})
+    result.created = len(tasks)
+    return result
@@ -0,0 +1,149 @@
+"""
+Versioned caching for the listing and dashboard views.
+
+Each kind of data a page shows belongs to a *namespace* (``departments``,
+``employees``, ``users``, ``tasks``, ``timelogs``, ``goals``, ``journals``
+or one employee's ``tasks:<id>``, ``timelogs:<id>``, ``goals:<id>``,
+``journals:<id>`` and ``recurrences:<id>``). A namespace's version is the
+time it last changed and is bumped by the signal handlers in
+``tasks.signals``. Versions feed:
+
+* the keys of template fragments cached with ``{% cache %}``, so a bump
+  makes stale fragments unreachable instead of deleting them, and
+* the ``ETag`` and ``Last-Modified`` headers of :func:`conditional`, so
+  unchanged pages are answered with ``304 Not Modified``.
+
+``updated_at`` on the models only has day resolution, too coarse for
+validators, which is why versions are tracked here.
+
+Versions live in the default cache; configure a shared backend (Redis,
+Memcached) when running more than one process.
+"""
+
+import datetime
+import functools
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from django.views.decorators.http import condition
+
+
+def fragment_timeout():
+    """Return how long rendered fragments are kept, in seconds."""
+    return getattr(settings, "FRAGMENT_CACHE_TIMEOUT", 600)
+
+
+def _key(namespace):
+    """Return the cache key holding the version of ``namespace``."""
+    return f"tasks:version:{namespace}"
+
+
+def versions(*namespaces):
+    """
+    Return ``{namespace: version}``.
+
+    A namespace without a stored version (first use or evicted) starts at
+    the current time, so nothing cached under an older version is reused.
+    """
+    keys = {_key(namespace): namespace for namespace in namespaces}
+    found = cache.get_many(keys)
+    missing = {key: time.time() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+    return {keys[key]: value for key, value in found.items()}
+
+
+def bump(*namespaces):
+    """Mark ``namespaces`` as changed now."""
+    now = time.time()
+    cache.set_many({_key(namespace): now for namespace in namespaces}, None)
+
+
+def audience(request):
+    """Return who a page is rendered for: the user, or the staff role."""
+    return "staff" if request.user.is_staff else f"user:{request.user.pk}"
+
+
+def page_key(request, *namespaces):
+    """
+    Return a key identifying one rendering of the current page.
+
+    It changes whenever any of ``namespaces`` changes, and differs per
+    audience, per query string (e.g. the pagination cursor) and per day, as
+    overdue tasks and recurring occurrences depend on the date.
+    """
+    stamp = versions(*namespaces)
+    parts = [audience(request), request.get_full_path(), str(timezone.localdate())]
+    parts += [f"{namespace}={stamp[namespace]!r}" for namespace in sorted(stamp)]
+    return hashlib.md5("|".join(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def conditional(namespaces):
+    """
+    Decorate a view with ``ETag``/``Last-Modified`` validators.
+
+    ``namespaces`` is a callable taking the request and returning the
+    namespaces the page depends on.
+    """
+
+    def etag(request, *_args, **_kwargs):
+        return page_key(request, *namespaces(request))
+
+    def last_modified(request, *_args, **_kwargs):
+        latest = max(versions(*namespaces(request)).values())
+        return datetime.datetime.fromtimestamp(latest, tz=datetime.timezone.utc)
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
+
+
+def _validators(request, namespaces):
+    """Return the quoted ``ETag`` and ``Last-Modified`` timestamp of a page."""
+    stamp = versions(*namespaces)
+    return quote_etag(page_key(request, *namespaces)), int(max(stamp.values()))
+
+
+def aconditional(namespaces):
+    """
+    Async counterpart of :func:`conditional` for coroutine views.
+
+    Django 4.2's ``condition`` decorator only wraps synchronous views.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def inner(request, *args, **kwargs):
+            etag, last_modified = await sync_to_async(_validators)(
+                request, namespaces(request)
+            )
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD"):
+                if not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(last_modified)
+                response.headers.setdefault("ETag", etag)
+            return response
+
+        return inner
+
+    return decorator
+
+
+def employee_namespaces(request):
+    """Namespaces of the logged-in employee's tasks, goals, journal and rules."""
+    employee_id = request.employee.pk if request.employee else None
+    return (
+        f"tasks:{employee_id}",
+        f"goals:{employee_id}",
+        f"journals:{employee_id}",
+        f"recurrences:{employee_id}",
+    )
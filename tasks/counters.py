@@ -0,0 +1,278 @@
+"""
+Incrementally maintained counters behind the dashboards.
+
+Each tracked model instance *contributes* a fixed amount to a handful of
+named counters, both organisation-wide and for its department. The signal
+handlers in ``tasks.signals`` apply the difference between an instance's old
+and new contribution whenever it is saved or deleted, so reading a dashboard
+is a single lookup instead of a set of ``COUNT``/``SUM`` queries.
+
+Writes that bypass signals (``QuerySet.update``, ``bulk_create``) and the
+passage of time (tasks becoming overdue) cause drift. The daily overdue
+sweep run by ``manage.py run_workers`` recounts overdue tasks and
+``manage.py rebuild_counters`` repairs everything else.
+"""
+
+from collections import Counter as Tally
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import (
+    ArchivedTask,
+    ArchivedTimeLog,
+    Counter,
+    Department,
+    Employee,
+    JournalEntry,
+    Task,
+    TimeLog,
+)
+
+# Organisation-wide scope.
+ORG = None
+
+DEPARTMENTS = "departments"
+USERS = "users"
+EMPLOYEES = "employees"
+TASKS = "tasks"
+OPEN_TASKS = "open_tasks"
+OVERDUE_TASKS = "overdue_tasks"
+JOURNAL_ENTRIES = "journal_entries"
+SECONDS_LOGGED = "seconds_logged"
+
+ORG_NAMES = (DEPARTMENTS, USERS)
+SCOPED_NAMES = (
+    EMPLOYEES,
+    TASKS,
+    OPEN_TASKS,
+    OVERDUE_TASKS,
+    JOURNAL_ENTRIES,
+    SECONDS_LOGGED,
+)
+NAMES = ORG_NAMES + SCOPED_NAMES
+
+
+def _department_id(instance, field):
+    """Return the department of the employee referenced by ``field``."""
+    descriptor = getattr(type(instance), field)
+    if descriptor.is_cached(instance):
+        return getattr(instance, field).department_id
+    employee_id = getattr(instance, f"{field}_id")
+    return (
+        Employee.objects.filter(pk=employee_id)
+        .values_list("department_id", flat=True)
+        .first()
+    )
+
+
+def _scoped(department_id, amounts):
+    """Attribute ``amounts`` to both the organisation and ``department_id``."""
+    tally = Tally()
+    for name, amount in amounts.items():
+        tally[(ORG, name)] += amount
+        if department_id is not None:
+            tally[(department_id, name)] += amount
+    return tally
+
+
+def contribution(instance):
+    """Return the ``{(scope_id, name): amount}`` that ``instance`` adds."""
+    if isinstance(instance, User):
+        return Tally({(ORG, USERS): 1})
+    if isinstance(instance, Department):
+        return Tally({(ORG, DEPARTMENTS): 1})
+    if isinstance(instance, Employee):
+        return _scoped(instance.department_id, {EMPLOYEES: 1})
+    if isinstance(instance, (Task, ArchivedTask)):
+        # Only completed tasks are archived.
+        is_open = not getattr(instance, "completed", True)
+        return _scoped(
+            _department_id(instance, "assigned_to"),
+            {
+                TASKS: 1,
+                OPEN_TASKS: int(is_open),
+                OVERDUE_TASKS: int(is_open and instance.due_date < _today()),
+            },
+        )
+    if isinstance(instance, JournalEntry):
+        return _scoped(_department_id(instance, "employee"), {JOURNAL_ENTRIES: 1})
+    if isinstance(instance, (TimeLog, ArchivedTimeLog)):
+        seconds = int(instance.duration.total_seconds()) if instance.duration else 0
+        return _scoped(_department_id(instance, "employee"), {SECONDS_LOGGED: seconds})
+    raise TypeError(f"{type(instance).__name__} does not contribute to counters.")
+
+
+def apply(deltas):
+    """
+    Add ``deltas`` to the stored counters.
+
+    A counter that has never been stored is rebuilt for its whole scope
+    rather than seeded with the delta, so the first update is also correct.
+    """
+    missing = set()
+    for (scope_id, name), amount in deltas.items():
+        if not amount:
+            continue
+        updated = Counter.objects.filter(scope_id=scope_id, name=name).update(
+            value=F("value") + amount
+        )
+        if not updated:
+            missing.add(scope_id)
+    if missing:
+        rebuild(missing)
+
+
+def store(values):
+    """
+    Overwrite stored counters with ``{(scope_id, name): value}``.
+
+    Scopes that have no stored counters yet are rebuilt instead.
+    """
+    missing = set()
+    with transaction.atomic():
+        for (scope_id, name), value in values.items():
+            updated = Counter.objects.filter(scope_id=scope_id, name=name).update(
+                value=value
+            )
+            if not updated:
+                missing.add(scope_id)
+    if missing:
+        rebuild(missing)
+
+
+def get_counters(scope_id=ORG):
+    """Return every counter of ``scope_id`` as a ``{name: value}`` mapping."""
+    counters = dict.fromkeys(NAMES if scope_id is ORG else SCOPED_NAMES, 0)
+    counters.update(
+        Counter.objects.filter(scope_id=scope_id).values_list("name", "value")
+    )
+    return counters
+
+
+def _today():
+    """Return the current date in the active time zone."""
+    return timezone.localdate()
+
+
+def _task_totals():
+    """Return the aggregate expressions shared by the task counters."""
+    is_open = Q(completed=False)
+    return {
+        TASKS: Count("id"),
+        OPEN_TASKS: Count("id", filter=is_open),
+        OVERDUE_TASKS: Count("id", filter=is_open & Q(due_date__lt=_today())),
+    }
+
+
+def _seconds(duration):
+    """Convert a summed ``DurationField`` to whole seconds."""
+    return int(duration.total_seconds()) if duration else 0
+
+
+def compute(scope_ids=None):
+    """
+    Compute counters from the source tables.
+
+    Archived tasks and time logs still count as tasks and logged time.
+    ``scope_ids`` limits the work to the given scopes; ``None`` computes the
+    organisation and every department.
+    """
+    everything = scope_ids is None
+    scope_ids = set() if everything else set(scope_ids)
+    values = {}
+
+    if everything or ORG in scope_ids:
+        values.update({(ORG, name): 0 for name in NAMES})
+        values[(ORG, DEPARTMENTS)] = Department.objects.count()
+        values[(ORG, USERS)] = User.objects.count()
+        values[(ORG, EMPLOYEES)] = Employee.objects.count()
+        for name, total in Task.objects.aggregate(**_task_totals()).items():
+            values[(ORG, name)] = total
+        values[(ORG, JOURNAL_ENTRIES)] = JournalEntry.objects.count()
+        values[(ORG, TASKS)] += ArchivedTask.objects.count()
+        values[(ORG, SECONDS_LOGGED)] = sum(
+            _seconds(model.objects.aggregate(total=Sum("duration"))["total"])
+            for model in (TimeLog, ArchivedTimeLog)
+        )
+
+    departments = Department.objects.all()
+    if not everything:
+        departments = departments.filter(pk__in=scope_ids - {ORG})
+    department_ids = list(departments.values_list("pk", flat=True))
+    for department_id in department_ids:
+        values.update({(department_id, name): 0 for name in SCOPED_NAMES})
+    if not department_ids:
+        return values
+
+    employees = (
+        Employee.objects.filter(department__in=department_ids)
+        .values("department")
+        .annotate(total=Count("id"))
+    )
+    for row in employees:
+        values[(row["department"], EMPLOYEES)] = row["total"]
+
+    tasks = (
+        Task.objects.filter(assigned_to__department__in=department_ids)
+        .values("assigned_to__department")
+        .annotate(**_task_totals())
+    )
+    for row in tasks:
+        for name in _task_totals():
+            values[(row["assigned_to__department"], name)] = row[name]
+
+    archived_tasks = (
+        ArchivedTask.objects.filter(assigned_to__department__in=department_ids)
+        .values("assigned_to__department")
+        .annotate(total=Count("id"))
+    )
+    for row in archived_tasks:
+        values[(row["assigned_to__department"], TASKS)] += row["total"]
+
+    entries = (
+        JournalEntry.objects.filter(employee__department__in=department_ids)
+        .values("employee__department")
+        .annotate(total=Count("id"))
+    )
+    for row in entries:
+        values[(row["employee__department"], JOURNAL_ENTRIES)] = row["total"]
+
+    for model in (TimeLog, ArchivedTimeLog):
+        logs = (
+            model.objects.filter(employee__department__in=department_ids)
+            .values("employee__department")
+            .annotate(total=Sum("duration"))
+        )
+        for row in logs:
+            values[(row["employee__department"], SECONDS_LOGGED)] += _seconds(
+                row["total"]
+            )
+
+    return values
+
+
+def rebuild(scope_ids=None):
+    """
+    Recompute and store counters, replacing whatever was stored before.
+
+    ``scope_ids`` limits the rebuild to the given scopes; ``None`` rebuilds
+    everything and drops counters of departments that no longer exist.
+    """
+    values = compute(scope_ids)
+    with transaction.atomic():
+        stale = Counter.objects.all()
+        if scope_ids is not None:
+            scope_ids = set(scope_ids)
+            query = Q(scope_id__in=scope_ids - {ORG})
+            if ORG in scope_ids:
+                query |= Q(scope_id__isnull=True)
+            stale = stale.filter(query)
+        stale.delete()
+        Counter.objects.bulk_create(
+            Counter(scope_id=scope_id, name=name, value=value)
+            for (scope_id, name), value in values.items()
+        )
+    return values
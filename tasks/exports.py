@@ -0,0 +1,212 @@
+"""
+Streaming exports of tasks, time logs, goals and journal entries.
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)`` and encoded
+one line at a time, so memory use stays flat regardless of the export size.
+Task and time log exports also read their archive (``tasks.archive``); the
+two tiers are merged by id as they stream. Both the export views and
+``manage.py export_tasks`` are built on :func:`export_lines`.
+"""
+
+import csv
+import datetime
+import heapq
+import json
+from dataclasses import dataclass, field
+
+from django.db.models import BooleanField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_date
+
+from .models import ArchivedTask, ArchivedTimeLog, Goal, JournalEntry, Task, TimeLog
+
+# Rows fetched from the database cursor per round trip.
+CHUNK_SIZE = 2000
+
+FORMATS = ("csv", "jsonl")
+
+
+@dataclass(frozen=True)
+class Export:
+    """
+    Description of one exportable model.
+
+    Attributes:
+        model (Model): Model whose rows are exported.
+        columns (tuple): ``(header, lookup)`` pairs passed to ``values_list``.
+        department (str): Lookup of the owning department's id.
+        employee (str): Lookup of the owning employee's id.
+        date (str): Lookup of the date filtered by ``since``/``until``.
+        archive (Model): Archive model exported with ``model``, if any.
+        archive_columns (dict): ``{header: expression}`` read from the
+            archive in place of lookups it lacks.
+    """
+
+    model: type
+    columns: tuple
+    department: str
+    employee: str
+    date: str
+    archive: type = None
+    archive_columns: dict = field(default_factory=dict)
+
+
+def _task_title(model):
+    """Return the title of the ``model`` task a time log references."""
+    return Subquery(model.objects.filter(pk=OuterRef("task_id")).values("title")[:1])
+
+
+EXPORTS = {
+    "tasks": Export(
+        model=Task,
+        columns=(
+            ("id", "id"),
+            ("title", "title"),
+            ("assigned_to", "assigned_to__user__username"),
+            ("department", "assigned_to__department__name"),
+            ("due_date", "due_date"),
+            ("completed", "completed"),
+            ("priority", "priority"),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+        ),
+        department="assigned_to__department",
+        employee="assigned_to",
+        date="due_date",
+        archive=ArchivedTask,
+        archive_columns={"completed": Value(True, output_field=BooleanField())},
+    ),
+    "timelogs": Export(
+        model=TimeLog,
+        columns=(
+            ("id", "id"),
+            ("task_id", "task_id"),
+            ("task", "task__title"),
+            ("employee", "employee__user__username"),
+            ("department", "employee__department__name"),
+            ("start_time", "start_time"),
+            ("end_time", "end_time"),
+            ("duration_seconds", "duration"),
+        ),
+        department="employee__department",
+        employee="employee",
+        date="start_time__date",
+        archive=ArchivedTimeLog,
+        archive_columns={
+            "task": Coalesce(_task_title(Task), _task_title(ArchivedTask))
+        },
+    ),
+    "goals": Export(
+        model=Goal,
+        columns=(
+            ("id", "id"),
+            ("title", "title"),
+            ("employee", "employee__user__username"),
+            ("department", "employee__department__name"),
+            ("target_date", "target_date"),
+            ("achieved", "achieved"),
+        ),
+        department="employee__department",
+        employee="employee",
+        date="target_date",
+    ),
+    "journals": Export(
+        model=JournalEntry,
+        columns=(
+            ("id", "id"),
+            ("employee", "employee__user__username"),
+            ("department", "employee__department__name"),
+            ("entry_date", "entry_date"),
+            ("content", "content"),
+        ),
+        department="employee__department",
+        employee="employee",
+        date="entry_date",
+    ),
+}
+
+
+def parse_filter_date(value):
+    """Parse an optional ``YYYY-MM-DD`` filter, raising ``ValueError`` if bad."""
+    if not value:
+        return None
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f"'{value}' is not a YYYY-MM-DD date.")
+    return parsed
+
+
+def export_rows(kind, chunk_size=None, **filters):
+    """
+    Yield the value tuples of export ``kind``.
+
+    ``filters`` may contain ``department`` and ``employee`` ids and ``since``
+    and ``until`` dates; ``None`` values are ignored. Rows come in id order,
+    archived ones included.
+    """
+    export = EXPORTS[kind]
+    lookups = {
+        "department": export.department,
+        "employee": export.employee,
+        "since": f"{export.date}__gte",
+        "until": f"{export.date}__lte",
+    }
+    query = {
+        lookups[name]: value for name, value in filters.items() if value is not None
+    }
+
+    querysets = [
+        export.model.objects.filter(**query).values_list(
+            *(lookup for _, lookup in export.columns)
+        )
+    ]
+    if export.archive is not None:
+        querysets.append(
+            export.archive.objects.filter(**query).values_list(
+                *(
+                    export.archive_columns.get(header, lookup)
+                    for header, lookup in export.columns
+                )
+            )
+        )
+    return heapq.merge(
+        *(
+            queryset.order_by("pk").iterator(chunk_size=chunk_size or CHUNK_SIZE)
+            for queryset in querysets
+        ),
+        key=lambda row: row[0],
+    )
+
+
+def _plain(value):
+    """Convert a database value into a CSV/JSON friendly scalar."""
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+class _Line:
+    """File-like object whose ``write`` hands back what ``csv.writer`` wrote."""
+
+    def write(self, value):
+        """Return ``value`` instead of buffering it."""
+        return value
+
+
+def export_lines(kind, fmt="csv", **filters):
+    """Yield export ``kind`` encoded as ``fmt`` one line at a time."""
+    headers = [header for header, _ in EXPORTS[kind].columns]
+    rows = export_rows(kind, **filters)
+    if fmt == "csv":
+        writer = csv.writer(_Line())
+        yield writer.writerow(headers)
+        for row in rows:
+            yield writer.writerow([_plain(value) for value in row])
+    elif fmt == "jsonl":
+        for row in rows:
+            record = dict(zip(headers, (_plain(value) for value in row)))
+            yield json.dumps(record) + "\n"
+    else:
+        raise ValueError(f"Unsupported format '{fmt}'; expected one of {FORMATS}.")
@@ -5,8 +5,50 @@ logging in the task management app.
 
 from django import forms
 from django.contrib.auth.models import User
+from django.urls import reverse_lazy
 
-from .models import Department, Employee, Goal, JournalEntry, Task, TimeLog
+from . import permissions
+from .models import (
+    Department,
+    Employee,
+    Goal,
+    JournalEntry,
+    Recurrence,
+    Task,
+    TimeLog,
+)
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    Select that renders only the chosen option and searches the rest.
+
+    Other options are fetched page by page from ``url`` as the user types,
+    so rendering the form does not load every row of the queryset.
+    """
+
+    template_name = "tasks/widgets/autocomplete_select.html"
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["data-autocomplete-url"] = str(self.url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        """Return the empty option and the selected ones only."""
+        groups = [(None, [self.create_option(name, "", "---------", False, 0)], 0)]
+        selected = [pk for pk in value if pk]
+        if selected:
+            for index, obj in enumerate(
+                self.choices.queryset.filter(pk__in=selected), start=1
+            ):
+                option = self.create_option(name, obj.pk, str(obj), True, index)
+                groups.append((None, [option], index))
+        return groups
 
 
 class UserCreationForm(forms.ModelForm):
@@ -103,3 +145,66 @@ class TaskForm(forms.ModelForm):
     class Meta:
         model = Task
         fields = ["title", "description", "assigned_to", "due_date", "priority"]
+        widgets = {
+            # Employees are searched by name and sorted by workload on demand.
+            "assigned_to": AutocompleteSelect(reverse_lazy("assignee-autocomplete")),
+        }
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        employees = Employee.objects.all()
+        if user is not None:
+            # Heads of department only assign the employees they manage.
+            employees = employees.visible_to(permissions.scope_of(user))
+        # The selected option's label calls ``user.get_full_name()``.
+        self.fields["assigned_to"].queryset = employees.with_related()
+
+
+class RecurrenceForm(forms.ModelForm):
+    """
+    Form for creating or editing a recurring task.
+    """
+
+    weekday_choices = [
+        ("1", "Mon"),
+        ("2", "Tue"),
+        ("3", "Wed"),
+        ("4", "Thu"),
+        ("5", "Fri"),
+        ("6", "Sat"),
+        ("7", "Sun"),
+    ]
+
+    weekdays = forms.MultipleChoiceField(
+        choices=weekday_choices,
+        required=False,
+        widget=forms.CheckboxSelectMultiple,
+        help_text="Days a daily or weekly task falls on.",
+    )
+
+    class Meta:
+        model = Recurrence
+        fields = [
+            "title",
+            "description",
+            "assigned_to",
+            "priority",
+            "frequency",
+            "interval",
+            "weekdays",
+            "starts_on",
+            "ends_on",
+        ]
+        widgets = {
+            "assigned_to": AutocompleteSelect(reverse_lazy("assignee-autocomplete")),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["assigned_to"].queryset = Employee.objects.with_related()
+        if self.instance.weekdays:
+            self.initial["weekdays"] = self.instance.weekdays.split(",")
+
+    def clean_weekdays(self):
+        """Store the chosen weekdays as a comma separated list."""
+        return ",".join(sorted(self.cleaned_data["weekdays"]))
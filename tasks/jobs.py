@@ -0,0 +1,264 @@
+"""
+A database-backed background job queue.
+
+Jobs are ``Job`` rows. Views and signal handlers only :func:`enqueue` them,
+which is a single insert, and ``manage.py run_workers`` runs them outside
+the request cycle:
+
+* :func:`claim` picks the oldest due job with ``SELECT ... FOR UPDATE SKIP
+  LOCKED`` so concurrent workers never wait on each other's rows. SQLite
+  has no row locks; there the claim is a conditional ``UPDATE`` that only
+  one worker can win.
+* A failed attempt is retried with exponential backoff until the job's
+  ``max_attempts`` is reached, then the job is marked ``failed`` with the
+  traceback kept in ``last_error``.
+* A job left ``running`` longer than ``JOB_LOCK_TIMEOUT`` seconds belongs to
+  a worker that died and is claimed again, or marked ``failed`` if it has
+  no attempts left.
+
+Handlers are plain functions called with the job's payload as keyword
+arguments, looked up by kind in :data:`HANDLERS` (extendable with the
+``JOB_HANDLERS`` setting). :class:`WorkerPool` runs jobs in threads and
+calls :func:`schedule_daily` to enqueue the recurring jobs once per day.
+"""
+
+import datetime
+import os
+import socket
+import threading
+import traceback
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+HANDLERS = {
+    "archive_sweep": "tasks.archive.sweep",
+    "department_delete": "tasks.archive.purge_department",
+    "onboarding_invites": "tasks.onboarding.send_invites",
+    "overdue_sweep": "tasks.reminders.overdue_sweep",
+    "reminder_digest": "tasks.reminders.reminder_digest",
+    "workload_refresh": "tasks.workload.refresh",
+}
+
+# Delay before the first retry; doubled after every further failure.
+RETRY_DELAY = 30
+
+# Longest delay between two attempts, in seconds.
+MAX_RETRY_DELAY = 3600
+
+
+def handlers():
+    """Return ``{kind: dotted path}`` of every runnable job kind."""
+    return {**HANDLERS, **getattr(settings, "JOB_HANDLERS", {})}
+
+
+def lock_timeout():
+    """Return after how many seconds a running job is considered abandoned."""
+    return getattr(settings, "JOB_LOCK_TIMEOUT", 900)
+
+
+def enqueue(kind, payload=None, run_at=None, key=None, max_attempts=5):
+    """
+    Add a job and return it.
+
+    When ``key`` is given and a job with that key already exists, the
+    existing job is returned instead, so scheduling is idempotent.
+    """
+    if kind not in handlers():
+        raise ValueError(f"Unknown job kind '{kind}'.")
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        run_at=run_at or timezone.now(),
+        key=key,
+        max_attempts=max_attempts,
+    )
+    if key is None:
+        job.save()
+        return job
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        return Job.objects.get(key=key)
+    return job
+
+
+def backoff(attempts):
+    """Return the delay before retrying a job that failed ``attempts`` times."""
+    return datetime.timedelta(
+        seconds=min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+    )
+
+
+def _abandoned(now):
+    """Return the lookup of running jobs whose worker died, as of ``now``."""
+    abandoned = now - datetime.timedelta(seconds=lock_timeout())
+    return Q(status=Job.RUNNING, locked_at__lt=abandoned)
+
+
+def _claimable(now):
+    """Return the jobs a worker may start at ``now``, oldest first."""
+    return Job.objects.filter(
+        Q(status=Job.PENDING, run_at__lte=now)
+        | _abandoned(now) & Q(attempts__lt=F("max_attempts"))
+    ).order_by("run_at", "pk")
+
+
+def claim(worker):
+    """
+    Mark the oldest due job as run by ``worker`` and return it, or ``None``.
+
+    Abandoned jobs without attempts left are marked failed first.
+    """
+    now = timezone.now()
+    Job.objects.filter(_abandoned(now), attempts__gte=F("max_attempts")).update(
+        status=Job.FAILED,
+        finished_at=now,
+        locked_at=None,
+        last_error="The worker stopped before the last attempt finished.",
+    )
+    claimed = {
+        "status": Job.RUNNING,
+        "locked_by": worker,
+        "locked_at": now,
+        "attempts": F("attempts") + 1,
+    }
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = _claimable(now).select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            Job.objects.filter(pk=job.pk).update(**claimed)
+    else:
+        for job in _claimable(now)[:10]:
+            # Only one worker's UPDATE still sees the row it read as claimable.
+            won = Job.objects.filter(
+                pk=job.pk, status=job.status, locked_at=job.locked_at
+            ).update(**claimed)
+            if won:
+                break
+        else:
+            return None
+    job.refresh_from_db()
+    return job
+
+
+def run(job):
+    """Run a claimed ``job`` and record its outcome; return whether it succeeded."""
+    try:
+        handler = import_string(handlers()[job.kind])
+        handler(**job.payload)
+    except Exception:  # pylint: disable=broad-exception-caught
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            outcome = {"status": Job.FAILED, "finished_at": now}
+        else:
+            outcome = {"status": Job.PENDING, "run_at": now + backoff(job.attempts)}
+        Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+            last_error=traceback.format_exc(), locked_at=None, **outcome
+        )
+        return False
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+        status=Job.DONE, finished_at=timezone.now(), locked_at=None
+    )
+    return True
+
+
+def run_next(worker):
+    """Claim and run one job; return ``None`` when no job was due."""
+    job = claim(worker)
+    if job is None:
+        return None
+    return run(job)
+
+
+def schedule_daily(today=None):
+    """Enqueue today's recurring jobs unless they are already queued."""
+    day = (today or timezone.localdate()).isoformat()
+    return [
+        enqueue("overdue_sweep", key=f"overdue_sweep:{day}"),
+        enqueue("reminder_digest", {"date": day}, key=f"reminder_digest:{day}"),
+        enqueue("workload_refresh", key=f"workload_refresh:{day}"),
+        enqueue("archive_sweep", key=f"archive_sweep:{day}"),
+    ]
+
+
+class WorkerPool:
+    """
+    Threads that claim and run jobs until stopped.
+
+    Each thread uses its own database connection, so ``concurrency`` jobs
+    run at once.
+
+    Attributes:
+        concurrency (int): Number of worker threads.
+        poll_interval (float): Seconds an idle thread waits before polling
+            again, or ``None`` to exit as soon as no job is due.
+        schedule (bool): Whether to enqueue the daily jobs on each new day.
+        totals (dict): Number of jobs that ``succeeded`` and ``failed``.
+    """
+
+    def __init__(self, concurrency=2, poll_interval=5.0, schedule=True):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.schedule = schedule
+        self.totals = {"succeeded": 0, "failed": 0}
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._scheduled = None
+
+    def run(self):
+        """Start the threads and wait for them to exit."""
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        threads = [
+            threading.Thread(target=self._work, args=(f"{prefix}:{index}",))
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        finally:
+            self.stop()
+            for thread in threads:
+                thread.join()
+        return self.totals
+
+    def stop(self):
+        """Ask the threads to exit after their current job."""
+        self._stopped.set()
+
+    def _schedule(self):
+        """Enqueue the daily jobs the first time a thread runs on a new day."""
+        today = timezone.localdate()
+        with self._lock:
+            if self._scheduled == today:
+                return
+            self._scheduled = today
+        schedule_daily(today)
+
+    def _work(self, worker):
+        """Claim and run jobs as ``worker`` until stopped."""
+        try:
+            while not self._stopped.is_set():
+                close_old_connections()
+                if self.schedule:
+                    self._schedule()
+                succeeded = run_next(worker)
+                if succeeded is None:
+                    if self.poll_interval is None:
+                        return
+                    self._stopped.wait(self.poll_interval)
+                    continue
+                with self._lock:
+                    self.totals["succeeded" if succeeded else "failed"] += 1
+        finally:
+            connection.close()
@@ -0,0 +1,138 @@
+"""
+A small HTTP load generator for comparing deployments.
+
+:func:`run` logs in once per worker thread, then requests each path a fixed
+number of times over plain ``urllib`` connections and reports
+throughput and latency percentiles. Pointing it at the same app served by a
+WSGI server (``gunicorn productivity_manager.wsgi``) and by an ASGI server
+(``uvicorn productivity_manager.asgi:application``), and at the sync and
+``async/`` dashboards, shows what the async read paths buy.
+``manage.py loadtest`` is the command line front end.
+"""
+
+import functools
+import http.cookiejar
+import time
+import urllib.parse
+import urllib.request
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .reports import percentiles
+
+DEFAULT_PATHS = ("/employee_dashboard/", "/async/employee_dashboard/")
+
+
+@dataclass
+class Result:
+    """
+    Measurements of one path.
+
+    Attributes:
+        path (str): Requested path.
+        requests (int): Requests sent.
+        errors (int): Requests that failed or did not return ``200``.
+        elapsed (float): Wall time of the whole run, in seconds.
+        latency_ms (dict): Latency percentiles in milliseconds.
+    """
+
+    path: str
+    requests: int
+    errors: int
+    elapsed: float
+    latency_ms: dict
+
+    @property
+    def rps(self):
+        """Completed requests per second."""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        """Return a JSON-serialisable summary."""
+        return {
+            "path": self.path,
+            "requests": self.requests,
+            "errors": self.errors,
+            "elapsed": round(self.elapsed, 3),
+            "rps": round(self.rps, 1),
+            "latency_ms": {
+                f"p{point}": None if value is None else round(value, 2)
+                for point, value in self.latency_ms.items()
+            },
+        }
+
+
+def _opener(base_url, username=None, password=None, timeout=30):
+    """Return a cookie-keeping opener, logged in when credentials are given."""
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    if username is None:
+        return opener
+
+    login_url = urllib.parse.urljoin(base_url, "/login/")
+    opener.open(login_url, timeout=timeout).read()
+    token = next((c.value for c in jar if c.name == "csrftoken"), "")
+    data = urllib.parse.urlencode(
+        {"username": username, "password": password, "csrfmiddlewaretoken": token}
+    ).encode()
+    request = urllib.request.Request(login_url, data, headers={"Referer": login_url})
+    opener.open(request, timeout=timeout).read()
+    if not any(cookie.name == "sessionid" for cookie in jar):
+        raise ValueError(f"Could not log in as '{username}'.")
+    return opener
+
+
+def _worker(opener, count, url, timeout):
+    """Send ``count`` requests; return ``(latencies in ms, error count)``."""
+    latencies = array("d")
+    errors = 0
+    for _ in range(count):
+        started = time.perf_counter()
+        try:
+            with opener.open(url, timeout=timeout) as response:
+                response.read()
+                ok = response.status == 200
+        except OSError:
+            ok = False
+        latencies.append((time.perf_counter() - started) * 1000)
+        errors += not ok
+    return latencies, errors
+
+
+def _load(pool, jobs, url, timeout):
+    """Run ``(opener, count)`` jobs against ``url`` and measure them."""
+    started = time.perf_counter()
+    worker = functools.partial(_worker, url=url, timeout=timeout)
+    outcomes = list(pool.map(worker, *zip(*jobs)))
+    elapsed = time.perf_counter() - started
+
+    latencies = array("d")
+    for measured, _ in outcomes:
+        latencies.extend(measured)
+    return len(latencies), sum(errors for _, errors in outcomes), elapsed, latencies
+
+
+def run(base_url, paths=DEFAULT_PATHS, requests=200, concurrency=10, **login):
+    """
+    Load ``paths`` on ``base_url`` one after another and return their results.
+
+    Each of ``concurrency`` threads sends its share of ``requests`` per
+    path. ``login`` may hold ``username``/``password`` and ``timeout``.
+    """
+    timeout = login.pop("timeout", 30)
+    jobs = [
+        (
+            _opener(base_url, timeout=timeout, **login),
+            requests // concurrency + (index < requests % concurrency),
+        )
+        for index in range(concurrency)
+    ]
+
+    results = []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for path in paths:
+            url = urllib.parse.urljoin(base_url, path)
+            sent, errors, elapsed, latencies = _load(pool, jobs, url, timeout)
+            results.append(Result(path, sent, errors, elapsed, percentiles(latencies)))
+    return results
@@ -0,0 +1,35 @@
+"""
+Management command that moves old rows to the archive tables.
+
+Moves tasks completed more than ``ARCHIVE_TASKS_AFTER_DAYS`` days ago, with
+their time logs, and time logs older than ``ARCHIVE_TIME_LOGS_AFTER_DAYS``
+days. The daily ``archive_sweep`` job does the same.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import archive
+
+
+class Command(BaseCommand):
+    """Archive completed tasks and old time logs."""
+
+    help = "Move completed tasks and old time logs to the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=archive.BATCH_SIZE,
+            help="Rows moved per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        moved = archive.sweep(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {moved['tasks']} tasks and {moved['time_logs']} time logs."
+            )
+        )
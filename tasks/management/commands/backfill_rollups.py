@@ -0,0 +1,28 @@
+"""
+Management command that rebuilds daily time rollups from the raw time logs.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import rollups
+from tasks.exports import parse_filter_date
+
+
+class Command(BaseCommand):
+    """Recompute ``DailyTimeRollup`` rows for a range of days."""
+
+    help = "Rebuild daily time rollups from time logs (all days by default)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="First day rebuilt (YYYY-MM-DD).")
+        parser.add_argument("--until", help="Last day rebuilt (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_filter_date(options["since"])
+            until = parse_filter_date(options["until"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        written = rollups.backfill(since, until)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} rollup rows."))
@@ -0,0 +1,93 @@
+"""
+Management command that benchmarks the views and compares the results with
+a saved baseline.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import benchmark
+
+
+class Command(BaseCommand):
+    """Report latency percentiles and query counts per view."""
+
+    help = (
+        "Request each view with the test client and report latency "
+        "percentiles and query counts, optionally against a JSON baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--view",
+            action="append",
+            dest="views",
+            choices=[view.name for view in benchmark.VIEWS],
+            help="Only benchmark this view; repeat for several.",
+        )
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="Clear the cache before every request.",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument(
+            "--baseline", help="Compare with the results saved in this JSON file."
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Latency increase tolerated before reporting a regression, "
+            "as a fraction (default: 0.2).",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error when a regression is found.",
+        )
+
+    def handle(self, *args, **options):
+        views = benchmark.VIEWS
+        if options["views"]:
+            views = [view for view in views if view.name in options["views"]]
+        baseline = None
+        try:
+            if options["baseline"]:
+                with open(options["baseline"], encoding="utf-8") as stream:
+                    baseline = json.load(stream)
+            results = benchmark.run(
+                views, options["requests"], options["warmup"], options["cold"]
+            )
+            if options["output"]:
+                with open(options["output"], "w", encoding="utf-8") as stream:
+                    json.dump(results, stream, indent=2)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        for name, result in results["views"].items():
+            latency = ", ".join(
+                f"{point}={value}ms" for point, value in result["latency_ms"].items()
+            )
+            self.stdout.write(
+                f"{name}: {result['queries']} queries, "
+                f"{result['errors']}/{result['requests']} errors, {latency}"
+            )
+        if baseline is None:
+            return
+        regressions = benchmark.compare(baseline, results, options["tolerance"])
+        for name, metric, before, after in regressions:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Regression in {name} {metric}: {before} -> {after}"
+                )
+            )
+        if not regressions:
+            self.stdout.write(
+                self.style.SUCCESS("No regressions against the baseline.")
+            )
+        elif options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} regressions against the baseline.")
@@ -0,0 +1,41 @@
+"""
+Management command that compares concurrent write throughput with and
+without the SQLite production profile.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import benchmark
+
+
+class Command(BaseCommand):
+    """Report time logs written per second under each SQLite profile."""
+
+    help = (
+        "Log time from several threads at once, first with the default SQLite "
+        "settings and then with the production profile, and report the "
+        "throughput of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--writes", type=int, default=100, help="Time logs written per thread."
+        )
+
+    def handle(self, *args, **options):
+        threads, writes = options["threads"], options["writes"]
+        try:
+            default = benchmark.write_throughput(threads, writes, production=False)
+            production = benchmark.write_throughput(threads, writes, production=True)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        for result in (default, production):
+            self.stdout.write(
+                f"{result['profile']}: {result['writes']} writes in "
+                f"{result['elapsed']}s ({result['writes_per_second']}/s), "
+                f"{result['failures']} failed with lock errors"
+            )
+        if default["writes_per_second"]:
+            gain = production["writes_per_second"] / default["writes_per_second"]
+            self.stdout.write(self.style.SUCCESS(f"Production profile: {gain:.1f}x"))
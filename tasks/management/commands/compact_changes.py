@@ -0,0 +1,44 @@
+"""
+Management command that compacts the change feed.
+
+Deletes the change events older than the retention period that a later
+event of the same row supersedes, keeping the latest event of every row.
+Schedule it daily.
+"""
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import outbox
+
+
+class Command(BaseCommand):
+    """Drop superseded change events past the retention period."""
+
+    help = "Compact the change feed, keeping the latest event of every row."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-days",
+            type=float,
+            default=7,
+            help="Keep every event of the last this many days (default: 7).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=outbox.BATCH_SIZE,
+            help="Events examined per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if options["keep_days"] < 0 or options["batch_size"] < 1:
+            raise CommandError("--keep-days and --batch-size must be positive.")
+        until = outbox.horizon(datetime.timedelta(days=options["keep_days"]))
+        deleted = outbox.compact(until, batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted} superseded events up to sequence {until}."
+            )
+        )
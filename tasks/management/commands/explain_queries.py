@@ -0,0 +1,92 @@
+"""
+Management command that prints the query plan of each view's hot queries.
+
+Run it against SQLite or PostgreSQL to confirm the composite indexes declared
+in ``tasks.models`` are picked up by the planner.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from tasks.models import Department, Employee, Goal, Task, TimeLog
+
+
+class Command(BaseCommand):
+    """Run EXPLAIN on the querysets behind the tasks views."""
+
+    help = "Print the database query plan for each view's querysets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            help="Username whose dashboards are explained (default: first employee).",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Execute the queries and report actual timings (PostgreSQL only).",
+        )
+
+    def handle(self, *args, **options):
+        employee = self.get_employee(options["user"])
+        explain_options = {}
+        if options["analyze"] and connection.vendor == "postgresql":
+            explain_options["analyze"] = True
+
+        for label, queryset in self.get_querysets(employee):
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write("")
+
+    def get_employee(self, username):
+        """Resolve the employee whose dashboards are explained."""
+        if username is None:
+            employee = Employee.objects.with_related().first()
+            if employee is None:
+                raise CommandError("No employees exist; pass --user or add data.")
+            return employee
+
+        try:
+            return Employee.objects.with_related().get(user__username=username)
+        except Employee.DoesNotExist as exc:
+            raise CommandError(f"No employee profile for user '{username}'.") from exc
+
+    @staticmethod
+    def get_querysets(employee):
+        """Return ``(label, queryset)`` pairs mirroring the views' queries."""
+        week_ago = timezone.now() - datetime.timedelta(days=7)
+        return [
+            ("employee_dashboard: tasks", Task.objects.for_employee(employee)),
+            (
+                "employee_dashboard: open tasks",
+                Task.objects.filter(assigned_to=employee, completed=False).order_by(
+                    "due_date"
+                ),
+            ),
+            ("goal_dashboard: goals", Goal.objects.for_employee(employee)),
+            (
+                "time logs: by employee since last week",
+                TimeLog.objects.filter(
+                    employee=employee, start_time__gte=week_ago
+                ).order_by("start_time"),
+            ),
+            (
+                "time logs: overlap check",
+                TimeLog.objects.overlapping(
+                    employee,
+                    timezone.now() - datetime.timedelta(hours=1),
+                    timezone.now(),
+                ),
+            ),
+            (
+                "time logs: by task",
+                TimeLog.objects.filter(task__assigned_to=employee),
+            ),
+            ("employee_list", Employee.objects.with_related()),
+            ("department_list", Department.objects.with_related()),
+            ("user_list", User.objects.order_by("username")),
+        ]
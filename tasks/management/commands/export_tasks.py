@@ -0,0 +1,82 @@
+"""
+Management command that streams tasks, time logs, goals or journal entries
+to a file, optionally gzip-compressed.
+"""
+
+import contextlib
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import exports
+
+
+class Command(BaseCommand):
+    """Write an export to disk without loading it into memory."""
+
+    help = "Export tasks, time logs, goals or journal entries as CSV or JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "kind",
+            nargs="?",
+            default="tasks",
+            choices=sorted(exports.EXPORTS),
+            help="What to export (default: tasks).",
+        )
+        parser.add_argument("--format", choices=exports.FORMATS, default="csv")
+        parser.add_argument(
+            "--output", "-o", help="Destination file (default: stdout)."
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Compress the output; implied by an --output ending in .gz.",
+        )
+        parser.add_argument("--department", type=int, help="Department id.")
+        parser.add_argument("--employee", type=int, help="Employee id.")
+        parser.add_argument("--since", help="First date included (YYYY-MM-DD).")
+        parser.add_argument("--until", help="Last date included (YYYY-MM-DD).")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=exports.CHUNK_SIZE,
+            help="Rows fetched per database round trip.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            lines = exports.export_lines(
+                options["kind"],
+                options["format"],
+                department=options["department"],
+                employee=options["employee"],
+                since=exports.parse_filter_date(options["since"]),
+                until=exports.parse_filter_date(options["until"]),
+                chunk_size=options["chunk_size"],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        path = options["output"]
+        compress = options["gzip"] or (path or "").endswith(".gz")
+        count = 0
+        with contextlib.ExitStack() as stack:
+            if compress:
+                target = path or sys.stdout.buffer
+                stream = stack.enter_context(
+                    gzip.open(target, "wt", encoding="utf-8", newline="")
+                )
+            elif path:
+                stream = stack.enter_context(
+                    open(path, "w", encoding="utf-8", newline="")
+                )
+            else:
+                stream = self.stdout
+            for line in lines:
+                stream.write(line)
+                count += 1
+
+        if path:
+            self.stderr.write(f"Wrote {count} lines to {path}.")
@@ -0,0 +1,62 @@
+"""
+Management command that bulk-imports tasks from a CSV or JSON file.
+"""
+
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import bulk
+
+
+class Command(BaseCommand):
+    """Create tasks in batches from a file, reporting invalid rows."""
+
+    help = "Bulk-create tasks from a CSV or JSON (array or JSON Lines) file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import; '-' reads stdin.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "json"],
+            help="Input format (default: inferred from the file extension).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=bulk.BATCH_SIZE,
+            help="Rows per INSERT statement.",
+        )
+        parser.add_argument(
+            "--partial",
+            action="store_true",
+            help="Insert the valid rows even when some rows are invalid.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or (
+            "json" if path.endswith((".json", ".jsonl")) else "csv"
+        )
+        try:
+            if path == "-":
+                rows = bulk.read_rows(sys.stdin, fmt)
+            else:
+                with open(path, encoding="utf-8-sig", newline="") as stream:
+                    rows = bulk.read_rows(stream, fmt)
+        except (OSError, ValueError, csv.Error) as exc:
+            raise CommandError(f"Could not read {path}: {exc}") from exc
+
+        result = bulk.import_tasks(
+            rows, batch_size=options["batch_size"], partial=options["partial"]
+        )
+        for error in result.errors:
+            details = "; ".join(
+                f"{name}: {' '.join(messages)}"
+                for name, messages in error["errors"].items()
+            )
+            self.stderr.write(f"Row {error['row']}: {details}")
+        if result.errors and not options["partial"]:
+            raise CommandError(f"{len(result.errors)} invalid rows; nothing imported.")
+        self.stdout.write(self.style.SUCCESS(f"Created {result.created} tasks."))
@@ -0,0 +1,70 @@
+"""
+Management command that load-tests a running server, e.g. to compare the
+sync and async dashboards under WSGI and ASGI.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import loadtest
+
+
+class Command(BaseCommand):
+    """Report requests per second and latency percentiles per path."""
+
+    help = (
+        "Send concurrent requests to a running server and report throughput "
+        "and latency per path."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "base_url", help="Server to load, e.g. http://127.0.0.1:8000."
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help=(
+                "Path to request; repeat for several "
+                f"(default: {', '.join(loadtest.DEFAULT_PATHS)})."
+            ),
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument("--username", help="Log in as this user first.")
+        parser.add_argument("--password", default="")
+        parser.add_argument(
+            "--json", action="store_true", help="Print the results as JSON."
+        )
+
+    def handle(self, *args, **options):
+        login = {}
+        if options["username"]:
+            login = {"username": options["username"], "password": options["password"]}
+        try:
+            results = loadtest.run(
+                options["base_url"],
+                options["paths"] or loadtest.DEFAULT_PATHS,
+                requests=options["requests"],
+                concurrency=options["concurrency"],
+                **login,
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        if options["json"]:
+            self.stdout.write(
+                json.dumps([result.as_dict() for result in results], indent=2)
+            )
+            return
+        for result in results:
+            summary = result.as_dict()
+            latency = ", ".join(
+                f"{point}={value}ms" for point, value in summary["latency_ms"].items()
+            )
+            self.stdout.write(
+                f"{result.path}: {summary['rps']} req/s, "
+                f"{result.errors}/{result.requests} errors, {latency}"
+            )
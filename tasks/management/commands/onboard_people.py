@@ -0,0 +1,87 @@
+"""
+Management command that onboards users and employees from a CSV file.
+"""
+
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import jobs, onboarding
+
+
+class Command(BaseCommand):
+    """Create users and employees in chunks, reporting progress."""
+
+    help = (
+        "Bulk-create users and their employee profiles from a CSV file with "
+        "username, first_name, last_name, email, password, is_staff, "
+        "department, date_joined and position columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import; '-' reads stdin.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=onboarding.CHUNK_SIZE,
+            help="Rows validated and inserted per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Password hashing processes (default: one per CPU; 0 hashes "
+            "in this process).",
+        )
+        parser.add_argument(
+            "--unusable-passwords",
+            action="store_true",
+            help="Ignore the password column and give everyone an unusable "
+            "password.",
+        )
+        parser.add_argument(
+            "--invite",
+            action="store_true",
+            help="Queue emails with a link to set a password for users without one.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            if path == "-":
+                created, invalid = self.onboard(sys.stdin, options)
+            else:
+                with open(path, encoding="utf-8-sig", newline="") as stream:
+                    created, invalid = self.onboard(stream, options)
+        except OSError as exc:
+            raise CommandError(f"Could not read {path}: {exc}") from exc
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} users; skipped {invalid} invalid rows."
+            )
+        )
+
+    def onboard(self, stream, options):
+        """Import ``stream``; return the number of users created and rows skipped."""
+        progress = onboarding.Progress()
+        invalid = 0
+        for progress in onboarding.import_people(
+            csv.DictReader(stream),
+            chunk_size=options["chunk_size"],
+            hash_passwords=not options["unusable_passwords"],
+            workers=options["workers"],
+        ):
+            for error in progress.errors:
+                details = "; ".join(
+                    f"{name}: {' '.join(messages)}"
+                    for name, messages in error["errors"].items()
+                )
+                self.stderr.write(f"Row {error['row']}: {details}")
+            invalid += len(progress.errors)
+            if options["invite"] and progress.user_ids:
+                jobs.enqueue("onboarding_invites", {"user_ids": progress.user_ids})
+            self.stderr.write(
+                f"Processed {progress.processed} rows: "
+                f"{progress.created} created, {invalid} invalid."
+            )
+        return progress.created, invalid
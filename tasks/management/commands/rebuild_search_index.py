@@ -0,0 +1,22 @@
+"""
+Management command that repopulates the full-text search index.
+"""
+
+from django.core.management.base import BaseCommand
+
+from tasks import search
+
+
+class Command(BaseCommand):
+    """Reindex every task, goal and journal entry."""
+
+    help = "Rebuild the full-text search index (run after migrating existing data)."
+
+    def handle(self, *args, **options):
+        if not search.supported(write=True):
+            self.stdout.write(
+                self.style.WARNING("This database has no full-text index to rebuild.")
+            )
+            return
+        total = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} documents."))
@@ -0,0 +1,57 @@
+"""
+Management command that runs background jobs from the database queue.
+"""
+
+from django.core.management.base import BaseCommand
+
+from tasks import jobs
+
+
+class Command(BaseCommand):
+    """Run queued jobs in a pool of worker threads."""
+
+    help = (
+        "Run background jobs (overdue sweeps, reminder digests) with a "
+        "configurable number of worker threads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=2,
+            help="Number of worker threads (default: 2).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds an idle worker waits before polling again.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of polling forever.",
+        )
+        parser.add_argument(
+            "--no-schedule",
+            action="store_true",
+            help="Do not enqueue the daily sweep and digest jobs.",
+        )
+
+    def handle(self, *args, **options):
+        pool = jobs.WorkerPool(
+            concurrency=options["concurrency"],
+            poll_interval=None if options["once"] else options["poll_interval"],
+            schedule=not options["no_schedule"],
+        )
+        try:
+            totals = pool.run()
+        except KeyboardInterrupt:
+            self.stderr.write("Stopped after the running jobs finished.")
+            totals = pool.totals
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{totals['succeeded']} jobs succeeded, {totals['failed']} failed."
+            )
+        )
@@ -0,0 +1,77 @@
+"""
+Management command that fills the database with synthetic data for
+benchmarks.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import synthetic
+
+
+class Command(BaseCommand):
+    """Generate departments, employees and their records with bulk inserts."""
+
+    help = (
+        "Generate realistic departments, employees, tasks, time logs, goals "
+        "and journal entries, about --rows rows in total."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=10_000,
+            help="Approximate number of rows to create, e.g. 10000 to 10000000.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the random generator."
+        )
+        parser.add_argument(
+            "--prefix",
+            default="synthetic",
+            help="Prefix of the generated usernames.",
+        )
+        parser.add_argument(
+            "--password",
+            default=synthetic.PASSWORD,
+            help="Password shared by every generated user.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=synthetic.CHUNK_SIZE,
+            help="Employees generated and inserted per transaction.",
+        )
+        parser.add_argument(
+            "--skip-derived",
+            action="store_true",
+            help="Do not rebuild counters, workloads, rollups and the search "
+            "index afterwards.",
+        )
+
+    def handle(self, *args, **options):
+        departments, employees = synthetic.plan(options["rows"])
+        self.stderr.write(
+            f"Creating {departments} departments and {employees} employees."
+        )
+        seeded = synthetic.Seeded()
+        try:
+            for seeded in synthetic.seed(
+                rows=options["rows"],
+                random_seed=options["seed"],
+                prefix=options["prefix"],
+                password=options["password"],
+                chunk_size=options["chunk_size"],
+                derived=not options["skip_derived"],
+            ):
+                self.stderr.write(f"Wrote {seeded.total} rows.")
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        for name, rows in sorted(seeded.counts.items()):
+            self.stdout.write(f"{name}: {rows}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {seeded.total} rows; log in as "
+                f"'{options['prefix']}-admin' or '{options['prefix']}-0'."
+            )
+        )
@@ -0,0 +1,45 @@
+"""
+Management command that refreshes the read replicas.
+
+SQLite replicas stored in files are overwritten with a copy of the primary;
+other replicas only receive a new heartbeat through replication, which is
+how their lag is measured.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import routing
+
+
+class Command(BaseCommand):
+    """Write a heartbeat and copy the primary to SQLite replicas."""
+
+    help = "Refresh the read replicas and their replication heartbeat."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            action="append",
+            dest="aliases",
+            help="Only refresh this replica alias (repeatable).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep refreshing every this many seconds instead of once.",
+        )
+
+    def handle(self, *args, **options):
+        aliases = options["aliases"] or routing.replicas()
+        unknown = set(aliases) - set(routing.replicas())
+        if unknown:
+            raise CommandError(f"Not a replica: {', '.join(sorted(unknown))}.")
+        while True:
+            for alias in aliases:
+                routing.sync(alias)
+                self.stdout.write(f"Refreshed {alias}.")
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
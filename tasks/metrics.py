@@ -0,0 +1,292 @@
+"""
+In-process request metrics exposed in the Prometheus text format.
+
+``tasks.middleware.MetricsMiddleware`` measures every request and records,
+per view name, histograms of:
+
+* wall time,
+* the number of database queries and the time spent in them, measured
+  by an execute wrapper added to every database connection,
+* template render time, measured by wrapping the Django template backend,
+* response size (unknown for streaming responses, which are skipped).
+
+Requests slower than ``SLOW_REQUEST_THRESHOLD`` seconds are logged to the
+``tasks.metrics`` logger together with their slowest SQL statement.
+
+Recording an observation is a bisect and a few additions under one lock,
+so the instrumentation can stay enabled in production. Histograms live in
+the memory of each process: scrape every worker process, or run a single
+process per scrape target, to see all requests.
+"""
+
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import Template
+
+logger = logging.getLogger(__name__)
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+BYTES_BUCKETS = (1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000)
+
+# ``(name, help, buckets)`` of every histogram, keyed by the stats field.
+HISTOGRAMS = {
+    "duration": (
+        "tasks_request_duration_seconds",
+        "Wall time of requests by view.",
+        SECONDS_BUCKETS,
+    ),
+    "queries": (
+        "tasks_request_db_queries",
+        "Database queries per request by view.",
+        QUERY_BUCKETS,
+    ),
+    "db_time": (
+        "tasks_request_db_duration_seconds",
+        "Time spent in database queries per request by view.",
+        SECONDS_BUCKETS,
+    ),
+    "render_time": (
+        "tasks_request_template_render_seconds",
+        "Template render time per request by view.",
+        SECONDS_BUCKETS,
+    ),
+    "size": (
+        "tasks_response_size_bytes",
+        "Size of non-streaming response bodies by view.",
+        BYTES_BUCKETS,
+    ),
+}
+
+# Statistics of the request being handled in the current context.
+_current = contextvars.ContextVar("tasks_request_stats", default=None)
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed upper bounds.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the buckets, ascending.
+        counts (list): Observations per bucket; the last is ``+Inf``.
+        sum (float): Sum of all observations.
+        count (int): Number of observations.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Record one ``value``."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Yield ``(upper bound, observations at or below it)`` pairs."""
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+
+@dataclass
+class RequestStats:
+    """
+    Measurements of one request.
+
+    Attributes:
+        queries (int): Number of database queries run.
+        db_time (float): Seconds spent in database queries.
+        render_time (float): Seconds spent rendering templates.
+        worst_sql (str): Slowest statement run.
+        worst_sql_time (float): Seconds the slowest statement took.
+        rendering (bool): Whether a template is being rendered, so nested
+            renders (form widgets) are not counted twice.
+    """
+
+    queries: int = 0
+    db_time: float = 0.0
+    render_time: float = 0.0
+    worst_sql: str = ""
+    worst_sql_time: float = 0.0
+    rendering: bool = False
+
+    def __call__(self, execute, sql, params, many, context):
+        """Time a query; called by :func:`_execute`."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += elapsed
+            if elapsed > self.worst_sql_time:
+                self.worst_sql, self.worst_sql_time = sql, elapsed
+
+
+class Registry:
+    """Histograms per metric and view, plus response counts per status."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.responses = {}
+
+    def record(self, view, status, duration, stats, size=None):
+        """Add one request's measurements."""
+        values = {
+            "duration": duration,
+            "queries": stats.queries,
+            "db_time": stats.db_time,
+            "render_time": stats.render_time,
+            "size": size,
+        }
+        with self.lock:
+            for field, value in values.items():
+                if value is None:
+                    continue
+                key = (field, view)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(HISTOGRAMS[field][2])
+                self.histograms[key].observe(value)
+            key = (view, status)
+            self.responses[key] = self.responses.get(key, 0) + 1
+
+    def clear(self):
+        """Forget every observation."""
+        with self.lock:
+            self.histograms.clear()
+            self.responses.clear()
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            for field, (name, help_text, _) in HISTOGRAMS.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (kind, view), histogram in sorted(self.histograms.items()):
+                    if kind != field:
+                        continue
+                    label = f'view="{_escape(view)}"'
+                    for bound, total in histogram.cumulative():
+                        lines.append(
+                            f'{name}_bucket{{{label},le="{_bound(bound)}"}} {total}'
+                        )
+                    lines.append(f"{name}_sum{{{label}}} {histogram.sum!r}")
+                    lines.append(f"{name}_count{{{label}}} {histogram.count}")
+            name = "tasks_http_responses_total"
+            lines += [
+                f"# HELP {name} Responses by view and status code.",
+                f"# TYPE {name} counter",
+            ]
+            for (view, status), total in sorted(self.responses.items()):
+                lines.append(
+                    f'{name}{{view="{_escape(view)}",status="{status}"}} {total}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _escape(value):
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _bound(value):
+    """Format a bucket bound, e.g. ``0.5``, ``100`` or ``+Inf``."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def slow_request_threshold():
+    """Return the wall time in seconds above which requests are logged."""
+    return getattr(settings, "SLOW_REQUEST_THRESHOLD", 1.0)
+
+
+def start():
+    """Begin measuring a request in the current context."""
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def finish(token):
+    """Stop measuring the request begun with :func:`start`."""
+    _current.reset(token)
+
+
+def log_if_slow(view, duration, stats):
+    """Log a request slower than the threshold with its worst SQL."""
+    if duration < slow_request_threshold():
+        return
+    logger.warning(
+        "Slow request to %s: %.3fs, %d queries in %.3fs, %.3fs rendering; "
+        "slowest SQL (%.3fs): %s",
+        view,
+        duration,
+        stats.queries,
+        stats.db_time,
+        stats.render_time,
+        stats.worst_sql_time,
+        stats.worst_sql[:2000],
+    )
+
+
+_original_render = Template.render
+
+
+def _timed_render(self, context=None, request=None):
+    """Render a template, adding the time taken to the current request."""
+    stats = _current.get()
+    if stats is None or stats.rendering:
+        return _original_render(self, context, request)
+    stats.rendering = True
+    started = time.perf_counter()
+    try:
+        return _original_render(self, context, request)
+    finally:
+        stats.render_time += time.perf_counter() - started
+        stats.rendering = False
+
+
+def _execute(execute, sql, params, many, context):
+    """Time a query for the request being handled, if any."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def _wrap_connection(connection, **kwargs):
+    """Add :func:`_execute` to ``connection`` unless it already has it."""
+    if _execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute)
+
+
+def install():
+    """
+    Time queries and template rendering; idempotent.
+
+    Connections are per thread, and async views run their queries on other
+    threads, so the wrapper is added to every connection as it is opened.
+    The request is found through a context variable, which ``sync_to_async``
+    carries over to those threads.
+    """
+    for connection in connections.all():
+        _wrap_connection(connection)
+    connection_created.connect(_wrap_connection, dispatch_uid="tasks.metrics")
+    Template.render = _timed_render
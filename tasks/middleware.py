@@ -0,0 +1,170 @@
+"""
+Middleware for the Tasks application.
+
+``EmployeeMiddleware`` resolves the logged-in user's ``Employee`` profile and
+department once per request and exposes it as ``request.employee``, so views
+can filter by primary key instead of joining through ``User``.
+``MetricsMiddleware`` feeds the request metrics of ``tasks.metrics`` and
+``ReplicaRoutingMiddleware`` tracks the replica routing state of
+``tasks.routing``. All run natively under WSGI and ASGI.
+"""
+
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics, routing
+from .models import Employee
+
+# Cached marker for users without an employee profile.
+NO_EMPLOYEE = "none"
+
+
+def employee_cache_key(user_id):
+    """Return the cache key holding the employee profile of ``user_id``."""
+    return f"tasks:employee:{user_id}"
+
+
+def invalidate_employee(*user_ids):
+    """Drop the cached employee profiles of ``user_ids``."""
+    cache.delete_many([employee_cache_key(user_id) for user_id in user_ids])
+
+
+def get_employee(user):
+    """
+    Return the employee profile of ``user`` with its department, or ``None``.
+
+    Profiles are cached until the employee or their department is saved.
+    """
+    if not user.is_authenticated:
+        return None
+
+    key = employee_cache_key(user.pk)
+    employee = cache.get(key)
+    if employee is None:
+        employee = (
+            Employee.objects.select_related("department").filter(user=user).first()
+            or NO_EMPLOYEE
+        )
+        timeout = getattr(settings, "EMPLOYEE_CACHE_TIMEOUT", 3600)
+        cache.set(key, employee, timeout)
+    if employee == NO_EMPLOYEE:
+        return None
+
+    employee.user = user
+    return employee
+
+
+class EmployeeMiddleware:
+    """Attach the logged-in user's employee profile to ``request.employee``."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request.employee = get_employee(request.user)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        # Resolving the lazy ``request.user`` queries the session and user
+        # tables, which must happen outside the event loop.
+        request.employee = await sync_to_async(get_employee)(request.user)
+        return await self.get_response(request)
+
+
+class MetricsMiddleware:
+    """
+    Record wall time, queries, render time and size of every request.
+
+    Place it first in ``MIDDLEWARE`` so the other middleware is measured too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        metrics.install()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token = metrics.start()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.finish(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats, token = metrics.start()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.finish(token)
+        self.record(request, response, time.perf_counter() - started, stats)
+        return response
+
+    @staticmethod
+    def record(request, response, duration, stats):
+        """Add the request to the metrics registry and the slow request log."""
+        match = request.resolver_match
+        view = match.view_name if match else "<unresolved>"
+        size = None if response.streaming else len(response.content)
+        metrics.REGISTRY.record(view, response.status_code, duration, stats, size)
+        metrics.log_if_slow(view, duration, stats)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Track which database each request may read from.
+
+    Place it after ``SessionMiddleware``: a request that writes pins its
+    session to the primary, and the session must be saved afterwards.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = routing.start(getattr(request, "session", None))
+        try:
+            return self.get_response(request)
+        finally:
+            routing.finish(token)
+            self.pin(request, state)
+
+    async def __acall__(self, request):
+        state, token = routing.start(getattr(request, "session", None))
+        try:
+            return await self.get_response(request)
+        finally:
+            routing.finish(token)
+            self.pin(request, state)
+
+    @staticmethod
+    def pin(request, state):
+        """Pin the session of a request that wrote to the primary."""
+        if state.wrote and hasattr(request, "session"):
+            routing.pin(request.session)
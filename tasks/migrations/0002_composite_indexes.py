@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="goal",
+            index=models.Index(
+                fields=["employee", "target_date"], name="goal_employee_target_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["assigned_to", "completed", "due_date"],
+                name="task_assignee_open_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="timelog",
+            index=models.Index(
+                fields=["employee", "start_time"], name="timelog_employee_start_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0002_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scope_id", models.PositiveBigIntegerField(blank=True, null=True)),
+                ("name", models.CharField(max_length=50)),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="counter",
+            constraint=models.UniqueConstraint(
+                fields=("scope_id", "name"), name="counter_scope_name_uniq"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="counter",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("scope_id__isnull", True)),
+                fields=("name",),
+                name="counter_org_name_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0003_counter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyTimeRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("seconds", models.BigIntegerField(default=0)),
+                ("log_count", models.PositiveIntegerField(default=0)),
+                (
+                    "department",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="time_rollups",
+                        to="tasks.department",
+                    ),
+                ),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="time_rollups",
+                        to="tasks.employee",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="time_rollups",
+                        to="tasks.task",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["department", "date"], name="rollup_department_day_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailytimerollup",
+            constraint=models.UniqueConstraint(
+                fields=("date", "employee", "task", "department"),
+                name="rollup_day_key_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Full-text search index for tasks, goals and journal entries.
+
+from django.db import migrations
+
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE tasks_search USING fts5(
+    kind UNINDEXED,
+    object_id UNINDEXED,
+    employee_id UNINDEXED,
+    title,
+    body,
+    tokenize = 'porter unicode61'
+)
+"""
+
+POSTGRESQL_CREATE = [
+    """
+    CREATE TABLE tasks_search (
+        kind varchar(20) NOT NULL,
+        object_id bigint NOT NULL,
+        employee_id bigint NOT NULL,
+        title text NOT NULL,
+        body text NOT NULL,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', title), 'A')
+            || setweight(to_tsvector('english', body), 'B')
+        ) STORED,
+        PRIMARY KEY (kind, object_id)
+    )
+    """,
+    "CREATE INDEX tasks_search_document_idx ON tasks_search USING GIN (document)",
+]
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+    elif vendor == "postgresql":
+        for statement in POSTGRESQL_CREATE:
+            schema_editor.execute(statement)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS tasks_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0004_daily_time_rollup"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
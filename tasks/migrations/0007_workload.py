@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0006_job_queue"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Workload",
+            fields=[
+                (
+                    "employee",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="workload",
+                        serialize=False,
+                        to="tasks.employee",
+                    ),
+                ),
+                ("open_tasks", models.PositiveIntegerField(default=0)),
+                ("weighted_load", models.PositiveIntegerField(default=0)),
+                ("seconds_last_7_days", models.BigIntegerField(default=0)),
+                ("next_due_date", models.DateField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["weighted_load", "open_tasks"], name="workload_load_idx"
+                    )
+                ],
+            },
+        ),
+    ]
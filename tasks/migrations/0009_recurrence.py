@@ -0,0 +1,109 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:51
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import re
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0008_replication_heartbeat"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Recurrence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=255)),
+                ("description", models.TextField(blank=True)),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("Low", "Low"),
+                            ("Medium", "Medium"),
+                            ("High", "High"),
+                        ],
+                        default="Medium",
+                        max_length=6,
+                    ),
+                ),
+                (
+                    "frequency",
+                    models.CharField(
+                        choices=[
+                            ("daily", "Daily"),
+                            ("weekly", "Weekly"),
+                            ("monthly", "Monthly"),
+                        ],
+                        max_length=7,
+                    ),
+                ),
+                ("interval", models.PositiveSmallIntegerField(default=1)),
+                (
+                    "weekdays",
+                    models.CharField(
+                        blank=True,
+                        max_length=13,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                re.compile("^\\d+(?:,\\d+)*\\Z"),
+                                code="invalid",
+                                message="Enter only digits separated by commas.",
+                            )
+                        ],
+                    ),
+                ),
+                ("starts_on", models.DateField()),
+                ("ends_on", models.DateField(blank=True, null=True)),
+                ("active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="recurrence",
+            name="assigned_to",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="recurrences",
+                to="tasks.employee",
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="recurrence",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="occurrences",
+                to="tasks.recurrence",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="task",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("recurrence__isnull", False)),
+                fields=("recurrence", "due_date"),
+                name="task_recurrence_occurrence_uniq",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurrence",
+            index=models.Index(
+                fields=["assigned_to", "active"], name="recurrence_assignee_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0009_recurrence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActiveTimer",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("started_at", models.DateTimeField()),
+                (
+                    "employee",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timer",
+                        to="tasks.employee",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timers",
+                        to="tasks.task",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name="timelog",
+            name="timelog_employee_start_idx",
+        ),
+        migrations.AlterField(
+            model_name="timelog",
+            name="duration",
+            field=models.DurationField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="timelog",
+            index=models.Index(
+                fields=["employee", "start_time", "end_time"],
+                name="timelog_employee_interval_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0011_change_event"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="department",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name="dailytimerollup",
+            name="task",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="time_rollups",
+                to="tasks.task",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ArchivedTimeLog",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("task_id", models.BigIntegerField()),
+                ("start_time", models.DateTimeField()),
+                ("end_time", models.DateTimeField()),
+                ("duration", models.DurationField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_time_logs",
+                        to="tasks.employee",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["employee", "start_time", "id"],
+                        name="archivedlog_employee_start_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=255)),
+                ("description", models.TextField()),
+                ("due_date", models.DateField()),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("Low", "Low"),
+                            ("Medium", "Medium"),
+                            ("High", "High"),
+                        ],
+                        max_length=6,
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "assigned_to",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_tasks",
+                        to="tasks.employee",
+                    ),
+                ),
+                (
+                    "recurrence",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_occurrences",
+                        to="tasks.recurrence",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["assigned_to", "due_date", "id"],
+                        name="archivedtask_assignee_due_idx",
+                    )
+                ],
+            },
+        ),
+    ]
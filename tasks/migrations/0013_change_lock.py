@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:29
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def create_lock(apps, schema_editor):
+    apps.get_model("tasks", "ChangeLock").objects.using(
+        schema_editor.connection.alias
+    ).get_or_create(name="changes")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0012_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLock",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("locked_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(create_lock, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0013_change_lock"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="dailytimerollup",
+            name="rollup_day_key_uniq",
+        ),
+        migrations.AddConstraint(
+            model_name="dailytimerollup",
+            constraint=models.UniqueConstraint(
+                fields=("date", "employee", "task"), name="rollup_day_key_uniq"
+            ),
+        ),
+    ]
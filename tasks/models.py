@@ -1,8 +1,135 @@
+import datetime
+
 from django.contrib.auth.models import User
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import validate_comma_separated_integer_list
+from django.db import models, router, transaction
+from django.utils import timezone
 
 priority_choices = [("Low", "Low"), ("Medium", "Medium"), ("High", "High")]
 
+# Longest time a single time log may cover. Overlap checks rely on it to
+# bound their range scan, so existing logs must not exceed it.
+MAX_LOG_DURATION = datetime.timedelta(hours=24)
+
+
+# Mixins
+class RecordsChanges:
+    """
+    Saves rows together with their ``tasks.outbox`` change event.
+
+    Signal handlers append the event; saving inside a transaction commits
+    both or neither. The :class:`ChangeLock` is taken before the row is
+    written, so every writer locks the feed first and rows second. Deletes
+    already run in a transaction and take the lock from ``pre_delete``.
+    """
+
+    def save(self, *args, **kwargs):
+        """Save the row in a transaction shared with its change event."""
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            ChangeLock.acquire(using)
+            super().save(*args, **kwargs)
+
+
+# Querysets
+class DepartmentQuerySet(models.QuerySet):
+    """Query helpers shared by the department views."""
+
+    def with_related(self):
+        """Join the head of department so listings render without extra queries."""
+        return self.select_related("hod")
+
+    def active(self):
+        """Exclude departments waiting to be deleted by ``tasks.archive``."""
+        return self.filter(deleted_at__isnull=True)
+
+    def visible_to(self, scope):
+        """Return the departments ``scope`` manages; see ``tasks.permissions``."""
+        departments = self.active()
+        if scope.is_admin:
+            return departments
+        return departments.filter(pk__in=scope.departments)
+
+
+class EmployeeQuerySet(models.QuerySet):
+    """Query helpers shared by the employee views and forms."""
+
+    def with_related(self):
+        """Join the user and department rendered alongside every employee."""
+        return self.select_related("user", "department")
+
+    def visible_to(self, scope):
+        """Return the employees ``scope`` sees: the user and those they manage."""
+        return scope.restrict(self, "pk")
+
+
+class TaskQuerySet(models.QuerySet):
+    """Query helpers shared by the task views."""
+
+    def with_related(self):
+        """Join the assignee and their user for task listings."""
+        return self.select_related("assigned_to__user")
+
+    def for_employee(self, employee):
+        """Return the tasks assigned to ``employee``, open ones first."""
+        return self.filter(assigned_to=employee).order_by("completed", "due_date")
+
+    def visible_to(self, scope):
+        """Return the tasks ``scope`` sees: the user's and their employees'."""
+        return scope.restrict(self, "assigned_to")
+
+
+class TimeLogQuerySet(models.QuerySet):
+    """Query helpers shared by the time logging views."""
+
+    def overlapping(self, employee, start, end):
+        """
+        Return ``employee``'s logs that overlap the interval ``start``-``end``.
+
+        Logs last at most ``MAX_LOG_DURATION``, so only logs starting within
+        that much of ``start`` are scanned on the interval index.
+        """
+        return self.filter(
+            employee=employee,
+            start_time__gt=start - MAX_LOG_DURATION,
+            start_time__lt=end,
+            end_time__gt=start,
+        )
+
+    def visible_to(self, scope):
+        """Return the logs ``scope`` sees: the user's and their employees'."""
+        return scope.restrict(self, "employee")
+
+
+class GoalQuerySet(models.QuerySet):
+    """Query helpers shared by the goal views."""
+
+    def with_related(self):
+        """Join the owning employee and their user for goal listings."""
+        return self.select_related("employee__user")
+
+    def for_employee(self, employee):
+        """Return the goals set by ``employee``, nearest target first."""
+        return self.filter(employee=employee).order_by("target_date")
+
+    def visible_to(self, scope):
+        """Return the goals ``scope`` sees: the user's and their employees'."""
+        return scope.restrict(self, "employee")
+
+
+class JournalEntryQuerySet(models.QuerySet):
+    """Query helpers shared by the journal views."""
+
+    def for_employee(self, employee):
+        """Return the entries written by ``employee``, newest first."""
+        return self.filter(employee=employee).order_by("-entry_date", "-pk")
+
+    def visible_to(self, scope):
+        """Return the entries ``scope`` sees: the user's and their employees'."""
+        return scope.restrict(self, "employee")
+
 
 # Department Model
 class Department(models.Model):
@@ -14,12 +141,17 @@ class Department(models.Model):
         hod (User): Head of Department, linked to the User model.
         created_at (date): Date the department was created.
         updated_at (date): Date the department was last updated.
+        deleted_at (datetime): When the department was deleted; its rows are
+            then removed in the background by ``tasks.archive``.
     """
 
     name = models.CharField(max_length=100)
     hod = models.ForeignKey(User, on_delete=models.CASCADE, related_name="manager")
     created_at = models.DateField(auto_now_add=True)
     updated_at = models.DateField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = DepartmentQuerySet.as_manager()
 
     def __str__(self):
         """Returns the department name as a string."""
@@ -51,13 +183,15 @@ class Employee(models.Model):
     created_at = models.DateField(auto_now_add=True)
     updated_at = models.DateField(auto_now=True)
 
+    objects = EmployeeQuerySet.as_manager()
+
     def __str__(self):
         """Returns the full name of the user."""
         return self.user.get_full_name()
 
 
 # Task Model
-class Task(models.Model):
+class Task(RecordsChanges, models.Model):
     """
     Represents a task assigned to an employee.
 
@@ -68,6 +202,8 @@ class Task(models.Model):
         due_date (date): Task deadline.
         completed (bool): Task completion status.
         priority (str): Priority of the task.
+        recurrence (Recurrence): Rule the task is an occurrence of, if any;
+            ``due_date`` is then the date of the occurrence.
         created_at (datetime): When the task was created.
         updated_at (date): When the task was last updated.
     """
@@ -83,16 +219,48 @@ class Task(models.Model):
     priority = models.CharField(
         max_length=6, choices=priority_choices, default="Medium"
     )
+    recurrence = models.ForeignKey(
+        "Recurrence",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="occurrences",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Serves the employee dashboard: open tasks first, by deadline.
+            models.Index(
+                fields=["assigned_to", "completed", "due_date"],
+                name="task_assignee_open_due_idx",
+            ),
+            # Serves the overdue sweep: open tasks across everyone, by deadline.
+            models.Index(
+                fields=["due_date", "id"],
+                condition=models.Q(completed=False),
+                name="task_open_due_idx",
+            ),
+        ]
+        constraints = [
+            # An occurrence is stored at most once.
+            models.UniqueConstraint(
+                fields=["recurrence", "due_date"],
+                condition=models.Q(recurrence__isnull=False),
+                name="task_recurrence_occurrence_uniq",
+            ),
+        ]
+
     def __str__(self):
         """Returns the title of the task."""
         return self.title
 
 
 # Time Log Model
-class TimeLog(models.Model):
+class TimeLog(RecordsChanges, models.Model):
     """
     Represents a time log for a task performed by an employee.
 
@@ -101,7 +269,7 @@ class TimeLog(models.Model):
         employee (Employee): Employee who logged the time.
         start_time (datetime): Start time of the task.
         end_time (datetime): End time of the task.
-        duration (timedelta): Duration of time spent.
+        duration (timedelta): Duration of time spent, computed on save.
     """
 
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="time_logs")
@@ -110,15 +278,42 @@ class TimeLog(models.Model):
     )
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
-    duration = models.DurationField()  # Duration in seconds
+    duration = models.DurationField(editable=False)
+
+    objects = TimeLogQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["employee", "start_time", "end_time"],
+                name="timelog_employee_interval_idx",
+            ),
+        ]
 
     def __str__(self):
         """Returns a label indicating which task this time log belongs to."""
         return f"Time Log for {self.task.title}"
 
+    def clean(self):
+        """Check that the log ends after it starts and is not too long."""
+        super().clean()
+        if self.start_time and self.end_time:
+            if self.end_time <= self.start_time:
+                raise ValidationError({"end_time": "The log must end after it starts."})
+            if self.end_time - self.start_time > MAX_LOG_DURATION:
+                raise ValidationError(
+                    {"end_time": f"A log may cover at most {MAX_LOG_DURATION}."}
+                )
+
+    def save(self, *args, **kwargs):
+        """Compute the duration from the start and end times."""
+        if self.start_time and self.end_time:
+            self.duration = self.end_time - self.start_time
+        super().save(*args, **kwargs)
+
 
 # Goal Model
-class Goal(models.Model):
+class Goal(RecordsChanges, models.Model):
     """
     Represents a goal set by an employee.
 
@@ -138,13 +333,22 @@ class Goal(models.Model):
     target_date = models.DateField()
     achieved = models.BooleanField(default=False)
 
+    objects = GoalQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["employee", "target_date"], name="goal_employee_target_idx"
+            ),
+        ]
+
     def __str__(self):
         """Returns the title of the goal."""
         return self.title
 
 
 # Journal Entry Model
-class JournalEntry(models.Model):
+class JournalEntry(RecordsChanges, models.Model):
     """
     Represents a daily journal entry by an employee.
 
@@ -160,6 +364,479 @@ class JournalEntry(models.Model):
     entry_date = models.DateField()
     content = models.TextField()
 
+    objects = JournalEntryQuerySet.as_manager()
+
     def __str__(self):
         """Returns a string identifying the journal entry by its date."""
         return f"Journal Entry for {self.entry_date}"
+
+
+# Daily Time Rollup Model
+class DailyTimeRollup(models.Model):
+    """
+    Time logged per day, employee and task, with the employee's department.
+
+    Maintained from ``TimeLog`` saves by ``tasks.rollups`` so reports over long
+    periods read one row per day instead of every log.
+
+    Attributes:
+        date (date): Local date the logs started on.
+        employee (Employee): Employee who logged the time.
+        task (Task): Task the time was logged against; the task may have been
+            moved to ``ArchivedTask``.
+        department (Department): Department of the employee when the day's
+            first log on the task was rolled up.
+        seconds (int): Total logged duration in seconds.
+        log_count (int): Number of time logs summarised.
+    """
+
+    date = models.DateField()
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name="time_rollups"
+    )
+    # Archived tasks keep their rollups, so the task is not a constraint.
+    # Deleting a task's logs removes its rollups.
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="time_rollups",
+    )
+    department = models.ForeignKey(
+        Department, on_delete=models.CASCADE, related_name="time_rollups"
+    )
+    seconds = models.BigIntegerField(default=0)
+    log_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "employee", "task"], name="rollup_day_key_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["department", "date"], name="rollup_department_day_idx"
+            ),
+        ]
+
+    def __str__(self):
+        """Returns the day and total hours of the rollup."""
+        return f"{self.date}: {self.seconds / 3600:.2f}h"
+
+
+# Counter Model
+class Counter(models.Model):
+    """
+    An incrementally maintained aggregate shown on the dashboards.
+
+    Rows are kept up to date by the signal handlers in ``tasks.signals`` and
+    can be recomputed with ``manage.py rebuild_counters``.
+
+    Attributes:
+        scope_id (int): Primary key of the department the value covers, or
+            ``None`` for organisation-wide totals. It is deliberately not a
+            foreign key so counters survive the cascades that update them.
+        name (str): Name of the aggregate, e.g. ``open_tasks``.
+        value (int): Current value of the aggregate.
+    """
+
+    scope_id = models.PositiveBigIntegerField(null=True, blank=True)
+    name = models.CharField(max_length=50)
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope_id", "name"], name="counter_scope_name_uniq"
+            ),
+            models.UniqueConstraint(
+                fields=["name"],
+                condition=models.Q(scope_id__isnull=True),
+                name="counter_org_name_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        """Returns the counter name and value."""
+        return f"{self.name} = {self.value}"
+
+
+# Job Model
+class Job(models.Model):
+    """
+    A unit of background work run by ``manage.py run_workers``.
+
+    Workers claim due rows with ``SELECT ... FOR UPDATE SKIP LOCKED`` where
+    the database supports it, see ``tasks.jobs``.
+
+    Attributes:
+        kind (str): Name of the handler that runs the job.
+        payload (dict): Keyword arguments passed to the handler.
+        key (str): Optional unique key that makes enqueueing idempotent.
+        status (str): ``pending``, ``running``, ``done`` or ``failed``.
+        run_at (datetime): Earliest time the job may run.
+        attempts (int): Number of times the job was started.
+        max_attempts (int): Attempts after which the job is marked failed.
+        locked_by (str): Worker currently running the job.
+        locked_at (datetime): When the running worker claimed the job.
+        last_error (str): Traceback of the last failed attempt.
+        created_at (datetime): When the job was enqueued.
+        finished_at (datetime): When the job succeeded or finally failed.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    status_choices = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, blank=True)
+    key = models.CharField(max_length=100, null=True, blank=True, unique=True)
+    status = models.CharField(max_length=7, choices=status_choices, default=PENDING)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Serves the claim query: the oldest due job of a status.
+            models.Index(fields=["status", "run_at"], name="job_status_run_at_idx"),
+        ]
+
+    def __str__(self):
+        """Returns the job kind and status."""
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+# Workload Model
+class Workload(models.Model):
+    """
+    The current load of one employee, shown when assigning tasks.
+
+    Maintained by ``tasks.workload`` from ``Task`` and ``TimeLog`` saves and
+    refreshed daily so the seven-day window keeps moving.
+
+    Attributes:
+        employee (Employee): Employee the row describes.
+        open_tasks (int): Number of open tasks assigned to the employee.
+        weighted_load (int): Open tasks weighted by priority.
+        seconds_last_7_days (int): Time logged during the last seven days.
+        next_due_date (date): Earliest due date of an open task.
+        updated_at (datetime): When the row was last refreshed.
+    """
+
+    employee = models.OneToOneField(
+        Employee, on_delete=models.CASCADE, primary_key=True, related_name="workload"
+    )
+    open_tasks = models.PositiveIntegerField(default=0)
+    weighted_load = models.PositiveIntegerField(default=0)
+    seconds_last_7_days = models.BigIntegerField(default=0)
+    next_due_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Serves the assignment autocomplete: least loaded first.
+            models.Index(
+                fields=["weighted_load", "open_tasks"], name="workload_load_idx"
+            ),
+        ]
+
+    def __str__(self):
+        """Returns the open task count and weighted load."""
+        return f"{self.open_tasks} open ({self.weighted_load} weighted)"
+
+
+# Heartbeat Model
+class Heartbeat(models.Model):
+    """
+    A timestamp written on the primary database and read on replicas.
+
+    Replicas receive the row through replication, so the age of their copy
+    is their lag; see ``tasks.routing``.
+
+    Attributes:
+        name (str): Identifies the writer, ``"primary"``.
+        beat_at (datetime): When the primary last wrote the row.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    beat_at = models.DateTimeField()
+
+    def __str__(self):
+        """Returns the name and time of the heartbeat."""
+        return f"{self.name} at {self.beat_at}"
+
+
+# Recurrence Model
+class Recurrence(models.Model):
+    """
+    A rule for recurring work, such as a daily standup or a weekly report.
+
+    Occurrences are expanded on demand by ``tasks.recurrence`` and only
+    stored as ``Task`` rows once time is logged against them or they are
+    completed.
+
+    Attributes:
+        title (str): Title of every occurrence.
+        description (str): Details of every occurrence.
+        assigned_to (Employee): Employee the occurrences are assigned to.
+        priority (str): Priority of every occurrence.
+        frequency (str): Whether it repeats daily, weekly or monthly.
+        interval (int): Number of days, weeks or months between repeats.
+        weekdays (str): Comma separated ISO weekdays (1 is Monday) daily and
+            weekly rules occur on; blank means every day for daily rules and
+            the weekday of ``starts_on`` for weekly ones.
+        starts_on (date): Date of the first occurrence; monthly rules repeat
+            on its day of the month.
+        ends_on (date): Last date an occurrence may fall on, if any.
+        active (bool): Whether new occurrences are still expanded.
+        created_at (datetime): When the rule was created.
+        updated_at (datetime): When the rule was last changed.
+    """
+
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    frequency_choices = [(DAILY, "Daily"), (WEEKLY, "Weekly"), (MONTHLY, "Monthly")]
+
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    assigned_to = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name="recurrences"
+    )
+    priority = models.CharField(
+        max_length=6, choices=priority_choices, default="Medium"
+    )
+    frequency = models.CharField(max_length=7, choices=frequency_choices)
+    interval = models.PositiveSmallIntegerField(default=1)
+    weekdays = models.CharField(
+        max_length=13,
+        blank=True,
+        validators=[validate_comma_separated_integer_list],
+    )
+    starts_on = models.DateField()
+    ends_on = models.DateField(null=True, blank=True)
+    active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["assigned_to", "active"], name="recurrence_assignee_idx"
+            ),
+        ]
+
+    def __str__(self):
+        """Returns the title and frequency of the rule."""
+        return f"{self.title} ({self.get_frequency_display().lower()})"
+
+    def clean(self):
+        """Check that weekdays are ISO weekdays and the dates are in order."""
+        super().clean()
+        if self.weekdays and not set(self.weekday_numbers()) <= set(range(1, 8)):
+            raise ValidationError({"weekdays": "Use ISO weekdays, 1 to 7."})
+        if self.ends_on and self.starts_on and self.ends_on < self.starts_on:
+            raise ValidationError({"ends_on": "The rule ends before it starts."})
+        if self.interval == 0:
+            raise ValidationError({"interval": "The interval must be at least 1."})
+
+    def weekday_numbers(self):
+        """Return the ISO weekdays of ``weekdays`` as sorted integers."""
+        return sorted({int(day) for day in self.weekdays.split(",") if day.strip()})
+
+
+# Active Timer Model
+class ActiveTimer(models.Model):
+    """
+    A running timer, stopped into a ``TimeLog`` by ``tasks.timers``.
+
+    Attributes:
+        employee (Employee): Employee timing their work; one timer each.
+        task (Task): Task the time is logged against.
+        started_at (datetime): When the timer was started.
+    """
+
+    employee = models.OneToOneField(
+        Employee, on_delete=models.CASCADE, related_name="timer"
+    )
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="timers")
+    started_at = models.DateTimeField()
+
+    def __str__(self):
+        """Returns the task and start time of the timer."""
+        return f"Timer on {self.task.title} since {self.started_at}"
+
+
+# Change Event Model
+class ChangeEvent(models.Model):
+    """
+    One create, update or delete of a task, time log, goal or journal entry.
+
+    Events are appended by ``tasks.outbox`` in the transaction of the change,
+    and their primary key is the sequence consumers resume from.
+
+    Attributes:
+        model (str): Model label, e.g. ``"task"``.
+        object_id (int): Primary key of the changed row.
+        action (str): Whether the row was created, updated or deleted.
+        payload (dict): Field values after the change; empty for deletes.
+        created_at (datetime): When the change happened.
+    """
+
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    action_choices = [(CREATE, "Create"), (UPDATE, "Update"), (DELETE, "Delete")]
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=action_choices)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["model", "object_id", "id"], name="changeevent_object_idx"
+            ),
+        ]
+
+    def __str__(self):
+        """Returns the sequence number and the change."""
+        return f"#{self.pk} {self.action} {self.model} {self.object_id}"
+
+
+# Change Lock Model
+class ChangeLock(models.Model):
+    """
+    A row locked by every transaction that appends ``tasks.outbox`` events.
+
+    Writers update it before writing the rows their events describe and
+    hold its row lock until they commit, so events are numbered in commit
+    order and writers never wait on each other's rows while holding it.
+
+    Attributes:
+        name (str): Name of the lock, ``"changes"``.
+        locked_at (datetime): When a transaction last took the lock.
+    """
+
+    FEED = "changes"
+
+    name = models.CharField(max_length=50, unique=True)
+    locked_at = models.DateTimeField(default=timezone.now)
+
+    @classmethod
+    def acquire(cls, using=None):
+        """Lock the change feed until the current transaction on ``using`` ends."""
+        rows = cls.objects.using(using).filter(name=cls.FEED)
+        if not rows.update(locked_at=timezone.now()):
+            cls.objects.using(using).get_or_create(name=cls.FEED)
+            rows.update(locked_at=timezone.now())
+
+    def __str__(self):
+        """Returns the name of the lock."""
+        return self.name
+
+
+# Archived Task Model
+class ArchivedTask(models.Model):
+    """
+    A completed task moved out of ``Task`` by ``tasks.archive``.
+
+    Keeps the task's id and fields, so history views read both tables alike.
+
+    Attributes:
+        title (str): Title of the task.
+        description (str): Details of the task.
+        assigned_to (Employee): Employee the task was assigned to.
+        due_date (date): Task deadline.
+        priority (str): Priority of the task.
+        recurrence (Recurrence): Rule the task was an occurrence of, if any.
+        created_at (datetime): When the task was created.
+        updated_at (date): When the task was last updated.
+        archived_at (datetime): When the task was archived.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    assigned_to = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name="archived_tasks"
+    )
+    due_date = models.DateField()
+    priority = models.CharField(max_length=6, choices=priority_choices)
+    recurrence = models.ForeignKey(
+        Recurrence,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_occurrences",
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["assigned_to", "due_date", "id"],
+                name="archivedtask_assignee_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        """Returns the title of the task."""
+        return self.title
+
+
+# Archived Time Log Model
+class ArchivedTimeLog(models.Model):
+    """
+    A time log moved out of ``TimeLog`` by ``tasks.archive``.
+
+    Attributes:
+        task_id (int): Task the time was logged against, in ``Task`` or
+            ``ArchivedTask``.
+        employee (Employee): Employee who logged the time.
+        start_time (datetime): Start time of the work.
+        end_time (datetime): End time of the work.
+        duration (timedelta): Duration of time spent.
+        archived_at (datetime): When the log was archived.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    task_id = models.BigIntegerField()
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name="archived_time_logs"
+    )
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    duration = models.DurationField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["employee", "start_time", "id"],
+                name="archivedlog_employee_start_idx",
+            ),
+        ]
+
+    def __str__(self):
+        """Returns the start and end of the archived log."""
+        return f"Archived time log from {self.start_time} to {self.end_time}"
@@ -0,0 +1,258 @@
+"""
+Bulk onboarding of users and their employee profiles.
+
+Rows are read from CSV one chunk at a time and validated with
+``UserCreationForm`` and ``EmployeeForm`` minus their per-row queries:
+usernames are checked for uniqueness and departments are resolved with one
+query per chunk. Valid rows are inserted with ``bulk_create``. Each row may
+contain:
+
+    username, first_name, last_name, email, password, is_staff,
+    department (name), date_joined (YYYY-MM-DD), position
+
+Passwords given in the file are hashed in a process pool, because each
+PBKDF2 hash costs tens of milliseconds. Rows without a password, or every
+row with ``hash_passwords=False``, get an unusable password instead; those
+users choose their own through the reset link :func:`send_invites` emails.
+
+Each chunk is committed on its own and invalid rows are skipped and
+reported, so :func:`import_people` can report progress as it goes.
+"""
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+
+import django
+from django import forms
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.core.exceptions import ValidationError
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from . import caching, counters, permissions, workload
+from .forms import EmployeeForm, UserCreationForm
+from .models import Department, Employee
+
+# Rows validated and inserted per transaction.
+CHUNK_SIZE = 500
+
+
+class PrefetchedChoiceField(forms.ModelChoiceField):
+    """Model choice field that resolves values from prefetched instances."""
+
+    def __init__(self, objects, **kwargs):
+        super().__init__(queryset=Department.objects.none(), **kwargs)
+        self.objects = objects
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            return self.objects[str(value).strip()]
+        except KeyError as exc:
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            ) from exc
+
+
+class BulkUserForm(UserCreationForm):
+    """``UserCreationForm`` whose username uniqueness is checked per chunk."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["password"].required = False
+
+    def validate_unique(self):
+        """Skip the per-row query; usernames are checked a chunk at a time."""
+
+
+class BulkEmployeeForm(EmployeeForm):
+    """``EmployeeForm`` for a user being created, with departments by name."""
+
+    class Meta(EmployeeForm.Meta):
+        # The department is a plain form field here, so model validation
+        # does not query for it again.
+        fields = ["date_joined", "position"]
+
+    def __init__(self, *args, departments=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["department"] = PrefetchedChoiceField(departments or {})
+
+    def validate_unique(self):
+        """The user is new, so its profile cannot clash with another."""
+
+
+@dataclass
+class Progress:
+    """
+    Outcome of one chunk, with running totals.
+
+    Attributes:
+        processed (int): Rows read so far.
+        created (int): Users created so far.
+        errors (list): ``{"row": n, "errors": {field: [messages]}}`` entries of
+            this chunk, with rows numbered from 1.
+        user_ids (list): Primary keys of the users created in this chunk.
+    """
+
+    processed: int = 0
+    created: int = 0
+    errors: list = field(default_factory=list)
+    user_ids: list = field(default_factory=list)
+
+
+def _setup_worker():
+    """Configure Django in pool processes started with ``spawn``."""
+    django.setup()
+
+
+def _prefetch_departments(rows, departments):
+    """Add the departments named by ``rows`` to the ``{name: department}`` cache."""
+    names = {str(row.get("department") or "").strip() for row in rows} - {""}
+    unseen = names - set(departments)
+    departments.update(
+        (department.name, department)
+        for department in Department.objects.filter(name__in=unseen)
+    )
+
+
+def _validate(rows, start, departments):
+    """Validate a chunk; return ``[(user, employee data, password)]`` and errors."""
+    usernames = [str(row.get("username", "")).strip() for row in rows]
+    taken = set(
+        User.objects.filter(username__in=usernames).values_list("username", flat=True)
+    )
+    _prefetch_departments(rows, departments)
+
+    valid, errors = [], []
+    for number, (row, username) in enumerate(zip(rows, usernames), start=start):
+        user_form = BulkUserForm(row)
+        employee_form = BulkEmployeeForm(row, departments=departments)
+        problems = {}
+        for form in (user_form, employee_form):
+            if not form.is_valid():
+                problems.update(
+                    (name, [error["message"] for error in messages])
+                    for name, messages in form.errors.get_json_data().items()
+                )
+        if username in taken:
+            problems["username"] = [f"A user named '{username}' already exists."]
+        if problems:
+            errors.append({"row": number, "errors": problems})
+            continue
+        taken.add(username)
+        valid.append(
+            (
+                user_form.save(commit=False),
+                employee_form.cleaned_data,
+                user_form.cleaned_data["password"],
+            )
+        )
+    return valid, errors
+
+
+def _create(valid, passwords):
+    """Insert one chunk of users and employees; return the new user ids."""
+    users = []
+    for (user, _, _), password in zip(valid, passwords):
+        user.password = password
+        users.append(user)
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        employees = Employee.objects.bulk_create(
+            Employee(user=user, **data) for user, (_, data, _) in zip(users, valid)
+        )
+        # bulk_create bypasses the signals that maintain counters and workloads.
+        deltas = counters.Tally()
+        for instance in users + employees:
+            deltas.update(counters.contribution(instance))
+        counters.apply(deltas)
+        workload.refresh(employee.pk for employee in employees)
+    caching.bump("users", "employees")
+    permissions.invalidate_departments(
+        *{employee.department_id for employee in employees}
+    )
+    return [user.pk for user in users]
+
+
+def import_people(rows, chunk_size=CHUNK_SIZE, hash_passwords=True, workers=None):
+    """
+    Create users and employees from ``rows``, yielding :class:`Progress`.
+
+    ``rows`` may be any iterable of dicts, e.g. a ``csv.DictReader``; it is
+    consumed one chunk at a time. ``workers`` is the size of the hashing
+    process pool; ``0`` hashes in this process.
+    """
+    progress = Progress()
+    departments = {}
+    rows = iter(rows)
+    with ExitStack() as stack:
+        pool = None
+        if hash_passwords and workers != 0:
+            pool = stack.enter_context(
+                ProcessPoolExecutor(workers, initializer=_setup_worker)
+            )
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                return
+            valid, errors = _validate(chunk, progress.processed + 1, departments)
+            raw = [password if hash_passwords else "" for _, _, password in valid]
+            if pool is not None and any(raw):
+                passwords = list(pool.map(make_password, [p or None for p in raw]))
+            else:
+                passwords = [make_password(p or None) for p in raw]
+            user_ids = _create(valid, passwords) if valid else []
+            progress = Progress(
+                processed=progress.processed + len(chunk),
+                created=progress.created + len(user_ids),
+                errors=errors,
+                user_ids=user_ids,
+            )
+            yield progress
+
+
+def reset_url(user):
+    """Return the absolute URL where ``user`` can set their password."""
+    path = reverse(
+        "password_reset_confirm",
+        kwargs={
+            "uidb64": urlsafe_base64_encode(force_bytes(user.pk)),
+            "token": default_token_generator.make_token(user),
+        },
+    )
+    return getattr(settings, "SITE_URL", "http://localhost:8000").rstrip("/") + path
+
+
+def send_invites(user_ids):
+    """
+    Email new users a link to set their password.
+
+    Run by the job queue; users without an email address or who already
+    have a usable password are skipped. Returns the number of emails sent.
+    """
+    messages = [
+        EmailMessage(
+            "Welcome - set your password",
+            render_to_string(
+                "tasks/email/invite.txt", {"user": user, "url": reset_url(user)}
+            ),
+            to=[user.email],
+        )
+        for user in User.objects.filter(pk__in=user_ids).exclude(email="")
+        if not user.has_usable_password()
+    ]
+    if messages:
+        get_connection().send_messages(messages)
+    return len(messages)
@@ -0,0 +1,184 @@
+"""
+Change-data feed.
+
+Every create, update and delete of a ``Task``, ``TimeLog``, ``Goal`` or
+``JournalEntry`` appends a :class:`~tasks.models.ChangeEvent` in the same
+transaction (a transactional outbox): the signal handlers in
+``tasks.signals`` call :func:`record`, and bulk writes call
+:func:`record_many`. Events carry the row's field values, so consumers such
+as payroll or BI exports apply them without querying the tables.
+
+The event's primary key is its sequence number. Consumers remember the
+last one they processed and pull the events after it from
+``/changes?since=<seq>`` (:func:`changes`), so an event must never become
+visible after a later-numbered one. Sequences alone do not guarantee it:
+on databases with concurrent writers, a transaction can take number 10,
+another take 11 and commit first, and a consumer reading 11 would skip 10
+for good. Writers therefore update the :class:`~tasks.models.ChangeLock`
+row (:func:`lock`) before writing the rows their events describe; its row
+lock is held until commit, so the next writer only numbers its events once
+the previous one committed. Taking it before any row keeps the lock order
+the same in every transaction, however many rows it writes. SQLite commits
+writers one at a time anyway.
+
+:func:`compact` deletes events superseded by a later event of the same
+row, as ``manage.py compact_changes`` does for events older than a
+retention period. Consumers that resume from any sequence still see the
+latest state of every row changed since, only not each intermediate
+version.
+"""
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import ChangeEvent, ChangeLock
+
+# Events read per query while streaming.
+CHUNK_SIZE = 500
+
+# Events examined per delete while compacting.
+BATCH_SIZE = 1000
+
+
+# pylint: disable=protected-access
+
+
+def payload(instance):
+    """Return the field values of ``instance`` without its primary key."""
+    return {
+        field.attname: field.value_from_object(instance)
+        for field in instance._meta.concrete_fields
+        if not field.primary_key
+    }
+
+
+def _event(instance, action):
+    """Return the unsaved event describing ``action`` on ``instance``."""
+    return ChangeEvent(
+        model=instance._meta.model_name,
+        object_id=instance.pk,
+        action=action,
+        payload={} if action == ChangeEvent.DELETE else payload(instance),
+    )
+
+
+def lock(using=None):
+    """
+    Lock the change feed until the current transaction ends.
+
+    Call it before writing the rows whose events follow; see
+    :class:`~tasks.models.ChangeLock`.
+    """
+    ChangeLock.acquire(using)
+
+
+def record(instance, action):
+    """
+    Append the event of ``action`` (create, update or delete) on ``instance``.
+
+    The caller holds the feed lock, as ``RecordsChanges.save`` and the
+    ``pre_delete`` handler in ``tasks.signals`` do.
+    """
+    event = _event(instance, action)
+    event.save()
+    return event
+
+
+def record_many(instances, action):
+    """Append one event per instance, e.g. after ``bulk_create``, under :func:`lock`."""
+    ChangeEvent.objects.bulk_create(
+        [_event(instance, action) for instance in instances], batch_size=BATCH_SIZE
+    )
+
+
+def latest():
+    """Return the sequence number of the newest event, or 0."""
+    return ChangeEvent.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+
+def changes(since=0, limit=None):
+    """
+    Yield the events after sequence ``since`` in order, as dicts.
+
+    Reads :data:`CHUNK_SIZE` events per query, resuming after the last one
+    read, and stops after ``limit`` events if given.
+    """
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+        rows = list(
+            ChangeEvent.objects.filter(pk__gt=since)
+            .order_by("pk")
+            .values("pk", "model", "object_id", "action", "payload", "created_at")[
+                :size
+            ]
+        )
+        for row in rows:
+            yield {
+                "seq": row["pk"],
+                "model": row["model"],
+                "id": row["object_id"],
+                "action": row["action"],
+                "at": row["created_at"],
+                "data": row["payload"],
+            }
+        if len(rows) < size:
+            return
+        since = rows[-1]["pk"]
+        if remaining is not None:
+            remaining -= len(rows)
+
+
+def to_line(event):
+    """Serialise an event from :func:`changes` as one JSON line."""
+    return json.dumps(event, cls=DjangoJSONEncoder, separators=(",", ":")) + "\n"
+
+
+def horizon(age):
+    """Return the sequence of the newest event older than ``age``, or 0."""
+    return (
+        ChangeEvent.objects.filter(created_at__lt=timezone.now() - age)
+        .order_by("-pk")
+        .values_list("pk", flat=True)
+        .first()
+        or 0
+    )
+
+
+def compact(until, batch_size=BATCH_SIZE):
+    """
+    Delete events up to sequence ``until`` that a later event supersedes.
+
+    The latest event of every row is kept. Works through the sequence in
+    ranges of ``batch_size``, one short transaction each, and returns the
+    number of events deleted.
+    """
+    superseded = ChangeEvent.objects.filter(
+        Exists(
+            ChangeEvent.objects.filter(
+                model=OuterRef("model"),
+                object_id=OuterRef("object_id"),
+                pk__gt=OuterRef("pk"),
+            )
+        )
+    )
+    cursor = (
+        ChangeEvent.objects.order_by("pk").values_list("pk", flat=True).first() or 1
+    ) - 1
+    deleted = 0
+    while cursor < until:
+        upper = min(cursor + batch_size, until)
+        with transaction.atomic():
+            ids = list(
+                superseded.filter(pk__gt=cursor, pk__lte=upper).values_list(
+                    "pk", flat=True
+                )
+            )
+            if ids:
+                deleted += ChangeEvent.objects.filter(pk__in=ids).delete()[0]
+        cursor = upper
+    return deleted
@@ -0,0 +1,229 @@
+"""
+Keyset (cursor) pagination for the listing views of the Tasks application.
+
+Unlike ``django.core.paginator.Paginator``, which runs ``COUNT(*)`` and an
+``OFFSET`` that grows with the page number, a keyset paginator remembers the
+sort key of the last row it returned and asks for the rows that follow it.
+Every page therefore costs the same single indexed query as the first one.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+from collections.abc import Sequence
+from functools import reduce
+from operator import or_
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import Q
+
+CURSOR_PARAM = "cursor"
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """JSON encoder that keeps full microsecond precision for temporal keys."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.date, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded or does not match the ordering."""
+
+
+def encode_cursor(values, backwards=False):
+    """Encode the sort key of a boundary row as an opaque, URL-safe token."""
+    payload = json.dumps({"k": values, "b": backwards}, cls=CursorEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode a token produced by :func:`encode_cursor`."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return list(payload["k"]), bool(payload["b"])
+    except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def approximate_count(queryset):
+    """
+    Estimate the number of rows in ``queryset``.
+
+    PostgreSQL reports the planner's row estimate, which costs no table scan.
+    Other backends fall back to an exact ``COUNT(*)``.
+    """
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    plan = json.loads(queryset.explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPage(Sequence):
+    """
+    A single page of results returned by :class:`KeysetPaginator`.
+
+    Attributes:
+        object_list (list): Rows on this page, in display order.
+        next_cursor (str): Cursor for the following page, or ``None``.
+        previous_cursor (str): Cursor for the preceding page, or ``None``.
+        count (int): Total number of rows, when requested, otherwise ``None``.
+    """
+
+    def __init__(self, object_list, next_cursor, previous_cursor, count=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        """Return whether a following page exists."""
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        """Return whether a preceding page exists."""
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the sort key of the last row seen.
+
+    The ordering is always made total by appending ``pk``, so rows sharing a
+    sort key are neither skipped nor repeated. Sort key columns must not be
+    nullable.
+
+    Attributes:
+        queryset (QuerySet): Rows to paginate; any existing ordering is replaced.
+        per_page (int): Number of rows per page.
+        ordering (tuple): Sort fields, optionally prefixed with ``-``.
+        with_count (bool): Whether pages report an approximate total.
+    """
+
+    def __init__(self, queryset, per_page, ordering=(), with_count=False):
+        ordering = tuple(ordering or queryset.query.order_by)
+        keys = {"pk", queryset.model._meta.pk.name}  # pylint: disable=protected-access
+        if not keys & {field.lstrip("-") for field in ordering}:
+            descending = bool(ordering) and ordering[-1].startswith("-")
+            ordering += ("-pk" if descending else "pk",)
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = ordering
+        self.with_count = with_count
+
+    def get_page(self, cursor=None):
+        """
+        Return the page starting after ``cursor``.
+
+        A missing or malformed cursor yields the first page, mirroring
+        ``Paginator.get_page``.
+        """
+        queryset, values, backwards = self._window(cursor)
+        rows = list(queryset)
+        count = approximate_count(self.queryset) if self.with_count else None
+        return self._page(rows, values, backwards, count)
+
+    async def aget_page(self, cursor=None):
+        """Asynchronous version of :meth:`get_page` for async views."""
+        queryset, values, backwards = self._window(cursor)
+        rows = [row async for row in queryset]
+        count = None
+        if self.with_count:
+            count = await sync_to_async(approximate_count)(self.queryset)
+        return self._page(rows, values, backwards, count)
+
+    def _window(self, cursor):
+        """Return the unevaluated query for the page after ``cursor``."""
+        values, backwards = None, False
+        if cursor:
+            try:
+                values, backwards = decode_cursor(cursor)
+            except InvalidCursor:
+                values = None
+            if values is not None and len(values) != len(self.ordering):
+                values, backwards = None, False
+
+        ordering = self._reverse(self.ordering) if backwards else self.ordering
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(ordering, values))
+        return queryset[: self.per_page + 1], values, backwards
+
+    def _page(self, rows, values, backwards, count):
+        """Trim the fetched ``rows`` to a page and compute its cursors."""
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+
+        first_page = values is None or (backwards and not has_more)
+        last_page = not backwards and not has_more
+        next_cursor = None if last_page or not rows else self._cursor(rows[-1])
+        previous_cursor = (
+            None if first_page or not rows else self._cursor(rows[0], True)
+        )
+        return KeysetPage(rows, next_cursor, previous_cursor, count)
+
+    def _cursor(self, row, backwards=False):
+        """Build the cursor pointing just past ``row``."""
+        values = [self._value(row, field.lstrip("-")) for field in self.ordering]
+        return encode_cursor(values, backwards)
+
+    @staticmethod
+    def _value(row, path):
+        """Read a possibly related ``a__b`` attribute path from ``row``."""
+        if isinstance(row, dict):
+            # Rows of ``values()`` querysets are keyed by the lookup.
+            return row[path]
+        value = row
+        for name in path.split("__"):
+            value = getattr(value, name)
+        return value
+
+    @staticmethod
+    def _reverse(ordering):
+        """Flip the direction of every field in ``ordering``."""
+        return tuple(f[1:] if f.startswith("-") else f"-{f}" for f in ordering)
+
+    @staticmethod
+    def _seek(ordering, values):
+        """
+        Build the row-value comparison ``(a, b, ...) > (x, y, ...)``.
+
+        It is expanded into ``a > x OR (a = x AND b > y) OR ...`` with each
+        field's direction respected.
+        """
+        clauses = []
+        for position, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {
+                prior.lstrip("-"): value
+                for prior, value in zip(ordering[:position], values)
+            }
+            clauses.append(Q(**equal, **{f"{name}__{lookup}": values[position]}))
+        return reduce(or_, clauses)
+
+
+def paginate(request, queryset, per_page, ordering=(), with_count=False):
+    """Return the keyset page selected by the request's ``cursor`` parameter."""
+    paginator = KeysetPaginator(queryset, per_page, ordering, with_count)
+    return paginator.get_page(request.GET.get(CURSOR_PARAM))
+
+
+async def apaginate(request, queryset, per_page, ordering=(), with_count=False):
+    """Asynchronous version of :func:`paginate`."""
+    paginator = KeysetPaginator(queryset, per_page, ordering, with_count)
+    return await paginator.aget_page(request.GET.get(CURSOR_PARAM))
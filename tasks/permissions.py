@@ -0,0 +1,142 @@
+"""
+Authorization scopes.
+
+A user's :class:`Scope` says what they may manage: admins (staff users)
+manage everything, heads of department manage the departments they head and
+the employees in them, and everyone sees their own records. Scopes are
+computed with two queries, cached per user and dropped by the signal
+handlers in ``tasks.signals`` when a department, an employee or the user
+changes.
+
+Querysets filter by scope with ``visible_to(scope)``, e.g.
+``Task.objects.visible_to(scope_of(user))``, which adds a single ``IN``
+clause on the indexed employee column instead of checking rows one by one.
+The models take the scope rather than the user so they never import this
+module.
+"""
+
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import Department, Employee
+
+# Attribute memoizing the scope on the user object of a request.
+USER_ATTRIBUTE = "_tasks_scope"
+
+
+@dataclass(frozen=True)
+class Scope:
+    """
+    What one user may see and manage.
+
+    Attributes:
+        user_id (int): The user, or ``None`` when anonymous.
+        is_admin (bool): Whether the user manages everything.
+        employee (int): The user's own employee profile, if any.
+        departments (frozenset): Departments the user heads.
+        employees (frozenset): Employees of those departments.
+    """
+
+    user_id: int = None
+    is_admin: bool = False
+    employee: int = None
+    departments: frozenset = frozenset()
+    employees: frozenset = frozenset()
+
+    @property
+    def is_manager(self):
+        """Whether the user is an admin or heads a department."""
+        return self.is_admin or bool(self.departments)
+
+    @property
+    def visible_employees(self):
+        """Employees whose records the user sees: theirs and those they manage."""
+        if self.employee is None:
+            return self.employees
+        return self.employees | {self.employee}
+
+    def manages_department(self, department_id):
+        """Whether the user may manage the department ``department_id``."""
+        return self.is_admin or department_id in self.departments
+
+    def manages_employee(self, employee_id):
+        """Whether the user may manage the employee ``employee_id``."""
+        return self.is_admin or employee_id in self.employees
+
+    def sees_employee(self, employee_id):
+        """Whether the user may see the records of the employee ``employee_id``."""
+        return self.is_admin or employee_id in self.visible_employees
+
+    def restrict(self, queryset, field):
+        """Filter ``queryset`` to rows whose employee ``field`` the user sees."""
+        if self.is_admin:
+            return queryset
+        return queryset.filter(**{f"{field}__in": self.visible_employees})
+
+
+def cache_key(user_id):
+    """Return the cache key holding the scope of ``user_id``."""
+    return f"tasks:scope:{user_id}"
+
+
+def invalidate(*user_ids):
+    """Drop the cached scopes of ``user_ids``."""
+    cache.delete_many([cache_key(user_id) for user_id in user_ids if user_id])
+
+
+def invalidate_departments(*department_ids):
+    """Drop the cached scopes of the heads of ``department_ids``."""
+    invalidate(
+        *Department.objects.filter(pk__in=department_ids).values_list(
+            "hod_id", flat=True
+        )
+    )
+
+
+def compute(user):
+    """Build the scope of ``user`` from the database."""
+    if not user.is_authenticated:
+        return Scope()
+    if user.is_staff:
+        return Scope(user_id=user.pk, is_admin=True)
+    departments = frozenset(
+        Department.objects.active().filter(hod=user).values_list("pk", flat=True)
+    )
+    employee, managed = None, set()
+    rows = Employee.objects.filter(Q(user=user) | Q(department__in=departments))
+    for pk, user_id in rows.values_list("pk", "user_id"):
+        if user_id == user.pk:
+            employee = pk
+        else:
+            managed.add(pk)
+    return Scope(user.pk, False, employee, departments, frozenset(managed))
+
+
+def scope_of(user):
+    """
+    Return the :class:`Scope` of ``user``.
+
+    Scopes are cached until a department, an employee or the user changes,
+    and memoized on ``user`` for the rest of the request.
+    """
+    scope = getattr(user, USER_ATTRIBUTE, None)
+    if scope is not None:
+        return scope
+    if user.is_authenticated and not user.is_staff:
+        key = cache_key(user.pk)
+        scope = cache.get(key)
+        if scope is None:
+            scope = compute(user)
+            cache.set(key, scope, getattr(settings, "SCOPE_CACHE_TIMEOUT", 3600))
+    else:
+        scope = compute(user)
+    setattr(user, USER_ATTRIBUTE, scope)
+    return scope
+
+
+def is_manager(user):
+    """Whether ``user`` is an admin or heads a department."""
+    return scope_of(user).is_manager
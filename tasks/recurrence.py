@@ -0,0 +1,248 @@
+"""
+Recurring tasks with lazily expanded occurrences.
+
+A :class:`~tasks.models.Recurrence` rule stands for an unbounded series of
+tasks. Instead of storing every occurrence, the dashboards call
+:func:`pending` to list the occurrences falling in a sliding window of
+``RECURRENCE_WINDOW_DAYS`` days, and :func:`materialize` stores a single
+occurrence as a ``Task`` row only when time is logged against it or it is
+completed. Stored occurrences carry their rule and date, and a unique
+constraint keeps each one from being stored twice.
+
+Expanding a rule starts at the first period that can reach the window
+rather than at ``starts_on``, so a rule started years ago costs as much as
+a new one. The dates of each rule come from one generator that is kept,
+with the dates it produced, in a per-process LRU cache keyed by the rule's
+schedule: later windows continue the same generator, and editing the rule
+changes the key.
+"""
+
+import bisect
+import calendar
+import datetime
+import functools
+import threading
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Recurrence, Task
+
+# Rules whose expansion is kept per process.
+MEMO_SIZE = 4096
+
+
+def window_days():
+    """Return how many days ahead the dashboards list occurrences."""
+    return getattr(settings, "RECURRENCE_WINDOW_DAYS", 14)
+
+
+class Schedule(NamedTuple):
+    """The fields of a rule that decide its dates; the memoization key."""
+
+    pk: int
+    frequency: str
+    interval: int
+    weekdays: tuple
+    starts_on: datetime.date
+    ends_on: datetime.date
+
+    @classmethod
+    def of(cls, rule):
+        """Return the schedule of ``rule``, ignoring invalid weekdays."""
+        return cls(
+            rule.pk,
+            rule.frequency,
+            max(rule.interval, 1),
+            tuple(day for day in rule.weekday_numbers() if 1 <= day <= 7),
+            rule.starts_on,
+            rule.ends_on,
+        )
+
+
+def _add_months(day, months, day_of_month):
+    """Return ``day_of_month`` of the month ``months`` after ``day``, clamped."""
+    index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(index, 12)
+    month += 1
+    return datetime.date(
+        year, month, min(day_of_month, calendar.monthrange(year, month)[1])
+    )
+
+
+def _periods(schedule, since):
+    """Yield the candidate dates of each period that can end on or after ``since``."""
+    start = schedule.starts_on
+    if schedule.frequency == Recurrence.MONTHLY:
+        months = (since.year - start.year) * 12 + since.month - start.month
+        period = max(months // schedule.interval, 0)
+        while True:
+            yield [_add_months(start, period * schedule.interval, start.day)]
+            period += 1
+
+    if schedule.frequency == Recurrence.WEEKLY:
+        step = 7 * schedule.interval
+        first = start - datetime.timedelta(days=start.weekday())
+        days = [day - 1 for day in schedule.weekdays] or [start.weekday()]
+    else:
+        step = schedule.interval
+        first = start
+        days = [0]
+    period = max((since - first).days // step, 0)
+    while True:
+        origin = first + datetime.timedelta(days=period * step)
+        yield [origin + datetime.timedelta(days=day) for day in days]
+        period += 1
+
+
+def _generate(schedule, since):
+    """Yield the dates of ``schedule`` from ``since`` on, in order."""
+    weekdays = set(schedule.weekdays)
+    daily_filter = schedule.frequency == Recurrence.DAILY and weekdays
+    for dates in _periods(schedule, since):
+        for day in dates:
+            if schedule.ends_on and day > schedule.ends_on:
+                return
+            if day < schedule.starts_on or day < since:
+                continue
+            if daily_filter and day.isoweekday() not in weekdays:
+                continue
+            yield day
+
+
+class Expansion:
+    """
+    The dates of one schedule, generated on demand and kept.
+
+    Attributes:
+        schedule (Schedule): Schedule being expanded.
+        origin (date): Earliest date the kept dates cover.
+        dates (list): Dates generated so far from ``origin`` on.
+    """
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.origin = None
+        self.dates = []
+        self._generator = None
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    def between(self, start, end):
+        """Return the dates from ``start`` to ``end``, both included."""
+        with self._lock:
+            if self.origin is None or start < self.origin:
+                self.origin, self.dates = start, []
+                self._generator = _generate(self.schedule, start)
+                self._exhausted = False
+            elif start > self.origin:
+                # The window only slides forward; forget the dates behind it.
+                del self.dates[: bisect.bisect_left(self.dates, start)]
+                self.origin = start
+                if not self.dates:
+                    # The generator stopped behind ``start``; skip the gap.
+                    self._generator = _generate(self.schedule, start)
+                    self._exhausted = False
+            while not self._exhausted and (not self.dates or self.dates[-1] <= end):
+                try:
+                    self.dates.append(next(self._generator))
+                except StopIteration:
+                    self._exhausted = True
+            return self.dates[: bisect.bisect_right(self.dates, end)]
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def expansion(schedule):
+    """Return the shared :class:`Expansion` of ``schedule``."""
+    return Expansion(schedule)
+
+
+def occurrences(rule, start, end):
+    """Return the dates ``rule`` occurs on from ``start`` to ``end``."""
+    if end < start:
+        return []
+    return expansion(Schedule.of(rule)).between(start, end)
+
+
+def occurs_on(rule, day):
+    """Whether ``rule`` has an occurrence on ``day``."""
+    return occurrences(rule, day, day) == [day]
+
+
+@dataclass(frozen=True)
+class Occurrence:
+    """
+    One expanded, not yet stored occurrence of a rule.
+
+    Attributes:
+        rule (Recurrence): Rule it belongs to.
+        due_date (date): Date of the occurrence.
+    """
+
+    rule: Recurrence
+    due_date: datetime.date
+
+    @property
+    def title(self):
+        """Title of the rule."""
+        return self.rule.title
+
+    @property
+    def priority(self):
+        """Priority of the rule."""
+        return self.rule.priority
+
+
+def pending(employee, start=None, days=None):
+    """
+    Return the unstored occurrences of ``employee``'s rules in the window.
+
+    The window runs ``days`` (default ``RECURRENCE_WINDOW_DAYS``) days from
+    ``start`` (default today). Runs one query for the rules and, if there
+    are any, one for the occurrences already stored.
+    """
+    if employee is None:
+        return []
+    start = start or timezone.localdate()
+    end = start + datetime.timedelta(days=(days or window_days()) - 1)
+    rules = list(
+        Recurrence.objects.filter(assigned_to=employee, active=True, starts_on__lte=end)
+    )
+    if not rules:
+        return []
+    stored = set(
+        Task.objects.filter(
+            recurrence__in=rules, due_date__range=(start, end)
+        ).values_list("recurrence", "due_date")
+    )
+    found = [
+        Occurrence(rule, day)
+        for rule in rules
+        for day in occurrences(rule, start, end)
+        if (rule.pk, day) not in stored
+    ]
+    return sorted(found, key=lambda occurrence: (occurrence.due_date, occurrence.title))
+
+
+def materialize(rule, day):
+    """
+    Return the stored ``Task`` of ``rule``'s occurrence on ``day``.
+
+    The task is created on first use. Raises ``ValueError`` when ``rule``
+    does not occur on ``day``.
+    """
+    if not occurs_on(rule, day):
+        raise ValueError(f"{rule} does not occur on {day}.")
+    task, _ = Task.objects.get_or_create(
+        recurrence=rule,
+        due_date=day,
+        defaults={
+            "title": rule.title,
+            "description": rule.description,
+            "assigned_to_id": rule.assigned_to_id,
+            "priority": rule.priority,
+        },
+    )
+    return task
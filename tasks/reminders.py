@@ -0,0 +1,124 @@
+"""
+Deadline jobs run by the background queue in ``tasks.jobs``.
+
+* :func:`overdue_sweep` recounts the ``overdue_tasks`` dashboard counters,
+  which go stale as deadlines pass without any task being saved.
+* :func:`reminder_digest` emails every active employee one digest of their
+  open tasks and goals that are overdue or due within ``REMINDER_DAYS``.
+
+Both walk their rows in chunks through an index instead of loading whole
+tables: the sweep pages through the partial ``task_open_due_idx`` index by
+``(due_date, id)`` and the digest handles a chunk of employees per job,
+reading their tasks and goals through the per-employee indexes, and queues
+the next chunk as a separate job so several workers can share the work.
+"""
+
+import datetime
+from collections import Counter as Tally
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from . import counters, jobs
+from .models import Department, Employee, Goal, Task
+
+# Rows read per query.
+CHUNK_SIZE = 500
+
+
+def reminder_days():
+    """Return how many days ahead the digest looks for deadlines."""
+    return getattr(settings, "REMINDER_DAYS", 1)
+
+
+def overdue_sweep(chunk_size=CHUNK_SIZE):
+    """
+    Recount the overdue tasks of the organisation and every department.
+
+    Returns the organisation-wide count.
+    """
+    today = timezone.localdate()
+    overdue = (
+        Task.objects.filter(completed=False, due_date__lt=today)
+        .order_by("due_date", "id")
+        .values_list("due_date", "id", "assigned_to__department")
+    )
+    tally = Tally()
+    last = None
+    while True:
+        chunk = overdue
+        if last is not None:
+            chunk = chunk.filter(
+                Q(due_date__gt=last[0]) | Q(due_date=last[0], id__gt=last[1])
+            )
+        rows = list(chunk[:chunk_size])
+        for _, _, department_id in rows:
+            tally[department_id] += 1
+        if len(rows) < chunk_size:
+            break
+        last = rows[-1]
+
+    values = {(counters.ORG, counters.OVERDUE_TASKS): sum(tally.values())}
+    for department_id in Department.objects.values_list("pk", flat=True):
+        values[(department_id, counters.OVERDUE_TASKS)] = tally[department_id]
+    counters.store(values)
+    return values[(counters.ORG, counters.OVERDUE_TASKS)]
+
+
+def _digest(employee, day, tasks, goals):
+    """Return the reminder email of one employee."""
+    body = render_to_string(
+        "tasks/email/reminder_digest.txt",
+        {"employee": employee, "date": day, "tasks": tasks, "goals": goals},
+    )
+    return EmailMessage(f"Your reminders for {day}", body, to=[employee.user.email])
+
+
+def reminder_digest(date, after=0, chunk_size=CHUNK_SIZE):
+    """
+    Email the digests of the next chunk of employees after primary key ``after``.
+
+    The following chunk is queued before any mail is sent, so a retry of
+    this chunk neither skips nor duplicates the rest. Returns the number of
+    emails sent.
+    """
+    day = parse_date(date)
+    horizon = day + datetime.timedelta(days=reminder_days())
+    employees = list(
+        Employee.objects.filter(pk__gt=after, is_active=True)
+        .exclude(user__email="")
+        .select_related("user")
+        .order_by("pk")[:chunk_size]
+    )
+    if not employees:
+        return 0
+    if len(employees) == chunk_size:
+        last = employees[-1].pk
+        jobs.enqueue(
+            "reminder_digest",
+            {"date": date, "after": last},
+            key=f"reminder_digest:{date}:{last}",
+        )
+
+    tasks, goals = {}, {}
+    for task in Task.objects.filter(
+        assigned_to__in=employees, completed=False, due_date__lte=horizon
+    ).order_by("due_date", "pk"):
+        tasks.setdefault(task.assigned_to_id, []).append(task)
+    for goal in Goal.objects.filter(
+        employee__in=employees, achieved=False, target_date__lte=horizon
+    ).order_by("target_date", "pk"):
+        goals.setdefault(goal.employee_id, []).append(goal)
+
+    messages = [
+        _digest(employee, day, tasks.get(employee.pk, []), goals.get(employee.pk, []))
+        for employee in employees
+        if employee.pk in tasks or employee.pk in goals
+    ]
+    if messages:
+        get_connection().send_messages(messages)
+    return len(messages)
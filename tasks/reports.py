@@ -0,0 +1,235 @@
+"""
+Columnar productivity reports over tasks and time logs.
+
+Distribution reports stream ``values_list`` rows in batches into compact
+``array`` columns (8 bytes or less per value) instead of model instances,
+then compute percentiles and histograms over whole columns; simple counts
+are left to the database. When NumPy is
+installed the columns are viewed as NumPy arrays without copying and the
+statistics are vectorised; otherwise a pure Python fallback is used, which
+sorts columns into another ``array`` a block at a time rather than into a
+list of Python floats.
+
+``Task`` records no completion timestamp, so the completion latency of a
+completed task is measured from ``created_at`` to its last update
+(``updated_at``), in days.
+
+Reports read the archive (``tasks.archive``) alongside the hot tables:
+archived tasks count as completed and archived time logs add to their
+task's hours.
+"""
+
+import bisect
+import heapq
+import itertools
+import math
+from array import array
+from collections import Counter
+from operator import itemgetter
+
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import ArchivedTask, ArchivedTimeLog, Task, TimeLog, priority_choices
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+# Rows fetched from the database cursor per round trip.
+BATCH_SIZE = 5000
+
+PERCENTILES = (50, 75, 90, 95, 99)
+
+# Values sorted as a Python list at a time by the pure Python percentiles.
+SORT_BLOCK = 65536
+
+PRIORITIES = tuple(value for value, _ in priority_choices)
+
+
+def load_columns(rows, typecodes):
+    """
+    Pack an iterable of row tuples into one ``array`` per column.
+
+    ``typecodes`` gives the ``array`` type code of each column; values must
+    already be numbers.
+    """
+    columns = [array(code) for code in typecodes]
+    appends = [column.append for column in columns]
+    for row in rows:
+        for append, value in zip(appends, row):
+            append(value)
+    return columns
+
+
+def sort_column(column, block=SORT_BLOCK):
+    """
+    Return ``column`` sorted into a new ``array`` of the same type.
+
+    Sorts ``block`` values at a time and merges the sorted blocks, so only
+    one block is ever held as Python objects.
+    """
+    blocks = [
+        array(column.typecode, sorted(column[start : start + block]))
+        for start in range(0, len(column), block)
+    ]
+    return array(column.typecode, heapq.merge(*blocks))
+
+
+def percentiles(column, points=PERCENTILES):
+    """Return ``{point: value}`` using linear interpolation between ranks."""
+    if not column:
+        return dict.fromkeys(points)
+    if np is not None:
+        values = np.percentile(np.frombuffer(column, dtype=column.typecode), points)
+        return {point: float(value) for point, value in zip(points, values)}
+
+    ordered = sort_column(column)
+    result = {}
+    for point in points:
+        rank = (len(ordered) - 1) * point / 100
+        low, high = math.floor(rank), math.ceil(rank)
+        result[point] = ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+    return result
+
+
+def histogram(column, edges):
+    """Count values falling in each ``[edges[i], edges[i + 1])`` bucket."""
+    if np is not None:
+        counts, _ = np.histogram(
+            np.frombuffer(column, dtype=column.typecode), bins=edges
+        )
+        return [int(count) for count in counts]
+
+    counts = [0] * (len(edges) - 1)
+    last = len(counts) - 1
+    for value in column:
+        index = bisect.bisect_right(edges, value) - 1
+        if index == len(counts) and value == edges[-1]:
+            index = last
+        if 0 <= index <= last:
+            counts[index] += 1
+    return counts
+
+
+def _tasks(department=None, model=Task):
+    """Return the tasks of ``model`` (``Task`` or ``ArchivedTask``) in a report."""
+    tasks = model.objects.all()
+    if department is not None:
+        tasks = tasks.filter(assigned_to__department=department)
+    return tasks
+
+
+def completion_latency(department=None, edges=(0, 1, 2, 7, 14, 30, 90, 365)):
+    """Return percentiles and a histogram of completion latency in days."""
+    rows = itertools.chain.from_iterable(
+        tasks.values_list("created_at", "updated_at").iterator(chunk_size=BATCH_SIZE)
+        for tasks in (
+            _tasks(department).filter(completed=True),
+            _tasks(department, ArchivedTask),
+        )
+    )
+    (days,) = load_columns(
+        (((updated - timezone.localdate(created)).days,) for created, updated in rows),
+        "l",
+    )
+    return {
+        "count": len(days),
+        "percentiles": percentiles(days),
+        "histogram": list(zip(edges, edges[1:], histogram(days, list(edges)))),
+    }
+
+
+def on_time_by_priority(department=None):
+    """
+    Return on-time and overdue counts and the on-time rate per priority.
+
+    A task is on time when it was completed no later than its due date and
+    overdue when it was completed late or is still open past its due date.
+    The counts are aggregated by the database in one grouped query per
+    tier.
+    """
+    on_time = Q(updated_at__lte=F("due_date"))
+    late = Q(updated_at__gt=F("due_date"))
+    counts = [
+        (
+            _tasks(department),
+            Q(completed=True) & on_time,
+            Q(completed=True) & late
+            | Q(completed=False, due_date__lt=timezone.localdate()),
+        ),
+        (_tasks(department, ArchivedTask), on_time, late),
+    ]
+    totals = {priority: Counter() for priority in PRIORITIES}
+    for tasks, punctual, overdue in counts:
+        for row in (
+            tasks.values("priority")
+            .annotate(
+                on_time=Count("id", filter=punctual),
+                overdue=Count("id", filter=overdue),
+            )
+            .order_by()
+        ):
+            totals[row["priority"]].update(
+                on_time=row["on_time"], overdue=row["overdue"]
+            )
+
+    report = {}
+    for priority in PRIORITIES:
+        row = totals[priority]
+        finished = row["on_time"] + row["overdue"]
+        report[priority] = {
+            "on_time": row["on_time"],
+            "overdue": row["overdue"],
+            "on_time_rate": row["on_time"] / finished if finished else None,
+        }
+    return report
+
+
+def hours_per_task(department=None, edges=(0, 1, 2, 4, 8, 16, 40, 80)):
+    """
+    Return percentiles and a histogram of hours logged per task.
+
+    A task's logs may be split between ``TimeLog`` and ``ArchivedTimeLog``:
+    each tier is summed per task in task order and the two sorted streams
+    are merged, so per-task hours go straight into the column.
+    """
+    logs = TimeLog.objects.all()
+    archived = ArchivedTimeLog.objects.all()
+    if department is not None:
+        logs = logs.filter(task__assigned_to__department=department)
+        archived = archived.filter(
+            Q(task_id__in=_tasks(department).values("pk"))
+            | Q(task_id__in=_tasks(department, ArchivedTask).values("pk"))
+        )
+    streams = [
+        queryset.values("task_id")
+        .annotate(total=Sum("duration"))
+        .values_list("task_id", "total")
+        .order_by("task_id")
+        .iterator(chunk_size=BATCH_SIZE)
+        for queryset in (logs, archived)
+    ]
+    merged = heapq.merge(*streams, key=itemgetter(0))
+    (hours,) = load_columns(
+        (
+            (sum(total.total_seconds() for _, total in totals) / 3600,)
+            for _, totals in itertools.groupby(merged, key=itemgetter(0))
+        ),
+        "d",
+    )
+    return {
+        "count": len(hours),
+        "percentiles": percentiles(hours),
+        "histogram": list(zip(edges, edges[1:], histogram(hours, list(edges)))),
+    }
+
+
+def productivity_report(department=None):
+    """Bundle every productivity report for ``department`` (or everyone)."""
+    return {
+        "completion_latency": completion_latency(department),
+        "on_time_by_priority": on_time_by_priority(department),
+        "hours_per_task": hours_per_task(department),
+    }
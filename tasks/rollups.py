@@ -0,0 +1,177 @@
+"""
+Daily time-tracking rollups and the reports built on them.
+
+Each ``TimeLog`` adds its duration to the ``DailyTimeRollup`` row keyed by
+(start date, employee, task). The row is created in the employee's
+department at the time and keeps it: moving the employee later leaves past
+days with their old department, and edits and deletes of old logs find the
+row by its key alone. The signal handlers in ``tasks.signals`` keep rollups
+current, ``manage.py backfill_rollups`` rebuilds them for existing logs,
+and reports such as :func:`department_weekly_hours` aggregate rollups
+instead of raw logs.
+"""
+
+import datetime
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from .models import ArchivedTimeLog, DailyTimeRollup, Department, Employee, TimeLog
+
+
+def rollup_key(log):
+    """Return the ``(date, employee_id, task_id)`` of ``log``'s rollup row."""
+    return (timezone.localdate(log.start_time), log.employee_id, log.task_id)
+
+
+def _seconds(duration):
+    """Convert a ``timedelta`` (or ``None``) to whole seconds."""
+    return int(duration.total_seconds()) if duration else 0
+
+
+def add(key, seconds, logs):
+    """
+    Add ``seconds`` and ``logs`` to the rollup row identified by ``key``.
+
+    A missing row is created in the employee's current department.
+    Negative amounts for a missing row are ignored: the row was already
+    removed, typically by the cascade that is deleting the logs.
+    """
+    date, employee_id, task_id = key
+    rows = DailyTimeRollup.objects.filter(
+        date=date, employee_id=employee_id, task_id=task_id
+    )
+    updated = rows.update(
+        seconds=F("seconds") + seconds, log_count=F("log_count") + logs
+    )
+    if not updated and logs > 0:
+        _rollup(
+            key,
+            Employee.objects.values_list("department_id", flat=True).get(
+                pk=employee_id
+            ),
+            seconds,
+            logs,
+        ).save()
+    elif updated and logs < 0:
+        rows.filter(log_count=0).delete()
+
+
+def log_saved(log, previous=None):
+    """Move ``log``'s contribution from its ``previous`` state to the new one."""
+    key = rollup_key(log)
+    if previous is not None and rollup_key(previous) == key:
+        add(key, _seconds(log.duration) - _seconds(previous.duration), 0)
+        return
+    if previous is not None:
+        add(rollup_key(previous), -_seconds(previous.duration), -1)
+    add(key, _seconds(log.duration), 1)
+
+
+def log_deleted(log):
+    """Withdraw a deleted ``log``'s contribution."""
+    add(rollup_key(log), -_seconds(log.duration), -1)
+
+
+def _rollup(key, department_id, seconds, logs):
+    """Return the unsaved rollup row of ``key`` in ``department_id``."""
+    date, employee_id, task_id = key
+    return DailyTimeRollup(
+        date=date,
+        employee_id=employee_id,
+        task_id=task_id,
+        department_id=department_id,
+        seconds=seconds,
+        log_count=logs,
+    )
+
+
+def _departments(rollups):
+    """Return ``{key: department_id}`` of the ``rollups`` queryset."""
+    return {
+        (date, employee_id, task_id): department_id
+        for date, employee_id, task_id, department_id in rollups.values_list(
+            "date", "employee", "task", "department"
+        ).iterator()
+    }
+
+
+def backfill(since=None, until=None):
+    """
+    Rebuild the rollups of every day between ``since`` and ``until``.
+
+    Either bound may be ``None`` for an open range. Archived logs are
+    included. Rebuilt rows keep the department of the row they replace;
+    days without one take the employee's current department. Returns the
+    number of rollup rows written.
+    """
+    rollups = DailyTimeRollup.objects.all()
+    if since is not None:
+        rollups = rollups.filter(date__gte=since)
+    if until is not None:
+        rollups = rollups.filter(date__lte=until)
+
+    departments = _departments(rollups)
+    totals = defaultdict(lambda: [0, 0])
+    for model in (TimeLog, ArchivedTimeLog):
+        logs = model.objects.annotate(day=TruncDate("start_time"))
+        if since is not None:
+            logs = logs.filter(day__gte=since)
+        if until is not None:
+            logs = logs.filter(day__lte=until)
+        rows = logs.values_list(
+            "day", "employee", "task_id", "employee__department"
+        ).annotate(total=Sum("duration"), logs=Count("id"))
+        for *key, department_id, total, count in rows.iterator():
+            key = tuple(key)
+            departments.setdefault(key, department_id)
+            totals[key][0] += _seconds(total)
+            totals[key][1] += count
+    with transaction.atomic():
+        rollups.delete()
+        created = DailyTimeRollup.objects.bulk_create(
+            (
+                _rollup(key, departments[key], *amounts)
+                for key, amounts in totals.items()
+            ),
+            batch_size=1000,
+        )
+    return len(created)
+
+
+def department_weekly_hours(since, until, departments=None):
+    """
+    Return hours logged per department per week between two dates.
+
+    The result is ``(weeks, rows)`` where ``weeks`` lists the Monday of each
+    week in the range and each row is ``(department, [hours per week])``.
+    """
+    rollups = DailyTimeRollup.objects.filter(date__gte=since, date__lte=until)
+    if departments is not None:
+        rollups = rollups.filter(department__in=departments)
+    totals = rollups.values(week=TruncWeek("date"), dept=F("department")).annotate(
+        seconds=Sum("seconds")
+    )
+
+    weeks = []
+    monday = since - datetime.timedelta(days=since.weekday())
+    while monday <= until:
+        weeks.append(monday)
+        monday += datetime.timedelta(weeks=1)
+
+    hours = defaultdict(dict)
+    for row in totals:
+        week = row["week"]
+        if isinstance(week, datetime.datetime):
+            week = week.date()
+        hours[row["dept"]][week] = round(row["seconds"] / 3600, 2)
+
+    names = Department.objects.filter(pk__in=hours).order_by("name")
+    rows = [
+        (department, [hours[department.pk].get(week, 0) for week in weeks])
+        for department in names
+    ]
+    return weeks, rows
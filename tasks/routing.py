@@ -0,0 +1,281 @@
+"""
+Read replica routing.
+
+Writes always go to the primary (``default``) database. Reads go to a
+replica only inside views decorated with :func:`replica_reads`, which sets
+how many seconds of replica lag the view tolerates:
+
+* a replica is used only when its lag is within the tolerance; the lag is
+  the age of the replica's copy of the :class:`~tasks.models.Heartbeat` row
+  that :func:`beat` writes on the primary,
+* once a request writes, its remaining reads and every later request of the
+  same session read from the primary, so users see their own changes.
+  ``REPLICA_PIN_SECONDS`` limits how long a session stays pinned; ``None``
+  pins it for the rest of the session.
+
+``tasks.middleware.ReplicaRoutingMiddleware`` tracks the state of each
+request. Replicas are the ``REPLICA_DATABASES`` aliases; per-view
+tolerances can be overridden by URL name with ``REPLICA_MAX_LAG``.
+
+Locally, a replica can be a second SQLite file that ``manage.py
+sync_replicas`` refreshes from the primary with SQLite's backup API.
+"""
+
+import contextvars
+import functools
+import os
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in
+from django.db import DatabaseError, connections
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Heartbeat
+
+PRIMARY = "default"
+
+HEARTBEAT = "primary"
+
+# Session key holding the time the session last wrote.
+SESSION_KEY = "tasks.routing.wrote_at"
+
+# Seconds a replica's heartbeat is remembered before it is read again.
+HEARTBEAT_CHECK_INTERVAL = 1.0
+
+# Models always read from the primary, whose writes do not pin the session.
+PRIMARY_MODELS = {"sessions.session"}
+
+# ``{alias: (monotonic time read, heartbeat time)}`` of each replica.
+_heartbeats = {}
+
+# Routing state of the request being handled in the current context.
+_current = contextvars.ContextVar("tasks_routing", default=None)
+
+
+@dataclass
+class Routing:
+    """
+    Routing state of one request.
+
+    Attributes:
+        session: The request's session, read lazily to check the pin.
+        max_lag (float): Seconds of lag tolerated, or ``None`` to read from
+            the primary.
+        wrote (bool): Whether the request has written.
+    """
+
+    session: object = None
+    max_lag: float = None
+    wrote: bool = False
+
+    def pinned(self):
+        """Whether this request or an earlier one of its session wrote."""
+        if self.wrote:
+            return True
+        if self.session is None:
+            return False
+        wrote_at = self.session.get(SESSION_KEY)
+        if wrote_at is None:
+            return False
+        seconds = getattr(settings, "REPLICA_PIN_SECONDS", None)
+        return seconds is None or time.time() - wrote_at < seconds
+
+
+def replicas():
+    """Return the aliases of the configured replicas."""
+    return list(getattr(settings, "REPLICA_DATABASES", []))
+
+
+def beat(at=None):
+    """Write the heartbeat on the primary."""
+    Heartbeat.objects.using(PRIMARY).update_or_create(
+        name=HEARTBEAT, defaults={"beat_at": at or timezone.now()}
+    )
+
+
+def _available(alias):
+    """Whether ``alias`` can be connected to without creating a database."""
+    connection = connections[alias]
+    if connection.vendor != "sqlite" or connection.is_in_memory_db():
+        return True
+    return os.path.exists(connection.settings_dict["NAME"])
+
+
+def lag(alias):
+    """Return the replication lag of ``alias`` in seconds, or ``None`` if unknown."""
+    now = time.monotonic()
+    checked = _heartbeats.get(alias)
+    if checked is None or now - checked[0] > HEARTBEAT_CHECK_INTERVAL:
+        beat_at = None
+        if _available(alias):
+            try:
+                beat_at = (
+                    Heartbeat.objects.using(alias)
+                    .filter(name=HEARTBEAT)
+                    .values_list("beat_at", flat=True)
+                    .first()
+                )
+            except DatabaseError:
+                pass
+        checked = _heartbeats[alias] = (now, beat_at)
+    if checked[1] is None:
+        return None
+    return max((timezone.now() - checked[1]).total_seconds(), 0.0)
+
+
+def forget_heartbeats():
+    """Read every replica's heartbeat again on next use."""
+    _heartbeats.clear()
+
+
+def choose(max_lag):
+    """Return a replica lagging at most ``max_lag`` seconds, or the primary."""
+    fresh = [
+        alias
+        for alias in replicas()
+        if (delay := lag(alias)) is not None and delay <= max_lag
+    ]
+    return random.choice(fresh) if fresh else PRIMARY
+
+
+def start(session=None):
+    """Begin routing a request in the current context."""
+    state = Routing(session=session)
+    return state, _current.set(state)
+
+
+def finish(token):
+    """Stop routing the request begun with :func:`start`."""
+    _current.reset(token)
+
+
+def pin(session):
+    """Send the reads of ``session`` to the primary from now on."""
+    session[SESSION_KEY] = time.time()
+
+
+def max_lag_for(view_name, default):
+    """Return the lag tolerated by ``view_name``, honouring ``REPLICA_MAX_LAG``."""
+    return getattr(settings, "REPLICA_MAX_LAG", {}).get(view_name, default)
+
+
+def replica_reads(max_lag):
+    """
+    Let the decorated view read from replicas lagging at most ``max_lag`` seconds.
+
+    Works with sync and async views.
+    """
+
+    def decorator(view):
+        def tolerance(request):
+            match = request.resolver_match
+            return max_lag_for(match.view_name if match else None, max_lag)
+
+        if iscoroutinefunction(view):
+
+            @functools.wraps(view)
+            async def async_inner(request, *args, **kwargs):
+                state = _current.get()
+                if state is None:
+                    return await view(request, *args, **kwargs)
+                state.max_lag = tolerance(request)
+                try:
+                    return await view(request, *args, **kwargs)
+                finally:
+                    state.max_lag = None
+
+            return async_inner
+
+        @functools.wraps(view)
+        def inner(request, *args, **kwargs):
+            state = _current.get()
+            if state is None:
+                return view(request, *args, **kwargs)
+            state.max_lag = tolerance(request)
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                state.max_lag = None
+
+        return inner
+
+    return decorator
+
+
+class ReplicaRouter:
+    """Database router sending tolerant reads to replicas."""
+
+    def db_for_read(self, model, **hints):
+        """Read from a fresh enough replica inside :func:`replica_reads` views."""
+        state = _current.get()
+        if state is None or state.max_lag is None:
+            return PRIMARY
+        if model._meta.label_lower in PRIMARY_MODELS or state.pinned():
+            return PRIMARY
+        return choose(state.max_lag)
+
+    def db_for_write(self, model, **hints):
+        """Write to the primary and pin the current request to it."""
+        state = _current.get()
+        if state is not None and model._meta.label_lower not in PRIMARY_MODELS:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Replicas hold the same rows as the primary."""
+        databases = {PRIMARY, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Replicas get their schema from the primary."""
+        if db in replicas():
+            return False
+        return None
+
+
+@receiver(user_logged_in)
+def ignore_login_write(sender, **kwargs):
+    """
+    Do not pin a session for recording ``last_login``.
+
+    Every session logs in, so pinning on it would keep everyone off the
+    replicas.
+    """
+    state = _current.get()
+    if state is not None:
+        state.wrote = False
+
+
+def copy_sqlite(path):
+    """Copy the primary SQLite database to ``path`` with the backup API."""
+    primary = connections[PRIMARY]
+    primary.ensure_connection()
+    target = sqlite3.connect(path)
+    try:
+        primary.connection.backup(target)
+    finally:
+        target.close()
+
+
+def sync(alias):
+    """
+    Refresh the replica ``alias``.
+
+    Writes a heartbeat, then copies the primary over SQLite replicas stored
+    in files. Other replicas are expected to receive the heartbeat through
+    replication.
+    """
+    beat()
+    replica = connections[alias]
+    if replica.vendor == "sqlite" and not replica.is_in_memory_db():
+        replica.close()
+        copy_sqlite(replica.settings_dict["NAME"])
+    _heartbeats.pop(alias, None)
@@ -0,0 +1,255 @@
+"""
+Full-text search over tasks, goals and journal entries.
+
+Searchable text is copied into the ``tasks_search`` table created by
+migration ``0005_search_index``: an FTS5 virtual table on SQLite and a table
+with a weighted, generated ``tsvector`` column and a GIN index on
+PostgreSQL. The signal handlers in ``tasks.signals`` keep it in sync and
+``manage.py rebuild_search_index`` repopulates it. Other database backends
+fall back to ``icontains`` scans.
+
+The raw SQL follows the database routers like the ``Task`` queries around
+it: the index is written on the database ``Task`` writes to and searched on
+the one it reads from, a replica inside ``tasks.routing.replica_reads``
+views.
+"""
+
+import re
+from dataclasses import dataclass
+
+from django.db import connections, router, transaction
+
+from .models import Goal, JournalEntry, Task
+
+TABLE = "tasks_search"
+
+# Rows written per INSERT while rebuilding.
+BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class Source:
+    """
+    How one model is indexed.
+
+    Attributes:
+        model (Model): Indexed model.
+        title (str): Field indexed as the (more heavily weighted) title.
+        body (str): Field indexed as the body.
+    """
+
+    model: type
+    title: str
+    body: str
+
+
+SOURCES = {
+    "task": Source(Task, "title", "description"),
+    "goal": Source(Goal, "title", "description"),
+    "journal": Source(JournalEntry, "entry_date", "content"),
+}
+
+KINDS = {source.model: kind for kind, source in SOURCES.items()}
+
+# FTS5 tables only index their rowid, so SQLite rows are addressed by a rowid
+# derived from the kind and primary key rather than by the unindexed columns.
+KIND_CODES = {kind: code for code, kind in enumerate(SOURCES)}
+
+
+@dataclass
+class Hit:
+    """
+    One ranked search result.
+
+    Attributes:
+        kind (str): ``task``, ``goal`` or ``journal``.
+        object (Model): The matching instance.
+        rank (float): Relevance; higher is better.
+    """
+
+    kind: str
+    object: object
+    rank: float
+
+
+def _connection(write=False):
+    """Return the connection the index is read from, or written to with ``write``."""
+    alias = router.db_for_write(Task) if write else router.db_for_read(Task)
+    return connections[alias]
+
+
+def supported(write=False):
+    """Return whether the database has a full-text index."""
+    return _connection(write).vendor in ("sqlite", "postgresql")
+
+
+def _document(instance):
+    """Return the index row of ``instance`` in insertion column order."""
+    kind = KINDS[type(instance)]
+    source = SOURCES[kind]
+    employee_id = instance.assigned_to_id if kind == "task" else instance.employee_id
+    return (
+        _rowid(kind, instance.pk),
+        kind,
+        instance.pk,
+        employee_id,
+        str(getattr(instance, source.title)),
+        str(getattr(instance, source.body)),
+    )
+
+
+def _rowid(kind, pk):
+    """Return the SQLite rowid of the index row for ``kind`` and ``pk``."""
+    return pk * len(KIND_CODES) + KIND_CODES[kind]
+
+
+def _insert_sql(vendor):
+    """Return the INSERT statement matching :func:`_document` rows."""
+    if vendor == "sqlite":
+        return (
+            f"INSERT INTO {TABLE} (rowid, kind, object_id, employee_id, title, body) "
+            "VALUES (%s, %s, %s, %s, %s, %s)"
+        )
+    return (
+        f"INSERT INTO {TABLE} (kind, object_id, employee_id, title, body) "
+        "VALUES (%s, %s, %s, %s, %s)"
+    )
+
+
+def _bind(row, vendor):
+    """Drop the rowid from a :func:`_document` row outside SQLite."""
+    return row if vendor == "sqlite" else row[1:]
+
+
+def index(instance):
+    """Add or refresh ``instance`` in the search index."""
+    if not supported(write=True):
+        return
+    unindex(instance)
+    with _connection(write=True).cursor() as cursor:
+        _insert(cursor, [_document(instance)])
+
+
+def unindex(instance):
+    """Remove ``instance`` from the search index."""
+    if not supported(write=True):
+        return
+    kind = KINDS[type(instance)]
+    with _connection(write=True).cursor() as cursor:
+        if cursor.db.vendor == "sqlite":
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE rowid = %s", [_rowid(kind, instance.pk)]
+            )
+        else:
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE kind = %s AND object_id = %s",
+                [kind, instance.pk],
+            )
+
+
+def index_many(instances):
+    """Add freshly created ``instances`` to the index in batched inserts."""
+    if not supported(write=True):
+        return 0
+    with _connection(write=True).cursor() as cursor:
+        return _insert(cursor, [_document(instance) for instance in instances])
+
+
+def rebuild():
+    """Repopulate the index from every task, goal and journal entry."""
+    if not supported(write=True):
+        return 0
+    total = 0
+    database = _connection(write=True)
+    with transaction.atomic(using=database.alias), database.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        for source in SOURCES.values():
+            batch = []
+            for instance in source.model.objects.order_by("pk").iterator(
+                chunk_size=BATCH_SIZE
+            ):
+                batch.append(_document(instance))
+                if len(batch) == BATCH_SIZE:
+                    total += _insert(cursor, batch)
+                    batch = []
+            total += _insert(cursor, batch)
+    return total
+
+
+def _insert(cursor, rows):
+    """Insert index ``rows`` with a single statement."""
+    if rows:
+        vendor = cursor.db.vendor
+        cursor.executemany(_insert_sql(vendor), [_bind(row, vendor) for row in rows])
+    return len(rows)
+
+
+def _fts5_query(text):
+    """Quote each word so user input cannot inject FTS5 query syntax."""
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"' for word in words)
+
+
+def _ranked_ids(text, employee_id, limit, offset):
+    """Return ``(kind, object_id, rank)`` rows of the best matches."""
+    database = _connection()
+    if database.vendor == "sqlite":
+        match = _fts5_query(text)
+        if not match:
+            return []
+        # bm25() is lower for better matches; titles weigh ten times bodies.
+        sql = (
+            f"SELECT kind, object_id, -bm25({TABLE}, 0, 0, 0, 10.0, 1.0) AS score "
+            f"FROM {TABLE} WHERE {TABLE} MATCH %s"
+        )
+        params = [match]
+    else:
+        sql = (
+            "SELECT kind, object_id, ts_rank(document, query) AS score "
+            f"FROM {TABLE}, websearch_to_tsquery('english', %s) AS query "
+            "WHERE document @@ query"
+        )
+        params = [text]
+    if employee_id is not None:
+        sql += " AND employee_id = %s"
+        params.append(employee_id)
+    sql += " ORDER BY score DESC, kind, object_id LIMIT %s OFFSET %s"
+    params += [limit, offset]
+    with database.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _scanned_ids(text, employee_id, limit, offset):
+    """Fallback for backends without full-text search: unranked scans."""
+    rows = []
+    for kind, source in SOURCES.items():
+        owner = "assigned_to" if kind == "task" else "employee"
+        queryset = source.model.objects.filter(**{f"{source.body}__icontains": text})
+        if employee_id is not None:
+            queryset = queryset.filter(**{owner: employee_id})
+        rows += [(kind, pk, 0.0) for pk in queryset.values_list("pk", flat=True)]
+    return rows[offset : offset + limit]
+
+
+def search(text, employee_id=None, limit=20, offset=0):
+    """
+    Return ranked :class:`Hit` objects matching ``text``.
+
+    ``employee_id`` restricts results to one employee's tasks, goals and
+    entries. Matching instances are loaded with one query per kind.
+    """
+    finder = _ranked_ids if supported() else _scanned_ids
+    rows = finder(text, employee_id, limit, offset)
+
+    wanted = {}
+    for kind, object_id, _ in rows:
+        wanted.setdefault(kind, []).append(object_id)
+    objects = {
+        kind: SOURCES[kind].model.objects.in_bulk(ids) for kind, ids in wanted.items()
+    }
+    return [
+        Hit(kind, objects[kind][int(object_id)], float(score))
+        for kind, object_id, score in rows
+        if int(object_id) in objects[kind]
+    ]
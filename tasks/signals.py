@@ -0,0 +1,289 @@
+"""
+Signal handlers for the Tasks application.
+
+They keep the dashboard counters in ``tasks.counters``, the daily time
+rollups in ``tasks.rollups``, the full-text index in ``tasks.search`` and
+the per-employee workload in ``tasks.workload`` in step with every save and
+delete of the models they cover, append the change events of
+``tasks.outbox``, and expire the employee profiles cached by
+``tasks.middleware``, the authorization scopes cached by
+``tasks.permissions`` and the pages cached by ``tasks.caching``.
+"""
+
+# Receivers must accept the full signal keyword arguments.
+# pylint: disable=unused-argument
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import caching, counters, outbox, permissions, rollups, search, workload
+from .middleware import invalidate_employee
+from .models import (
+    ArchivedTask,
+    ArchivedTimeLog,
+    ChangeEvent,
+    Department,
+    Employee,
+    Goal,
+    JournalEntry,
+    Recurrence,
+    Task,
+    TimeLog,
+    Workload,
+)
+
+# Models whose contribution depends on their field values, so an update can
+# move it between counters or departments.
+TRACKED_MODELS = (Employee, Task, JournalEntry, TimeLog)
+
+# Models whose stored version is recorded before saves: the tracked models
+# and departments, whose previous head loses their permissions.
+REMEMBERED_MODELS = TRACKED_MODELS + (Department,)
+
+# Models moved out of the tracked tables by ``tasks.archive``. Archiving
+# keeps their contribution; deleting them withdraws it.
+ARCHIVED_MODELS = (ArchivedTask, ArchivedTimeLog)
+
+
+@receiver(pre_save)
+def remember_previous_state(sender, instance, raw=False, **kwargs):
+    """Record the stored version of a row before it is overwritten."""
+    if raw or sender not in REMEMBERED_MODELS or instance.pk is None:
+        return
+    # pylint: disable=protected-access
+    instance._previous_state = sender.objects.filter(pk=instance.pk).first()
+
+
+def previous_state(instance):
+    """Return the stored version recorded by :func:`remember_previous_state`."""
+    return getattr(instance, "_previous_state", None)
+
+
+@receiver(post_save)
+def update_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    """Apply the change in an instance's contribution to the counters."""
+    if raw:
+        return
+    if sender in (User, Department):
+        if created:
+            counters.apply(counters.contribution(instance))
+        return
+    if sender not in TRACKED_MODELS:
+        return
+
+    stored = previous_state(instance)
+    previous = counters.contribution(stored) if stored else counters.Tally()
+    current = counters.contribution(instance)
+    delta = counters.Tally(current)
+    delta.subtract(previous)
+    counters.apply(delta)
+
+    if sender is Employee:
+        # Moving an employee moves their tasks, entries and hours with them.
+        moved = {scope for scope, _ in previous} ^ {scope for scope, _ in current}
+        if moved:
+            counters.rebuild(moved)
+
+
+@receiver(post_delete)
+def update_counters_on_delete(sender, instance, **kwargs):
+    """Withdraw a deleted instance's contribution from the counters."""
+    if sender not in TRACKED_MODELS + ARCHIVED_MODELS + (User, Department):
+        return
+    delta = counters.Tally()
+    delta.subtract(counters.contribution(instance))
+    counters.apply(delta)
+    if sender is Department:
+        # Dropping the scope removes the department's own counter rows.
+        counters.rebuild([instance.pk])
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_employee_profile(sender, instance, **kwargs):
+    """Drop the cached profile served by ``EmployeeMiddleware``."""
+    invalidate_employee(instance.user_id)
+
+
+@receiver(post_save, sender=Department)
+def invalidate_department_profiles(sender, instance, created, **kwargs):
+    """Cached profiles embed their department, so refresh its members."""
+    if not created:
+        invalidate_employee(*instance.employees.values_list("user_id", flat=True))
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_head_scopes(sender, instance, **kwargs):
+    """Drop the cached scopes of the department's current and previous head."""
+    stored = previous_state(instance)
+    permissions.invalidate(instance.hod_id, stored.hod_id if stored else None)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_employee_scopes(sender, instance, **kwargs):
+    """Drop the cached scopes of the employee and of their heads of department."""
+    stored = previous_state(instance)
+    permissions.invalidate(instance.user_id)
+    permissions.invalidate_departments(
+        instance.department_id, stored.department_id if stored else None
+    )
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_scope(sender, instance, update_fields=None, **kwargs):
+    """Drop the cached scope of a user, whose staff status may have changed."""
+    if not (update_fields and set(update_fields) == {"last_login"}):
+        permissions.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=TimeLog)
+@receiver(post_save, sender=Goal)
+@receiver(post_save, sender=JournalEntry)
+def record_change_on_save(sender, instance, created, raw=False, **kwargs):
+    """Append a create or update event to the change feed."""
+    if not raw:
+        outbox.record(instance, ChangeEvent.CREATE if created else ChangeEvent.UPDATE)
+
+
+@receiver(pre_delete, sender=Task)
+@receiver(pre_delete, sender=TimeLog)
+@receiver(pre_delete, sender=Goal)
+@receiver(pre_delete, sender=JournalEntry)
+def lock_changes_on_delete(sender, instance, using, **kwargs):
+    """Lock the change feed before a delete touches any row."""
+    outbox.lock(using)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=TimeLog)
+@receiver(post_delete, sender=Goal)
+@receiver(post_delete, sender=JournalEntry)
+def record_change_on_delete(sender, instance, **kwargs):
+    """Append a delete event to the change feed."""
+    outbox.record(instance, ChangeEvent.DELETE)
+
+
+@receiver(post_save, sender=TimeLog)
+def update_rollups_on_save(sender, instance, raw=False, **kwargs):
+    """Move a saved log's time into its daily rollup."""
+    if not raw:
+        rollups.log_saved(instance, previous_state(instance))
+
+
+@receiver(post_delete, sender=TimeLog)
+@receiver(post_delete, sender=ArchivedTimeLog)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    """Withdraw a deleted log's time from its daily rollup."""
+    rollups.log_deleted(instance)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Goal)
+@receiver(post_save, sender=JournalEntry)
+def update_search_index_on_save(sender, instance, raw=False, **kwargs):
+    """Refresh a saved row's full-text index entry."""
+    if not raw:
+        search.index(instance)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Goal)
+@receiver(post_delete, sender=JournalEntry)
+def update_search_index_on_delete(sender, instance, **kwargs):
+    """Remove a deleted row from the full-text index."""
+    search.unindex(instance)
+
+
+def _workload_owners(instance, stored):
+    """Return the employees whose workload a task or time log change affects."""
+    field = "assigned_to_id" if isinstance(instance, Task) else "employee_id"
+    return {getattr(owner, field) for owner in (instance, stored) if owner}
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=TimeLog)
+def update_workload_on_save(sender, instance, raw=False, **kwargs):
+    """Refresh the workload of the old and new owner of a saved row."""
+    if not raw:
+        workload.refresh(_workload_owners(instance, previous_state(instance)))
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=TimeLog)
+def update_workload_on_delete(sender, instance, **kwargs):
+    """Refresh the workload of a deleted row's owner."""
+    workload.refresh(_workload_owners(instance, None))
+
+
+@receiver(post_save, sender=Employee)
+def create_workload(sender, instance, created, raw=False, **kwargs):
+    """Give new employees an empty workload row."""
+    if created and not raw:
+        workload.refresh([instance.pk])
+
+
+@receiver(post_delete, sender=Employee)
+def delete_workload(sender, instance, **kwargs):
+    """
+    Drop a deleted employee's workload.
+
+    Cascades delete tasks before their assignee, and refreshing on those
+    deletes can re-create the row after the cascade removed it.
+    """
+    Workload.objects.filter(employee_id=instance.pk).delete()
+
+
+# Cache namespaces of rows owned by employees: ``{model: (namespace, owner
+# field)}``. Changes bump the namespace and its per-employee variant.
+OWNED_NAMESPACES = {
+    Task: ("tasks", "assigned_to_id"),
+    TimeLog: ("timelogs", "employee_id"),
+    Goal: ("goals", "employee_id"),
+    JournalEntry: ("journals", "employee_id"),
+    Recurrence: ("recurrences", "assigned_to_id"),
+}
+
+
+def _changed_namespaces(instance, stored):
+    """Return the cache namespaces a change to ``instance`` invalidates."""
+    if isinstance(instance, Department):
+        return {"departments", "employees"}
+    if isinstance(instance, Employee):
+        return {"employees"}
+    if isinstance(instance, User):
+        return {"users"}
+    namespace, field = OWNED_NAMESPACES[type(instance)]
+    owners = {instance, stored} - {None}
+    return {namespace} | {f"{namespace}:{getattr(owner, field)}" for owner in owners}
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=TimeLog)
+@receiver(post_save, sender=Goal)
+@receiver(post_save, sender=JournalEntry)
+@receiver(post_save, sender=Recurrence)
+def bump_cache_versions_on_save(sender, instance, update_fields=None, **kwargs):
+    """Invalidate cached pages showing a saved row."""
+    if sender is User and update_fields and set(update_fields) == {"last_login"}:
+        return
+    caching.bump(*_changed_namespaces(instance, previous_state(instance)))
+
+
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=TimeLog)
+@receiver(post_delete, sender=Goal)
+@receiver(post_delete, sender=JournalEntry)
+@receiver(post_delete, sender=Recurrence)
+def bump_cache_versions_on_delete(sender, instance, **kwargs):
+    """Invalidate cached pages showing a deleted row."""
+    caching.bump(*_changed_namespaces(instance, None))
@@ -0,0 +1,93 @@
+"""
+SQLite production profile.
+
+With ``SQLITE_PRODUCTION`` enabled, every new SQLite connection is set up
+with the :data:`PRAGMAS` below (override single values with the
+``SQLITE_PRAGMAS`` setting):
+
+* ``journal_mode=WAL`` lets readers run while one writer commits,
+* ``synchronous=NORMAL`` skips the fsync on every commit, which is safe
+  in WAL mode (a power loss can only drop the last transactions),
+* ``busy_timeout`` makes a writer wait for the lock instead of failing,
+* ``mmap_size`` and ``cache_size`` keep hot pages in memory.
+
+The settings also keep connections open between requests
+(``CONN_MAX_AGE``) with health checks, so the pragmas run once per
+connection instead of once per request.
+
+A busy timeout cannot help a transaction that read a snapshot another
+writer has since committed over: SQLite fails it immediately with
+"database is locked". :func:`retry_on_lock` reruns such writes with
+backoff; ``log_time`` and ``create_task`` use it.
+"""
+
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    # Negative sizes are in KiB: 64 MiB.
+    "cache_size": -64 * 1024,
+}
+
+# Attempts made by :func:`retry_on_lock` before giving up.
+WRITE_ATTEMPTS = 5
+
+# Upper bound of the first retry delay in seconds; doubled on every retry.
+RETRY_DELAY = 0.05
+
+
+def enabled():
+    """Whether the production profile is on."""
+    return getattr(settings, "SQLITE_PRODUCTION", False)
+
+
+def pragmas():
+    """Return ``{pragma: value}`` applied to new connections."""
+    return {**PRAGMAS, **getattr(settings, "SQLITE_PRAGMAS", {})}
+
+
+@receiver(connection_created)
+def configure(sender, connection, **kwargs):  # pylint: disable=redefined-outer-name
+    """Apply the pragmas to a new SQLite connection."""
+    if connection.vendor != "sqlite" or not enabled():
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas().items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def is_locked(exc):
+    """Whether ``exc`` reports lock contention rather than a real error."""
+    message = str(exc).lower()
+    return "database is locked" in message or "database table is locked" in message
+
+
+def retry_on_lock(func, *args, **kwargs):
+    """
+    Call ``func`` in a transaction, retrying while the database is locked.
+
+    The transaction is rolled back before each retry, so ``func`` must be
+    safe to call again: saving a new instance is, because SQLite reports
+    contention on a transaction's first write. Inside an outer transaction
+    there is nothing safe to retry and the error is raised at once.
+    """
+    attempts = getattr(settings, "SQLITE_WRITE_ATTEMPTS", WRITE_ATTEMPTS)
+    for attempt in range(1, attempts + 1):
+        nested = connection.in_atomic_block
+        try:
+            with transaction.atomic():
+                return func(*args, **kwargs)
+        except OperationalError as exc:
+            if nested or attempt == attempts or not is_locked(exc):
+                raise
+        time.sleep(random.uniform(0, RETRY_DELAY * 2 ** (attempt - 1)))
+    return None
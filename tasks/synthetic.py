@@ -0,0 +1,324 @@
+"""
+Synthetic data for benchmarks.
+
+:func:`seed` generates departments, employees, tasks, time logs, goals and
+journal entries at a requested scale, from a seeded random generator so
+the same arguments produce the same data set. Rows are generated one
+chunk of employees at a time and written with ``bulk_create``, so memory
+stays flat from ten thousand rows to ten million. Per employee it creates
+about :data:`TASKS_PER_EMPLOYEE` tasks, :data:`LOGS_PER_EMPLOYEE` time
+logs, :data:`GOALS_PER_EMPLOYEE` goals and :data:`JOURNALS_PER_EMPLOYEE`
+journal entries, in departments of :data:`EMPLOYEES_PER_DEPARTMENT`.
+
+``bulk_create`` bypasses the signals, so the counters, workloads, time
+rollups and search index are rebuilt once at the end. Every generated
+user shares one password; ``<prefix>-admin`` is a staff user.
+``manage.py seed_synthetic`` is the command line front end.
+"""
+
+import datetime
+import math
+import random
+from dataclasses import dataclass, field
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from . import caching, counters, rollups, search, workload
+from .models import Department, Employee, Goal, JournalEntry, Task, TimeLog
+
+EMPLOYEES_PER_DEPARTMENT = 50
+TASKS_PER_EMPLOYEE = 20
+LOGS_PER_EMPLOYEE = 30
+GOALS_PER_EMPLOYEE = 3
+JOURNALS_PER_EMPLOYEE = 10
+
+# Rows written per employee: the user, the employee and their records.
+ROWS_PER_EMPLOYEE = (
+    2
+    + TASKS_PER_EMPLOYEE
+    + LOGS_PER_EMPLOYEE
+    + GOALS_PER_EMPLOYEE
+    + JOURNALS_PER_EMPLOYEE
+)
+
+# Employees generated and inserted per transaction.
+CHUNK_SIZE = 500
+
+# Rows sent to the database per INSERT statement.
+BATCH_SIZE = 1000
+
+PASSWORD = "synthetic"
+
+# fmt: off
+FIRST_NAMES = (
+    "Ada", "Alan", "Amara", "Ben", "Chen", "Dana", "Elif", "Femi", "Grace",
+    "Hiro", "Ines", "Jon", "Kira", "Liam", "Maya", "Nia", "Omar", "Priya",
+    "Quinn", "Rosa", "Sam", "Tariq", "Uma", "Vera", "Wei", "Yara", "Zoe",
+)
+LAST_NAMES = (
+    "Adams", "Baker", "Costa", "Diaz", "Evans", "Fischer", "Garcia", "Hansen",
+    "Ito", "Jones", "Khan", "Lopez", "Meyer", "Novak", "Okafor", "Patel",
+    "Rossi", "Silva", "Tanaka", "Weber", "Young", "Zhang",
+)
+DEPARTMENT_NAMES = (
+    "Engineering", "Sales", "Marketing", "Finance", "Support", "Operations",
+    "Legal", "Research", "Design", "People",
+)
+POSITIONS = (
+    "Analyst", "Engineer", "Senior Engineer", "Designer", "Manager",
+    "Specialist", "Coordinator", "Consultant",
+)
+VERBS = (
+    "Review", "Draft", "Update", "Prepare", "Fix", "Plan", "Migrate", "Audit",
+    "Document", "Test",
+)
+NOUNS = (
+    "quarterly report", "onboarding guide", "release notes", "budget",
+    "customer survey", "API client", "sales deck", "backlog", "dashboard",
+    "roadmap", "invoice run", "security review",
+)
+PHRASES = (
+    "Worked through the open items.", "Met with the team to align on scope.",
+    "Blocked on feedback from another department.", "Made good progress.",
+    "Spent most of the day on reviews.", "Wrapped up the remaining tests.",
+)
+# fmt: on
+
+# Relative frequency of each priority.
+PRIORITY_WEIGHTS = {"Low": 3, "Medium": 5, "High": 2}
+
+
+@dataclass
+class Seeded:
+    """
+    Rows written so far, by model name.
+
+    Attributes:
+        counts (dict): ``{model name: rows}``.
+        employees (int): Employees the run will create in total.
+    """
+
+    counts: dict = field(default_factory=dict)
+    employees: int = 0
+
+    @property
+    def total(self):
+        """Rows written so far."""
+        return sum(self.counts.values())
+
+    def add(self, model, rows):
+        """Count ``rows`` more rows of ``model``."""
+        name = model.__name__
+        self.counts[name] = self.counts.get(name, 0) + rows
+
+
+def plan(rows):
+    """Return ``(departments, employees)`` giving about ``rows`` rows in total."""
+    employees = max(1, rows // ROWS_PER_EMPLOYEE)
+    return math.ceil(employees / EMPLOYEES_PER_DEPARTMENT), employees
+
+
+def _sentence(rng, words):
+    """Return a few random ``words`` joined into a sentence."""
+    return " ".join(rng.choice(words) for _ in range(rng.randint(2, 4)))
+
+
+def _create_departments(rng, prefix, count, password, seeded):
+    """Insert ``count`` departments, each headed by a new user."""
+    heads = User.objects.bulk_create(
+        (
+            User(
+                username=f"{prefix}-head-{index}",
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                password=password,
+            )
+            for index in range(count)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    departments = Department.objects.bulk_create(
+        (
+            Department(
+                name=f"{DEPARTMENT_NAMES[index % len(DEPARTMENT_NAMES)]} {index + 1}",
+                hod=head,
+            )
+            for index, head in enumerate(heads)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    seeded.add(User, len(heads))
+    seeded.add(Department, len(departments))
+    return departments
+
+
+def _employee_rows(rng, numbers, context):
+    """Return unsaved users and employees numbered ``numbers``."""
+    prefix, departments, password, now = context
+    users, employees = [], []
+    for number in numbers:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        user = User(
+            username=f"{prefix}-{number}",
+            first_name=first,
+            last_name=last,
+            email=f"{first}.{last}.{number}@example.com".lower(),
+            password=password,
+        )
+        users.append(user)
+        employees.append(
+            Employee(
+                user=user,
+                department=departments[number // EMPLOYEES_PER_DEPARTMENT],
+                date_joined=now.date()
+                - datetime.timedelta(days=rng.randint(0, 5 * 365)),
+                position=rng.choice(POSITIONS),
+            )
+        )
+    return users, employees
+
+
+def _task_rows(rng, employee, today):
+    """Return unsaved tasks of ``employee``, due from three months ago onwards."""
+    tasks = []
+    for _ in range(TASKS_PER_EMPLOYEE):
+        due_date = today + datetime.timedelta(days=rng.randint(-90, 60))
+        # Most past tasks are done; some of them are overdue instead.
+        done = rng.random() < (0.8 if due_date < today else 0.1)
+        tasks.append(
+            Task(
+                title=f"{rng.choice(VERBS)} {rng.choice(NOUNS)}",
+                description=_sentence(rng, PHRASES),
+                assigned_to=employee,
+                due_date=due_date,
+                completed=done,
+                priority=rng.choices(
+                    list(PRIORITY_WEIGHTS), list(PRIORITY_WEIGHTS.values())
+                )[0],
+            )
+        )
+    return tasks
+
+
+def _log_rows(rng, employee, tasks, now):
+    """Return unsaved time logs of ``employee`` against ``tasks``."""
+    logs = []
+    for _ in range(LOGS_PER_EMPLOYEE):
+        start = now - datetime.timedelta(minutes=rng.randint(60, 90 * 24 * 60))
+        duration = datetime.timedelta(minutes=rng.randint(15, 240))
+        logs.append(
+            TimeLog(
+                task=rng.choice(tasks),
+                employee=employee,
+                start_time=start,
+                end_time=start + duration,
+                duration=duration,
+            )
+        )
+    return logs
+
+
+def _goal_rows(rng, employee, today):
+    """Return unsaved goals of ``employee``."""
+    return [
+        Goal(
+            employee=employee,
+            title=f"{rng.choice(VERBS)} the {rng.choice(NOUNS)}",
+            description=_sentence(rng, PHRASES),
+            target_date=today + datetime.timedelta(days=rng.randint(-60, 180)),
+            achieved=rng.random() < 0.3,
+        )
+        for _ in range(GOALS_PER_EMPLOYEE)
+    ]
+
+
+def _journal_rows(rng, employee, today):
+    """Return unsaved journal entries of ``employee``, one per day."""
+    days = rng.sample(range(365), JOURNALS_PER_EMPLOYEE)
+    return [
+        JournalEntry(
+            employee=employee,
+            entry_date=today - datetime.timedelta(days=day),
+            content=_sentence(rng, PHRASES),
+        )
+        for day in days
+    ]
+
+
+def _create_chunk(rng, numbers, context, seeded):
+    """Insert the employees numbered ``numbers`` with all their records."""
+    now = context[-1]
+    today = now.date()
+    users, employees = _employee_rows(rng, numbers, context)
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        Employee.objects.bulk_create(employees, batch_size=BATCH_SIZE)
+
+        tasks = {
+            employee.pk: _task_rows(rng, employee, today) for employee in employees
+        }
+        Task.objects.bulk_create(
+            [task for rows in tasks.values() for task in rows], batch_size=BATCH_SIZE
+        )
+        records = {TimeLog: [], Goal: [], JournalEntry: []}
+        for employee in employees:
+            records[TimeLog] += _log_rows(rng, employee, tasks[employee.pk], now)
+            records[Goal] += _goal_rows(rng, employee, today)
+            records[JournalEntry] += _journal_rows(rng, employee, today)
+        for model, rows in records.items():
+            model.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+    seeded.add(User, len(users))
+    seeded.add(Employee, len(employees))
+    seeded.add(Task, sum(len(rows) for rows in tasks.values()))
+    for model, rows in records.items():
+        seeded.add(model, len(rows))
+
+
+def rebuild_derived():
+    """Recompute the data that signals would have maintained."""
+    counters.rebuild()
+    workload.refresh()
+    rollups.backfill()
+    search.rebuild()
+    caching.bump("departments", "employees", "users")
+
+
+def seed(
+    rows=10_000,
+    *,
+    random_seed=0,
+    prefix="synthetic",
+    password=PASSWORD,
+    chunk_size=CHUNK_SIZE,
+    derived=True,
+):  # pylint: disable=too-many-arguments
+    """
+    Generate about ``rows`` rows, yielding :class:`Seeded` after each chunk.
+
+    Usernames start with ``prefix``; raises ``ValueError`` if users with
+    that prefix already exist. With ``derived=False`` the counters,
+    workloads, rollups and search index are left for the caller to rebuild
+    with :func:`rebuild_derived`.
+    """
+    if User.objects.filter(username__startswith=f"{prefix}-").exists():
+        raise ValueError(f"Users named '{prefix}-...' already exist.")
+    rng = random.Random(random_seed)
+    now = timezone.now().replace(microsecond=0)
+    password = make_password(password)
+    department_count, employee_count = plan(rows)
+    seeded = Seeded(employees=employee_count)
+
+    User.objects.create(username=f"{prefix}-admin", is_staff=True, password=password)
+    seeded.add(User, 1)
+    departments = _create_departments(rng, prefix, department_count, password, seeded)
+    context = (prefix, departments, password, now)
+    for start in range(0, employee_count, chunk_size):
+        numbers = range(start, min(start + chunk_size, employee_count))
+        _create_chunk(rng, numbers, context, seeded)
+        yield seeded
+    if derived:
+        rebuild_derived()
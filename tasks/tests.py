@@ -1,5 +0,0 @@
-"""
-Tests for the Tasks application.
-"""
-
-# Create your tests here.
@@ -0,0 +1,3 @@
+"""
+Tests for the Tasks application, one module per feature.
+"""
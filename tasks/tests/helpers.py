@@ -0,0 +1,23 @@
+"""
+Helpers shared by the test modules.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+
+from ..models import Employee
+
+
+def make_employee(username, department, **kwargs):
+    """Create a user together with its employee profile."""
+    user = User.objects.create_user(
+        username=username, password="password", first_name=username.title(), **kwargs
+    )
+    employee = Employee.objects.create(
+        user=user,
+        department=department,
+        date_joined=datetime.date(2024, 1, 1),
+        position="Engineer",
+    )
+    return employee
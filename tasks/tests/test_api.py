@@ -0,0 +1,137 @@
+"""
+Tests for the JSON API.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Department, Goal, Task, TimeLog
+from .helpers import make_employee
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        hod = User.objects.create_user(username="hod", password="x")
+        cls.department = Department.objects.create(name="Labs", hod=hod)
+        cls.other = Department.objects.create(name="Sales", hod=hod)
+        cls.employee = make_employee("worker", cls.department)
+        cls.seller = make_employee("seller", cls.other)
+        cls.tasks = [
+            Task.objects.create(
+                title=f"Task {number}",
+                description="",
+                assigned_to=cls.seller if number % 2 else cls.employee,
+                due_date=datetime.date(2024, 6, 1 + number),
+            )
+            for number in range(6)
+        ]
+
+    def get(self, user, url, **params):
+        """Request ``url`` as ``user``; return the response and its JSON."""
+        if user is not None:
+            self.client.force_login(user)
+        response = self.client.get(url, params)
+        return response, response.json() if response.status_code != 304 else None
+
+    def test_sparse_fields_include_and_pages(self):
+        """Pages hold the requested fields and the rows they reference."""
+        url = reverse("api-list", args=["tasks"])
+        self.client.force_login(self.admin)
+        with self.assertNumQueries(4):
+            response, body = self.get(
+                None, url, fields="title", include="assigned_to", limit=4
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            body["data"][0],
+            {
+                "id": self.tasks[0].pk,
+                "title": "Task 0",
+                "assigned_to": self.employee.pk,
+            },
+        )
+        self.assertEqual(
+            [row["username"] for row in body["included"]["employees"]],
+            ["worker", "seller"],
+        )
+        _, second = self.get(self.admin, url, fields="due_date", cursor=body["next"])
+        self.assertEqual(
+            second["data"],
+            [
+                {"id": task.pk, "due_date": task.due_date.isoformat()}
+                for task in self.tasks[4:]
+            ],
+        )
+        self.assertIsNone(second["next"])
+
+        response, body = self.get(self.admin, url, fields="secret")
+        self.assertEqual(response.status_code, 400)
+        response, body = self.get(self.admin, url, limit=1000)
+        self.assertEqual(response.status_code, 400)
+        response, body = self.get(self.admin, reverse("api-list", args=["nope"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_rows_follow_visibility(self):
+        """Employees see their own rows only."""
+        start = datetime.datetime(2024, 6, 1, 9, tzinfo=datetime.timezone.utc)
+        log = TimeLog.objects.create(
+            task=self.tasks[0],
+            employee=self.employee,
+            start_time=start,
+            end_time=start + datetime.timedelta(minutes=90),
+        )
+        _, body = self.get(
+            self.employee.user,
+            reverse("api-list", args=["timelogs"]),
+            include="task",
+        )
+        self.assertEqual(body["data"][0]["duration_seconds"], 5400)
+        self.assertEqual(body["included"]["tasks"][0]["title"], "Task 0")
+        _, body = self.get(self.employee.user, reverse("api-list", args=["tasks"]))
+        self.assertEqual(
+            [row["id"] for row in body["data"]],
+            [task.pk for task in self.tasks[::2]],
+        )
+        url = reverse("api-detail", args=["tasks", self.tasks[1].pk])
+        response, _ = self.get(self.employee.user, url)
+        self.assertEqual(response.status_code, 404)
+        url = reverse("api-detail", args=["timelogs", log.pk])
+        _, body = self.get(self.employee.user, url, fields="task")
+        self.assertEqual(body["data"], {"id": log.pk, "task": self.tasks[0].pk})
+
+        self.client.logout()
+        response = self.client.get(reverse("api-list", args=["goals"]))
+        self.assertEqual(response.status_code, 401)
+
+    def test_conditional_requests(self):
+        """Unchanged resources answer 304 until one of their rows changes."""
+        url = reverse("api-list", args=["tasks"])
+        response, _ = self.get(self.admin, url)
+        etag = response["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        other = self.client.get(
+            reverse("api-list", args=["goals"]), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(other.status_code, 200)
+
+        Goal.objects.create(
+            employee=self.employee,
+            title="Learn",
+            description="",
+            target_date=datetime.date(2024, 7, 1),
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.tasks[0].title = "Renamed"
+        self.tasks[0].save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"][0]["title"], "Renamed")
@@ -0,0 +1,176 @@
+"""
+Tests for archiving.
+"""
+
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import archive, counters, jobs, outbox, timers
+from ..models import (
+    ArchivedTask,
+    ArchivedTimeLog,
+    Counter,
+    DailyTimeRollup,
+    Department,
+    Employee,
+    Job,
+    Task,
+    TimeLog,
+)
+from .helpers import make_employee
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        hod = User.objects.create_user(username="hod", password="x")
+        cls.department = Department.objects.create(name="Labs", hod=hod)
+        cls.other = Department.objects.create(name="Sales", hod=hod)
+        cls.employee = make_employee("worker", cls.department)
+        cls.seller = make_employee("seller", cls.other)
+
+    def add_task(self, due_date, completed=False, employee=None):
+        """Create a task last updated on its due date."""
+        task = Task.objects.create(
+            title=f"Task {due_date}",
+            description="",
+            assigned_to=employee or self.employee,
+            due_date=due_date,
+            completed=completed,
+        )
+        Task.objects.filter(pk=task.pk).update(updated_at=due_date)
+        return task
+
+    def add_log(self, task, start, hours=1):
+        """Log ``hours`` of work on ``task`` from ``start``."""
+        return TimeLog.objects.create(
+            task=task,
+            employee=task.assigned_to,
+            start_time=start,
+            end_time=start + datetime.timedelta(hours=hours),
+        )
+
+    def test_sweep_moves_rows_and_keeps_totals(self):
+        """Old rows move to the archive without changing counters or rollups."""
+        now = timezone.now()
+        done = self.add_task(datetime.date(2020, 1, 10), completed=True)
+        done_log = self.add_log(done, now - datetime.timedelta(days=200))
+        open_task = self.add_task(datetime.date(2020, 1, 10))
+        old_log = self.add_log(open_task, now - datetime.timedelta(days=400), hours=2)
+        recent_log = self.add_log(open_task, now - datetime.timedelta(days=1))
+        recent = self.add_task(timezone.localdate(), completed=True)
+        stored = counters.get_counters(self.department.pk)
+        rollup_rows = list(DailyTimeRollup.objects.values_list("task", "seconds"))
+        since = outbox.latest()
+
+        out = StringIO()
+        call_command("archive_rows", batch_size=1, stdout=out)
+        self.assertIn("Archived 1 tasks and 2 time logs.", out.getvalue())
+        self.assertEqual(list(ArchivedTask.objects.values_list("pk")), [(done.pk,)])
+        self.assertEqual(
+            set(ArchivedTimeLog.objects.values_list("pk", "task_id")),
+            {(done_log.pk, done.pk), (old_log.pk, open_task.pk)},
+        )
+        self.assertEqual(
+            set(Task.objects.values_list("pk", flat=True)), {open_task.pk, recent.pk}
+        )
+        self.assertEqual(list(TimeLog.objects.values_list("pk")), [(recent_log.pk,)])
+        self.assertEqual(list(outbox.changes(since)), [])
+
+        self.assertEqual(counters.get_counters(self.department.pk), stored)
+        computed = counters.compute([self.department.pk])
+        self.assertEqual(
+            {name: computed[(self.department.pk, name)] for name in stored}, stored
+        )
+        call_command("backfill_rollups", stdout=StringIO())
+        self.assertCountEqual(
+            DailyTimeRollup.objects.values_list("task", "seconds"), rollup_rows
+        )
+        self.assertEqual(archive.sweep(), {"tasks": 0, "time_logs": 0})
+
+    def test_running_timer_keeps_task(self):
+        """Tasks with a running timer stay in the hot table."""
+        task = self.add_task(datetime.date(2020, 1, 10), completed=True)
+        timers.start(self.employee, task)
+        self.assertEqual(archive.archive_tasks(), (0, 0))
+
+    def test_history_reads_both_tiers(self):
+        """The history pages merge hot and archived rows, latest first."""
+        start = datetime.datetime(2020, 1, 1, 9, tzinfo=datetime.timezone.utc)
+        tasks = []
+        for day in range(12):
+            task = self.add_task(datetime.date(2020, 1, 1 + day), completed=True)
+            self.add_log(task, start + datetime.timedelta(days=day))
+            tasks.append(task)
+        self.add_task(datetime.date(2020, 2, 1))
+        archive.archive_tasks(cutoff=datetime.date(2020, 1, 7))
+        self.assertEqual(ArchivedTask.objects.count(), 6)
+
+        self.client.force_login(self.employee.user)
+        response = self.client.get(reverse("history"))
+        rows = response.context["rows"]
+        self.assertEqual(
+            [row["id"] for row in rows], [task.pk for task in reversed(tasks)][:10]
+        )
+        self.assertEqual([row["archived"] for row in rows][5:7], [False, True])
+        response = self.client.get(
+            reverse("history"), {"before": response.context["next_cursor"]}
+        )
+        self.assertEqual(
+            [row["id"] for row in response.context["rows"]],
+            [tasks[1].pk, tasks[0].pk],
+        )
+        self.assertIsNone(response.context["next_cursor"])
+
+        response = self.client.get(reverse("history"), {"show": "logs"})
+        self.assertContains(response, "Task 2020-01-12")
+        self.assertContains(response, "Task 2020-01-03")
+        response = self.client.get(reverse("history"), {"before": "broken"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_department_deleted_in_background(self):
+        """Deleting a department hides it and a job removes its rows in batches."""
+        task = self.add_task(datetime.date(2020, 1, 10), completed=True)
+        self.add_log(task, timezone.now() - datetime.timedelta(days=200))
+        open_task = self.add_task(datetime.date(2020, 2, 1))
+        self.add_log(open_task, timezone.now() - datetime.timedelta(days=1))
+        self.add_task(datetime.date(2020, 2, 1), employee=self.seller)
+        archive.archive_tasks()
+
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("delete-department", args=[self.department.pk])
+        )
+        self.assertRedirects(response, reverse("department-list"))
+        self.assertTrue(Employee.objects.filter(pk=self.employee.pk).exists())
+        response = self.client.get(reverse("department-list"))
+        self.assertNotContains(response, "Labs")
+        job = Job.objects.get(kind="department_delete")
+        self.assertEqual(job.payload, {"department_id": self.department.pk})
+
+        since = outbox.latest()
+        self.assertTrue(jobs.run_next("w1"))
+        self.assertFalse(Department.objects.filter(pk=self.department.pk).exists())
+        self.assertFalse(Employee.objects.filter(department=self.department).exists())
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.assertFalse(ArchivedTimeLog.objects.exists())
+        self.assertEqual(Task.objects.get().assigned_to, self.seller)
+        deleted = {
+            (event["model"], event["id"])
+            for event in outbox.changes(since)
+            if event["action"] == "delete"
+        }
+        self.assertIn(("task", task.pk), deleted)
+        self.assertIn(("task", open_task.pk), deleted)
+        stored = {(c.scope_id, c.name): c.value for c in Counter.objects.all()}
+        for key, value in counters.compute().items():
+            self.assertEqual(stored.get(key, 0), value, key)
@@ -0,0 +1,75 @@
+"""
+Tests for the async dashboard views.
+"""
+
+import datetime
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Department, Goal, JournalEntry, Task
+from .helpers import make_employee
+
+
+@override_settings(FRAGMENT_CACHE_TIMEOUT=0)
+class AsyncDashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hod = User.objects.create_user(username="hod", password="x")
+        department = Department.objects.create(name="Labs", hod=hod)
+        cls.employee = make_employee("worker", department)
+        for index in range(12):
+            Task.objects.create(
+                title=f"Task {index:02}",
+                description="",
+                assigned_to=cls.employee,
+                due_date=datetime.date(2024, 6, 1) + datetime.timedelta(days=index),
+            )
+        Goal.objects.create(
+            employee=cls.employee,
+            title="Ship it",
+            description="",
+            target_date=datetime.date(2024, 6, 1),
+        )
+        JournalEntry.objects.create(
+            employee=cls.employee, entry_date=datetime.date(2024, 6, 1), content="Notes"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_matches_sync_dashboard(self):
+        """The async dashboard renders the same page as the sync one."""
+        await sync_to_async(self.async_client.force_login)(self.employee.user)
+        response = await self.async_client.get(reverse("async-employee-dashboard"))
+        self.assertEqual(response.status_code, 200)
+        for text in ("Task 00", "Ship it", "Notes", "?cursor="):
+            self.assertContains(response, text)
+        self.assertNotContains(response, "Task 10")
+
+        await sync_to_async(self.client.force_login)(self.employee.user)
+        expected = await sync_to_async(self.client.get)(reverse("employee-dashboard"))
+        self.assertEqual(response.content, expected.content)
+
+    async def test_not_modified(self):
+        """A matching ETag is answered with 304 without rendering."""
+        await sync_to_async(self.async_client.force_login)(self.employee.user)
+        url = reverse("async-employee-dashboard")
+        etag = (await self.async_client.get(url))["ETag"]
+        response = await self.async_client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_goal_dashboard(self):
+        """The async goal dashboard lists the employee's goals."""
+        await sync_to_async(self.async_client.force_login)(self.employee.user)
+        response = await self.async_client.get(reverse("async-goal-dashboard"))
+        self.assertContains(response, "Ship it")
+
+    async def test_login_required(self):
+        """Anonymous visitors are sent to the login page."""
+        response = await self.async_client.get(reverse("async-employee-dashboard"))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("/accounts/login/", response["Location"])
@@ -0,0 +1,68 @@
+"""
+Tests for the view benchmark suite.
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from .. import benchmark, synthetic
+
+
+class BenchmarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for _ in synthetic.seed(rows=synthetic.ROWS_PER_EMPLOYEE * 2):
+            pass
+
+    def test_run(self):
+        """Every view answers and reports its queries and latency."""
+        results = benchmark.run(requests=3, warmup=1)
+        self.assertEqual(set(results["views"]), {v.name for v in benchmark.VIEWS})
+        for result in results["views"].values():
+            self.assertEqual(result["errors"], 0, result["url"])
+            self.assertGreater(result["queries"], 0)
+            self.assertIsNotNone(result["latency_ms"]["p95"])
+        self.assertEqual(results["environment"]["rows"]["Employee"], 2)
+        json.dumps(results)
+
+    def test_compare(self):
+        """Extra queries and slower percentiles beyond the tolerance regress."""
+        view = {"queries": 3, "latency_ms": {"p50": 10.0, "p95": 20.0}}
+        baseline = {"views": {"home": view, "gone": view}}
+        current = {
+            "views": {
+                "home": {"queries": 4, "latency_ms": {"p50": 11.0, "p95": 30.0}},
+                "new": view,
+            }
+        }
+        self.assertEqual(
+            benchmark.compare(baseline, current, tolerance=0.2),
+            [("home", "queries", 3, 4), ("home", "p95", 20.0, 30.0)],
+        )
+        self.assertEqual(benchmark.compare(baseline, baseline), [])
+
+    def test_command(self):
+        """The command saves a baseline and fails on regressions against it."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            options = {"views": ["home"], "requests": 2, "warmup": 0}
+            call_command("benchmark", output=path, stdout=StringIO(), **options)
+            with open(path, encoding="utf-8") as stream:
+                saved = json.load(stream)
+            saved["views"]["home"]["queries"] = 0
+            with open(path, "w", encoding="utf-8") as stream:
+                json.dump(saved, stream)
+            with self.assertRaisesMessage(CommandError, "1 regressions"):
+                call_command(
+                    "benchmark",
+                    baseline=path,
+                    tolerance=1000,
+                    fail_on_regression=True,
+                    stdout=StringIO(),
+                    **options,
+                )
@@ -0,0 +1,122 @@
+"""
+Tests for bulk task imports.
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import bulk, counters
+from ..models import Department, Task
+from .helpers import make_employee
+
+
+class BulkTaskImportTests(TestCase):
+    """Bulk imports validate every row up front and insert in batches."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        cls.department = Department.objects.create(name="R&D", hod=cls.admin)
+        make_employee("worker", cls.department)
+        make_employee("other", cls.department)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def rows(self, count):
+        """Return ``count`` valid task rows."""
+        return [
+            {
+                "title": f"Task {index}",
+                "description": "Planned work",
+                "assigned_to": "worker" if index % 2 else "other",
+                "due_date": "2030-01-01",
+                "priority": "High",
+                "department": "R&D",
+            }
+            for index in range(count)
+        ]
+
+    def post_rows(self, rows):
+        """Post ``rows`` as JSON and return the response and query count."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("bulk-create-tasks"),
+                json.dumps(rows),
+                content_type="application/json",
+            )
+        return response, len(queries)
+
+    def test_json_import(self):
+        """Valid JSON rows are created with a query count independent of size."""
+        response, small = self.post_rows(self.rows(10))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"created": 10, "errors": []})
+        response, large = self.post_rows(self.rows(60))
+        self.assertEqual(response.json()["created"], 60)
+        self.assertEqual(small, large)
+        self.assertEqual(counters.get_counters()[counters.OPEN_TASKS], 70)
+
+    def test_errors_are_reported_per_row(self):
+        """Invalid rows are reported and nothing is inserted."""
+        rows = self.rows(3)
+        rows[1]["assigned_to"] = "ghost"
+        rows[2]["priority"] = "Urgent"
+        response, _ = self.post_rows(rows)
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual([error["row"] for error in errors], [2, 3])
+        self.assertIn("assigned_to", errors[0]["errors"])
+        self.assertIn("priority", errors[1]["errors"])
+        self.assertFalse(Task.objects.exists())
+
+    def test_malformed_json(self):
+        """Non-object rows and empty uploads are rejected as unparseable."""
+        response, _ = self.post_rows([self.rows(1)[0], ["Ship", "worker"]])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {"error": "Could not parse json: Row 2 is not an object."}
+        )
+        response, _ = self.post_rows([])
+        self.assertEqual(
+            response.json(), {"error": "Could not parse json: No rows to import."}
+        )
+        with self.assertRaisesMessage(ValueError, "Row 1 is not an object."):
+            bulk.read_rows(StringIO("7\n"), "json")
+        self.assertFalse(Task.objects.exists())
+
+    def test_partial_csv_upload(self):
+        """With ``partial`` the valid rows of a CSV upload are kept."""
+        upload = StringIO(
+            "title,description,assigned_to,due_date\n"
+            "Ship,Release,worker,2030-01-01\n"
+            "Oops,Release,worker,not-a-date\n"
+        )
+        upload.name = "tasks.csv"
+        response = self.client.post(
+            reverse("bulk-create-tasks") + "?partial=1", {"file": upload}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["created"], 1)
+        self.assertEqual(response.json()["errors"][0]["row"], 2)
+
+    def test_command(self):
+        """The management command imports a file in batches."""
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as out:
+            json.dump(self.rows(25), out)
+        self.addCleanup(os.remove, out.name)
+        stdout = StringIO()
+        call_command("import_tasks", out.name, batch_size=10, stdout=stdout)
+        self.assertIn("Created 25 tasks", stdout.getvalue())
+        self.assertEqual(Task.objects.count(), 25)
@@ -0,0 +1,65 @@
+"""
+Tests for listing fragment caching and conditional requests.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Department, Task
+from .helpers import make_employee
+
+
+class ViewCachingTests(TestCase):
+    """Listings are served from versioned caches and honour validators."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        cls.department = Department.objects.create(name="Labs", hod=cls.admin)
+        cls.employee = make_employee("worker", cls.department)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def test_fragment_is_reused_until_data_changes(self):
+        """A cached listing skips its queries until a save bumps the version."""
+        url = reverse("employee-list")
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            self.assertContains(self.client.get(url), "Department: Labs")
+        self.department.name = "Research"
+        self.department.save()
+        self.assertContains(self.client.get(url), "Department: Research")
+
+    def test_not_modified(self):
+        """Repeating a request with its ETag yields 304 until data changes."""
+        url = reverse("department-list")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Department.objects.create(name="Ops", hod=self.admin)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response)
+
+    def test_dashboard_is_per_employee(self):
+        """Only the assignee's dashboard is invalidated by a task change."""
+        self.client.force_login(self.employee.user)
+        url = reverse("employee-dashboard")
+        etag = self.client.get(url)["ETag"]
+        Task.objects.create(
+            title="Fresh",
+            description="",
+            assigned_to=self.employee,
+            due_date=datetime.date(2030, 1, 1),
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, "Fresh")
@@ -0,0 +1,98 @@
+"""
+Tests for the incrementally maintained dashboard counters.
+"""
+
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from .. import counters
+from ..models import Counter, Department, JournalEntry, Task, TimeLog
+from .helpers import make_employee
+
+
+class CounterTests(TestCase):
+    """Signal-maintained counters always match a full recomputation."""
+
+    def setUp(self):
+        hod = User.objects.create_user(username="hod", password="x")
+        self.sales = Department.objects.create(name="Sales", hod=hod)
+        self.support = Department.objects.create(name="Support", hod=hod)
+        self.employee = make_employee("worker", self.sales)
+
+    def assert_in_sync(self):
+        """Stored counters equal the values computed from the source tables."""
+        stored = {(c.scope_id, c.name): c.value for c in Counter.objects.all()}
+        for key, value in counters.compute().items():
+            self.assertEqual(stored.get(key, 0), value, key)
+
+    def create_task(self, **kwargs):
+        """Create a task assigned to the test employee."""
+        fields = {"due_date": datetime.date.today(), "description": ""}
+        fields.update(kwargs)
+        return Task.objects.create(title="Task", assigned_to=self.employee, **fields)
+
+    def test_task_lifecycle(self):
+        """Creating, completing and deleting tasks adjusts every scope."""
+        task = self.create_task()
+        overdue = self.create_task(due_date=datetime.date(2000, 1, 1))
+        org = counters.get_counters()
+        self.assertEqual(org[counters.OPEN_TASKS], 2)
+        self.assertEqual(org[counters.OVERDUE_TASKS], 1)
+        self.assertEqual(counters.get_counters(self.sales.pk)[counters.TASKS], 2)
+
+        overdue.completed = True
+        overdue.save()
+        self.assertEqual(counters.get_counters()[counters.OVERDUE_TASKS], 0)
+        task.delete()
+        self.assertEqual(counters.get_counters()[counters.TASKS], 1)
+        self.assert_in_sync()
+
+    def test_time_and_journal(self):
+        """Journal entries and logged time are summed per department."""
+        task = self.create_task()
+        start = datetime.datetime(2024, 6, 1, 9, tzinfo=datetime.timezone.utc)
+        TimeLog.objects.create(
+            task=task,
+            employee=self.employee,
+            start_time=start,
+            end_time=start + datetime.timedelta(hours=2),
+            duration=datetime.timedelta(hours=2),
+        )
+        JournalEntry.objects.create(
+            employee=self.employee, entry_date=start.date(), content="Notes"
+        )
+        scoped = counters.get_counters(self.sales.pk)
+        self.assertEqual(scoped[counters.SECONDS_LOGGED], 7200)
+        self.assertEqual(scoped[counters.JOURNAL_ENTRIES], 1)
+        self.assert_in_sync()
+
+    def test_employee_transfer(self):
+        """Moving an employee moves their tasks to the new department."""
+        self.create_task()
+        self.employee.department = self.support
+        self.employee.save()
+        self.assertEqual(counters.get_counters(self.sales.pk)[counters.TASKS], 0)
+        self.assertEqual(counters.get_counters(self.support.pk)[counters.TASKS], 1)
+        self.assert_in_sync()
+
+    def test_department_cascade(self):
+        """Deleting a department withdraws everything it cascaded over."""
+        self.create_task()
+        sales_id = self.sales.pk
+        self.sales.delete()
+        self.assertFalse(Counter.objects.filter(scope_id=sales_id).exists())
+        self.assertEqual(counters.get_counters()[counters.DEPARTMENTS], 1)
+        self.assert_in_sync()
+
+    def test_rebuild_command_repairs_drift(self):
+        """Writes that bypass signals are corrected by the rebuild command."""
+        self.create_task()
+        Task.objects.update(completed=True)
+        out = StringIO()
+        call_command("rebuild_counters", stdout=out)
+        self.assertIn("open_tasks: 1 -> 0", out.getvalue())
+        self.assert_in_sync()
@@ -0,0 +1,115 @@
+"""
+Tests for streaming exports.
+"""
+
+import datetime
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import archive
+from ..models import Department, Task, TimeLog
+from .helpers import make_employee
+
+
+class ExportTests(TestCase):
+    """Exports stream filtered rows as CSV or JSON Lines."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        cls.department = Department.objects.create(name="R&D", hod=cls.admin)
+        cls.other = Department.objects.create(name="Ops", hod=cls.admin)
+        cls.employee = make_employee("worker", cls.department)
+        make_employee("outsider", cls.other)
+        for day in (1, 15):
+            task = Task.objects.create(
+                title=f"Task {day}",
+                description="",
+                assigned_to=cls.employee,
+                due_date=datetime.date(2024, 6, day),
+            )
+        start = datetime.datetime(2024, 6, 1, 9, tzinfo=datetime.timezone.utc)
+        TimeLog.objects.create(
+            task=task,
+            employee=cls.employee,
+            start_time=start,
+            end_time=start + datetime.timedelta(minutes=90),
+            duration=datetime.timedelta(minutes=90),
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_csv_stream(self):
+        """Task exports are streamed with a header row and filtered by date."""
+        response = self.client.get(
+            reverse("export", args=["tasks"]), {"until": "2024-06-10"}
+        )
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["id", "title", "assigned_to"])
+        self.assertEqual(len(lines), 2)
+        self.assertIn("Task 1,worker,R&D,2024-06-01", lines[1])
+
+    def test_jsonl_stream(self):
+        """Time logs are exported as JSON Lines with durations in seconds."""
+        response = self.client.get(
+            reverse("export", args=["timelogs"]),
+            {"format": "jsonl", "department": self.department.pk},
+        )
+        records = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["duration_seconds"], 5400)
+
+    def test_archived_rows(self):
+        """Archived tasks and time logs are exported in id order."""
+        Task.objects.filter(title="Task 1").update(completed=True)
+        tomorrow = timezone.localdate() + datetime.timedelta(days=1)
+        self.assertEqual(archive.archive_tasks(cutoff=tomorrow), (1, 0))
+        self.assertEqual(archive.archive_time_logs(cutoff=timezone.now()), 1)
+        response = self.client.get(reverse("export", args=["tasks"]))
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [line.split(",")[1] for line in lines[1:]], ["Task 1", "Task 15"]
+        )
+        self.assertIn("2024-06-01,True", lines[1])
+        response = self.client.get(
+            reverse("export", args=["timelogs"]),
+            {"format": "jsonl", "department": self.department.pk},
+        )
+        records = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(
+            [(record["task"], record["duration_seconds"]) for record in records],
+            [("Task 15", 5400)],
+        )
+
+    def test_bad_filters(self):
+        """Unknown exports and malformed filters are rejected."""
+        self.assertEqual(self.client.get("/export/payroll/").status_code, 404)
+        response = self.client.get(reverse("export", args=["goals"]), {"since": "x"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_gzip_command(self):
+        """The command writes compressed output straight to disk."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tasks.csv.gz")
+            call_command("export_tasks", "tasks", output=path, stderr=StringIO())
+            with gzip.open(path, "rt") as stream:
+                self.assertEqual(len(stream.read().splitlines()), 3)
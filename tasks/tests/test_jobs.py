@@ -0,0 +1,161 @@
+"""
+Tests for the job queue.
+"""
+
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .. import counters, jobs, reminders
+from ..models import Counter, Department, Goal, Job, Task
+from .helpers import make_employee
+
+
+def failing_job(**_payload):
+    """Job handler that always fails."""
+    raise RuntimeError("boom")
+
+
+class InlineThread:
+    """Stand-in for ``threading.Thread`` that runs on the test's connection."""
+
+    def __init__(self, target, args):
+        self.target, self.args = target, args
+
+    def start(self):
+        """Run the target immediately."""
+        self.target(*self.args)
+
+    def is_alive(self):
+        """The target has always finished."""
+        return False
+
+    def join(self, timeout=None):
+        """Nothing to wait for."""
+
+
+@override_settings(JOB_HANDLERS={"failing": "tasks.tests.test_jobs.failing_job"})
+class JobQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hod = User.objects.create_user(username="hod", password="x")
+        cls.department = Department.objects.create(name="Labs", hod=hod)
+        cls.employee = make_employee("worker", cls.department, email="w@example.com")
+        cls.idle = make_employee("idle", cls.department, email="i@example.com")
+        cls.today = timezone.localdate()
+        for days in (-3, -1, 0, 1, 5):
+            Task.objects.create(
+                title=f"Due {days}",
+                description="",
+                assigned_to=cls.employee,
+                due_date=cls.today + datetime.timedelta(days=days),
+            )
+        Goal.objects.create(
+            employee=cls.employee,
+            title="Certify",
+            description="",
+            target_date=cls.today,
+        )
+
+    def test_claim_runs_jobs_once(self):
+        """A claimed job is locked, run and marked done."""
+        job = jobs.enqueue("overdue_sweep")
+        self.assertTrue(jobs.run_next("w1"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), ("done", 1, "w1"))
+        self.assertIsNone(jobs.run_next("w1"))
+
+    def test_keyed_enqueue_is_idempotent(self):
+        """Scheduling the same day twice queues each daily job once."""
+        first = jobs.schedule_daily(self.today)
+        second = jobs.schedule_daily(self.today)
+        self.assertEqual([job.pk for job in first], [job.pk for job in second])
+        self.assertEqual(Job.objects.count(), 4)
+
+    def test_failures_back_off_then_fail(self):
+        """Failed attempts are retried later and finally marked failed."""
+        job = jobs.enqueue("failing", max_attempts=2)
+        self.assertFalse(jobs.run_next("w1"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("pending", 1))
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("RuntimeError: boom", job.last_error)
+        self.assertIsNone(jobs.run_next("w1"))
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        self.assertFalse(jobs.run_next("w1"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 2))
+        self.assertEqual(jobs.backoff(1), datetime.timedelta(seconds=30))
+        self.assertEqual(jobs.backoff(20), datetime.timedelta(hours=1))
+
+    def test_abandoned_jobs_are_reclaimed(self):
+        """A job whose worker died is claimed again after the lock timeout."""
+        job = jobs.enqueue("overdue_sweep")
+        self.assertEqual(jobs.claim("dead").pk, job.pk)
+        self.assertIsNone(jobs.claim("w2"))
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        self.assertEqual(jobs.claim("w2").locked_by, "w2")
+
+    def test_abandoned_jobs_fail_after_the_last_attempt(self):
+        """An abandoned job with no attempts left is failed, not claimed again."""
+        job = jobs.enqueue("overdue_sweep", max_attempts=1)
+        self.assertEqual(jobs.claim("dead").pk, job.pk)
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        self.assertIsNone(jobs.claim("w2"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 1))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_overdue_sweep_recounts_in_chunks(self):
+        """The sweep fixes overdue counters that went stale with time."""
+        Counter.objects.filter(name=counters.OVERDUE_TASKS).update(value=0)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(reminders.overdue_sweep(chunk_size=1), 2)
+        selects = [q for q in queries if "ORDER BY" in q["sql"]]
+        self.assertEqual(len(selects), 3)
+        self.assertEqual(
+            counters.get_counters(self.department.pk)[counters.OVERDUE_TASKS], 2
+        )
+
+    def test_reminder_digest(self):
+        """Each employee with deadlines gets one digest; chunks chain as jobs."""
+        sent = reminders.reminder_digest(self.today.isoformat(), chunk_size=1)
+        self.assertEqual(sent, 1)
+        self.assertEqual(len(mail.outbox), 1)
+        body = mail.outbox[0].body
+        self.assertEqual(mail.outbox[0].to, ["w@example.com"])
+        for title in ("Due -3", "Due 0", "Due 1", "Certify"):
+            self.assertIn(title, body)
+        self.assertNotIn("Due 5", body)
+        self.assertIn("OVERDUE", body)
+
+        follow_up = Job.objects.get(kind="reminder_digest")
+        self.assertEqual(follow_up.payload["after"], self.employee.pk)
+        self.assertTrue(jobs.run_next("w1"))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_run_workers_command(self):
+        """``run_workers --once`` drains the queue and reports the totals."""
+        jobs.enqueue("overdue_sweep")
+        jobs.enqueue("failing", max_attempts=1)
+        out = StringIO()
+        with mock.patch("tasks.jobs.threading.Thread", InlineThread), mock.patch(
+            "tasks.jobs.connection.close"
+        ):
+            call_command(
+                "run_workers", "--once", "--concurrency=1", "--no-schedule", stdout=out
+            )
+        self.assertIn("1 jobs succeeded, 1 failed.", out.getvalue())
@@ -0,0 +1,41 @@
+"""
+Tests for the load-test harness.
+"""
+
+import json
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import LiveServerTestCase
+
+from ..models import Department
+from .helpers import make_employee
+
+
+class LoadTestCommandTests(LiveServerTestCase):
+    def test_reports_each_path(self):
+        """The harness logs in and reports throughput per path."""
+        hod = User.objects.create_user(username="hod", password="x")
+        make_employee("worker", Department.objects.create(name="Labs", hod=hod))
+        out = StringIO()
+        call_command(
+            "loadtest",
+            self.live_server_url,
+            "--path=/employee_dashboard/",
+            "--path=/async/employee_dashboard/",
+            "--requests=4",
+            "--concurrency=2",
+            "--username=worker",
+            "--password=password",
+            "--json",
+            stdout=out,
+        )
+        results = json.loads(out.getvalue())
+        self.assertEqual(
+            [result["path"] for result in results],
+            ["/employee_dashboard/", "/async/employee_dashboard/"],
+        )
+        for result in results:
+            self.assertEqual(result["requests"], 4)
+            self.assertEqual(result["errors"], 0)
@@ -0,0 +1,93 @@
+"""
+Tests for request metrics.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import metrics
+from ..models import Department
+from .helpers import make_employee
+
+
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        cls.employee = make_employee(
+            "worker", Department.objects.create(name="Labs", hod=cls.admin)
+        )
+
+    def setUp(self):
+        cache.clear()
+        metrics.REGISTRY.clear()
+
+    def scrape(self, **headers):
+        """Return the /metrics response."""
+        return self.client.get(reverse("metrics"), **headers)
+
+    def test_records_per_view(self):
+        """Wall time, queries, render time and size are recorded per view."""
+        self.client.force_login(self.employee.user)
+        self.client.get(reverse("employee-dashboard"))
+        self.client.get(reverse("employee-dashboard"))
+        histogram = metrics.REGISTRY.histograms
+        self.assertEqual(histogram[("duration", "employee-dashboard")].count, 2)
+        self.assertGreater(histogram[("queries", "employee-dashboard")].sum, 0)
+        self.assertGreater(histogram[("render_time", "employee-dashboard")].sum, 0)
+        self.assertGreater(histogram[("size", "employee-dashboard")].sum, 0)
+
+        self.client.force_login(self.admin)
+        body = self.scrape().content.decode()
+        self.assertIn("# TYPE tasks_request_duration_seconds histogram", body)
+        self.assertIn(
+            'tasks_request_duration_seconds_count{view="employee-dashboard"} 2', body
+        )
+        self.assertIn(
+            'tasks_request_db_queries_bucket{view="employee-dashboard",le="+Inf"} 2',
+            body,
+        )
+        self.assertIn(
+            'tasks_http_responses_total{view="employee-dashboard",status="200"} 2',
+            body,
+        )
+
+    async def test_async_views_are_measured(self):
+        """Queries run through the async ORM are attributed to the request."""
+        await sync_to_async(self.async_client.force_login)(self.employee.user)
+        await self.async_client.get(reverse("async-employee-dashboard"))
+        queries = metrics.REGISTRY.histograms[("queries", "async-employee-dashboard")]
+        self.assertGreater(queries.sum, 0)
+
+    def test_access(self):
+        """Metrics need staff or the configured bearer token."""
+        self.assertEqual(self.scrape().status_code, 403)
+        with self.settings(METRICS_TOKEN="s3cret"):
+            self.assertEqual(self.scrape().status_code, 403)
+            response = self.scrape(HTTP_AUTHORIZATION="Bearer s3cret")
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response["Content-Type"].startswith("text/plain"))
+
+    @override_settings(SLOW_REQUEST_THRESHOLD=0)
+    def test_slow_requests_log_worst_sql(self):
+        """Slow requests are logged with their slowest statement."""
+        self.client.force_login(self.employee.user)
+        with self.assertLogs("tasks.metrics", "WARNING") as logs:
+            self.client.get(reverse("employee-dashboard"))
+        self.assertIn("Slow request to employee-dashboard", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+    def test_histogram_buckets(self):
+        """Buckets are cumulative and values above every bound go to +Inf."""
+        histogram = metrics.Histogram((1, 5))
+        for value in (0.5, 1, 3, 9):
+            histogram.observe(value)
+        self.assertEqual(
+            list(histogram.cumulative()), [(1, 2), (5, 3), (float("inf"), 4)]
+        )
+        self.assertEqual(histogram.sum, 13.5)
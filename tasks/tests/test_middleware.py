@@ -0,0 +1,52 @@
+"""
+Tests for the employee middleware.
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Department
+from .helpers import make_employee
+
+
+class EmployeeMiddlewareTests(TestCase):
+    """The employee profile is resolved once and cached between requests."""
+
+    @classmethod
+    def setUpTestData(cls):
+        hod = User.objects.create_user(username="hod", password="x")
+        cls.department = Department.objects.create(name="R&D", hod=hod)
+        cls.employee = make_employee("worker", cls.department)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.employee.user)
+
+    def test_profile_is_cached(self):
+        """Only the first request looks the profile up."""
+        response = self.client.get(reverse("goal-dashboard"))
+        self.assertEqual(response.wsgi_request.employee, self.employee)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("goal-dashboard"))
+        self.assertEqual(response.wsgi_request.employee.department.name, "R&D")
+
+    def test_saves_invalidate_profile(self):
+        """Saving the employee or their department refreshes the profile."""
+        self.client.get(reverse("goal-dashboard"))
+        self.employee.position = "Lead"
+        self.employee.save()
+        response = self.client.get(reverse("goal-dashboard"))
+        self.assertEqual(response.wsgi_request.employee.position, "Lead")
+
+        self.department.name = "Research"
+        self.department.save()
+        response = self.client.get(reverse("goal-dashboard"))
+        self.assertEqual(response.wsgi_request.employee.department.name, "Research")
+
+    def test_user_without_profile(self):
+        """Users without an employee profile get ``None``."""
+        self.client.force_login(User.objects.get(username="hod"))
+        response = self.client.get(reverse("goal-dashboard"))
+        self.assertIsNone(response.wsgi_request.employee)
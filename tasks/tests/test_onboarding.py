@@ -0,0 +1,128 @@
+"""
+Tests for bulk onboarding.
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import counters, jobs, onboarding
+from ..models import Department, Employee, Job, Workload
+
+
+class OnboardingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        cls.department = Department.objects.create(name="Labs", hod=cls.admin)
+
+    def rows(self, count, prefix="hire", **fields):
+        """Return ``count`` valid onboarding rows."""
+        return [
+            {
+                "username": f"{prefix}{index}",
+                "first_name": "New",
+                "last_name": f"Hire {index}",
+                "email": f"{prefix}{index}@example.com",
+                "department": "Labs",
+                "date_joined": "2024-09-01",
+                "position": "Engineer",
+                **fields,
+            }
+            for index in range(count)
+        ]
+
+    def onboard(self, rows, **options):
+        """Run the import to the end and return its last progress report."""
+        return list(onboarding.import_people(rows, **options))[-1]
+
+    def test_queries_do_not_grow_with_rows(self):
+        """Validation and inserts cost a fixed number of queries per chunk."""
+        counters.rebuild()
+        with CaptureQueriesContext(connection) as small:
+            self.onboard(self.rows(5, "a"), hash_passwords=False)
+        with CaptureQueriesContext(connection) as large:
+            self.onboard(self.rows(40, "b"), hash_passwords=False)
+        self.assertEqual(len(small), len(large))
+
+        employee = Employee.objects.select_related("user").get(user__username="b7")
+        self.assertEqual(employee.department, self.department)
+        self.assertFalse(employee.user.has_usable_password())
+        self.assertTrue(Workload.objects.filter(employee=employee).exists())
+        self.assertEqual(counters.get_counters()[counters.USERS], 46)
+        self.assertEqual(
+            counters.get_counters(self.department.pk)[counters.EMPLOYEES], 45
+        )
+
+    def test_invalid_rows_are_reported_per_chunk(self):
+        """Form validation errors are reported with their row numbers."""
+        rows = self.rows(4)
+        rows[0]["username"] = "admin"
+        rows[1]["department"] = "Nowhere"
+        rows[2]["date_joined"] = "soon"
+        rows.append(dict(rows[3]))
+        steps = list(onboarding.import_people(rows, chunk_size=2, workers=0))
+        self.assertEqual([step.processed for step in steps], [2, 4, 5])
+        self.assertEqual(steps[-1].created, 1)
+        errors = {
+            error["row"]: set(error["errors"])
+            for step in steps
+            for error in step.errors
+        }
+        self.assertEqual(
+            errors,
+            {1: {"username"}, 2: {"department"}, 3: {"date_joined"}, 5: {"username"}},
+        )
+
+    def test_passwords_hashed_in_process_pool(self):
+        """Passwords from the file are hashed by worker processes."""
+        self.onboard(self.rows(2, password="s3cret-pass"), workers=2)
+        user = User.objects.get(username="hire1")
+        self.assertTrue(user.check_password("s3cret-pass"))
+
+    def test_view_reports_progress_and_queues_invites(self):
+        """The upload view imports in the request and emails reset links later."""
+        text = "username,email,department,date_joined,position\n" + "".join(
+            f"new{i},new{i}@example.com,Labs,2024-09-01,Analyst\n" for i in range(3)
+        )
+        upload = StringIO(text)
+        upload.name = "hires.csv"
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse("onboard-people"), {"file": upload})
+        self.assertFalse(response.streaming)
+        self.assertEqual(User.objects.filter(username__startswith="new").count(), 3)
+        lines = [json.loads(line) for line in response.content.splitlines()]
+        self.assertEqual(lines[-1]["created"], 3)
+
+        self.assertTrue(jobs.run_next("w1"))
+        self.assertEqual(len(mail.outbox), 3)
+        link = mail.outbox[0].body.split("http://localhost:8000")[1].split()[0]
+        self.client.logout()
+        response = self.client.get(link)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("set-password", response["Location"])
+
+    def test_command(self):
+        """The management command imports a CSV file and reports progress."""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as out:
+            out.write("username,department,date_joined,position\n")
+            out.write("cmd1,Labs,2024-09-01,Analyst\ncmd2,Labs,bad,Analyst\n")
+        self.addCleanup(os.remove, out.name)
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "onboard_people", out.name, "--invite", stdout=stdout, stderr=stderr
+        )
+        self.assertIn("Created 1 users; skipped 1 invalid rows.", stdout.getvalue())
+        self.assertIn("Row 2: date_joined", stderr.getvalue())
+        self.assertTrue(Job.objects.filter(kind="onboarding_invites").exists())
@@ -0,0 +1,272 @@
+"""
+Tests for the change feed.
+"""
+
+import datetime
+import json
+import threading
+from io import StringIO
+from unittest import mock, skipIf
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import archive, bulk, outbox, timers
+from ..models import ChangeEvent, Department, Task
+from .helpers import make_employee
+
+
+class OutboxTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        hod = User.objects.create_user(username="hod", password="x")
+        cls.department = Department.objects.create(name="Labs", hod=hod)
+        cls.employee = make_employee("worker", cls.department)
+
+    def add_task(self, title="Report"):
+        """Create a task assigned to the employee."""
+        return Task.objects.create(
+            title=title,
+            description="",
+            assigned_to=self.employee,
+            due_date=datetime.date(2024, 6, 30),
+        )
+
+    def first_write(self, write):
+        """Run ``write`` in a transaction; return the first statement changing rows."""
+        with CaptureQueriesContext(connection) as queries, transaction.atomic():
+            write()
+        return next(
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+        )
+
+    def test_feed_locked_before_any_row(self):
+        """Single and multi-row writes lock the feed before writing rows."""
+        locked = 'UPDATE "tasks_changelock"'
+
+        def save_and_delete():
+            self.add_task("One")
+            self.add_task("Two").delete()
+
+        task, timed = self.add_task(), self.add_task("Timed")
+        start = datetime.datetime(2024, 6, 3, 9, tzinfo=datetime.timezone.utc)
+        writes = [
+            self.add_task,
+            save_and_delete,
+            task.delete,
+            lambda: bulk.import_tasks(
+                [
+                    {
+                        "title": "Imported",
+                        "description": "Planned",
+                        "assigned_to": "worker",
+                        "due_date": "2030-01-01",
+                    }
+                ]
+            ),
+            lambda: timers.reconcile(
+                self.employee,
+                [
+                    {
+                        "task": timed.pk,
+                        "start_time": start.isoformat(),
+                        "end_time": (start + datetime.timedelta(hours=1)).isoformat(),
+                    }
+                ],
+            ),
+        ]
+        for write in writes:
+            self.assertTrue(self.first_write(write).startswith(locked))
+        self.department.deleted_at = timezone.now()
+        self.department.save()
+        self.assertTrue(
+            self.first_write(
+                lambda: archive.purge_department(self.department.pk)
+            ).startswith(locked)
+        )
+
+    def feed(self, **params):
+        """Request the change feed as staff; return the response and events."""
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("changes"), params)
+        if not response.streaming:
+            return response, []
+        lines = b"".join(response.streaming_content).splitlines()
+        return response, [json.loads(line) for line in lines]
+
+    def test_changes_recorded(self):
+        """Creates, updates and deletes append events in sequence order."""
+        task = self.add_task()
+        task.completed = True
+        task.save()
+        task_id = task.pk
+        task.delete()
+        events = list(outbox.changes())
+        self.assertEqual(
+            [(event["model"], event["id"], event["action"]) for event in events],
+            [
+                ("task", task_id, "create"),
+                ("task", task_id, "update"),
+                ("task", task_id, "delete"),
+            ],
+        )
+        self.assertEqual(events[0]["data"]["due_date"], "2024-06-30")
+        self.assertTrue(events[1]["data"]["completed"])
+        self.assertEqual(events[2]["data"], {})
+        self.assertLess(events[0]["seq"], events[1]["seq"])
+
+    def test_cascades_and_bulk_writes_recorded(self):
+        """Cascaded deletes and bulk imports appear in the feed."""
+        task = self.add_task()
+        timers.record(
+            self.employee,
+            task,
+            timezone.now() - datetime.timedelta(hours=1),
+            timezone.now(),
+        )
+        since = outbox.latest()
+        self.employee.delete()
+        self.assertEqual(
+            sorted(event["model"] for event in outbox.changes(since)),
+            ["task", "timelog"],
+        )
+        make_employee("other", self.department)
+        since = outbox.latest()
+        result = bulk.import_tasks(
+            [
+                {
+                    "title": "Imported",
+                    "description": "x",
+                    "assigned_to": "other",
+                    "due_date": "2030-01-01",
+                    "priority": "Low",
+                }
+            ]
+        )
+        self.assertEqual(result.created, 1)
+        events = list(outbox.changes(since))
+        self.assertEqual(events[0]["data"]["title"], "Imported")
+
+    def test_changes_resume_in_chunks(self):
+        """Reading resumes after the cursor, across chunks, up to the limit."""
+        for index in range(5):
+            self.add_task(f"Task {index}")
+        first = list(outbox.changes())
+        with mock.patch.object(outbox, "CHUNK_SIZE", 2):
+            self.assertEqual(list(outbox.changes()), first)
+            rest = list(outbox.changes(first[1]["seq"], limit=2))
+        self.assertEqual(rest, first[2:4])
+
+    def test_feed_endpoint(self):
+        """The feed streams JSON lines after ``since`` with the latest sequence."""
+        for index in range(3):
+            self.add_task(f"Task {index}")
+        response, events = self.feed(since=0, limit=2)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(events), 2)
+        self.assertEqual(int(response["X-Latest-Sequence"]), outbox.latest())
+        _, rest = self.feed(since=events[-1]["seq"])
+        self.assertEqual([event["data"]["title"] for event in rest], ["Task 2"])
+        for params in ({"since": "x"}, {"limit": 0}, {"since": -1}):
+            self.assertEqual(self.feed(**params)[0].status_code, 400)
+
+    def test_feed_access(self):
+        """Only staff, or consumers with the token when one is set, read the feed."""
+        self.client.force_login(self.employee.user)
+        self.assertEqual(self.client.get(reverse("changes")).status_code, 403)
+        with self.settings(CHANGES_TOKEN="s3cret"):
+            response = self.client.get(
+                reverse("changes"), HTTP_AUTHORIZATION="Bearer s3cret"
+            )
+            self.assertEqual(response.status_code, 200)
+
+    def test_compaction(self):
+        """Events past retention are dropped unless they are a row's latest."""
+        task, other = self.add_task(), self.add_task("Other")
+        for title in ("Draft", "Final"):
+            task.title = title
+            task.save()
+        ChangeEvent.objects.update(
+            created_at=timezone.now() - datetime.timedelta(days=30)
+        )
+        task.title = "Recent"
+        task.save()
+        out = StringIO()
+        call_command("compact_changes", batch_size=2, stdout=out)
+        self.assertIn("Deleted 3 superseded events", out.getvalue())
+        self.assertEqual(
+            [(event["id"], event["data"]["title"]) for event in outbox.changes()],
+            [(other.pk, "Other"), (task.pk, "Recent")],
+        )
+
+
+class OutboxAtomicityTests(TransactionTestCase):
+    def test_row_and_event_commit_together(self):
+        """A row is not saved when its change event cannot be written."""
+        hod = User.objects.create_user(username="hod", password="x")
+        employee = make_employee("worker", Department.objects.create(name="R", hod=hod))
+        with mock.patch.object(outbox, "record", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                Task.objects.create(
+                    title="Lost",
+                    description="",
+                    assigned_to=employee,
+                    due_date=datetime.date(2024, 6, 30),
+                )
+        self.assertFalse(Task.objects.exists())
+
+    @skipIf(connection.vendor == "sqlite", "SQLite runs one writer at a time.")
+    def test_interleaved_writers_commit_in_sequence_order(self):
+        """A writer waits for an open one, so events never appear out of order."""
+        hod = User.objects.create_user(username="hod", password="x")
+        employee = make_employee("worker", Department.objects.create(name="R", hod=hod))
+        since = outbox.latest()
+        locked, release = threading.Event(), threading.Event()
+
+        def add(title):
+            Task.objects.create(
+                title=title,
+                description="",
+                assigned_to=employee,
+                due_date=datetime.date(2024, 6, 30),
+            )
+
+        def first():
+            try:
+                with transaction.atomic():
+                    add("First")
+                    locked.set()
+                    release.wait(5)
+            finally:
+                connection.close()
+
+        def second():
+            try:
+                add("Second")
+            finally:
+                connection.close()
+
+        writers = [threading.Thread(target=first), threading.Thread(target=second)]
+        writers[0].start()
+        self.assertTrue(locked.wait(5))
+        writers[1].start()
+        writers[1].join(0.5)
+        self.assertTrue(writers[1].is_alive())
+        self.assertEqual(list(outbox.changes(since)), [])
+        release.set()
+        for writer in writers:
+            writer.join(5)
+        self.assertEqual(
+            [event["data"]["title"] for event in outbox.changes(since)],
+            ["First", "Second"],
+        )
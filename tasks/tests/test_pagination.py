@@ -0,0 +1,73 @@
+"""
+Tests for keyset pagination.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from ..models import Department, Task
+from ..pagination import KeysetPaginator
+from .helpers import make_employee
+
+
+class KeysetPaginatorTests(TestCase):
+    """Cursor pagination walks every row exactly once in both directions."""
+
+    @classmethod
+    def setUpTestData(cls):
+        hod = User.objects.create_user(username="hod", password="x")
+        employee = make_employee(
+            "worker", Department.objects.create(name="R&D", hod=hod)
+        )
+        for index in range(7):
+            Task.objects.create(
+                title=f"Task {index}",
+                description="",
+                assigned_to=employee,
+                # Shared due dates exercise the pk tie-breaker.
+                due_date=datetime.date(2024, 6, 1 + index // 3),
+            )
+        cls.paginator = KeysetPaginator(Task.objects.all(), 3, ("due_date",))
+        cls.expected = list(Task.objects.order_by("due_date", "pk"))
+
+    def walk_forward(self):
+        """Return every page from the first to the last."""
+        pages = [self.paginator.get_page()]
+        while pages[-1].has_next():
+            pages.append(self.paginator.get_page(pages[-1].next_cursor))
+        return pages
+
+    def test_forward_walk(self):
+        """Following next cursors yields each row once, in order."""
+        pages = self.walk_forward()
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([task for page in pages for task in page], self.expected)
+        self.assertFalse(pages[0].has_previous())
+
+    def test_backward_walk(self):
+        """Previous cursors lead back to the same pages."""
+        pages = self.walk_forward()
+        page = pages[-1]
+        for expected in reversed(pages[:-1]):
+            page = self.paginator.get_page(page.previous_cursor)
+            self.assertEqual(list(page), list(expected))
+        self.assertFalse(page.has_previous())
+
+    def test_invalid_cursor_returns_first_page(self):
+        """A tampered cursor falls back to the first page."""
+        page = self.paginator.get_page("not-a-cursor")
+        self.assertEqual(list(page), self.expected[:3])
+
+    def test_page_cost_is_constant(self):
+        """Later pages run one query, like the first."""
+        cursor = self.walk_forward()[-2].next_cursor
+        with self.assertNumQueries(1):
+            self.paginator.get_page(cursor)
+
+    def test_count(self):
+        """Counts are only computed on request."""
+        self.assertIsNone(self.paginator.get_page().count)
+        paginator = KeysetPaginator(Task.objects.all(), 3, with_count=True)
+        self.assertEqual(paginator.get_page().count, 7)
@@ -0,0 +1,159 @@
+"""
+Tests for authorization scopes.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import permissions
+from ..models import Department, Employee, Goal, Task
+from .helpers import make_employee
+
+
+class PermissionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        cls.hod = User.objects.create_user(username="hod", password="password")
+        other_hod = User.objects.create_user(username="other-hod", password="x")
+        cls.labs = Department.objects.create(name="Labs", hod=cls.hod)
+        cls.sales = Department.objects.create(name="Sales", hod=other_hod)
+        cls.worker = make_employee("worker", cls.labs)
+        cls.seller = make_employee("seller", cls.sales)
+        for employee in (cls.worker, cls.seller):
+            Task.objects.create(
+                title=f"Task of {employee.user.username}",
+                description="",
+                assigned_to=employee,
+                due_date=datetime.date(2024, 6, 30),
+            )
+            Goal.objects.create(
+                employee=employee,
+                title=f"Goal of {employee.user.username}",
+                description="",
+                target_date=datetime.date(2024, 6, 30),
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def fresh(self, user):
+        """Return ``user`` reloaded, without a memoized scope."""
+        return User.objects.get(pk=user.pk)
+
+    def test_scopes(self):
+        """Heads manage their departments' employees; others only see themselves."""
+        hod = permissions.scope_of(self.hod)
+        self.assertEqual(hod.departments, {self.labs.pk})
+        self.assertEqual(hod.employees, {self.worker.pk})
+        self.assertTrue(hod.is_manager)
+        worker = permissions.scope_of(self.worker.user)
+        self.assertEqual(worker.visible_employees, {self.worker.pk})
+        self.assertFalse(worker.is_manager)
+        self.assertFalse(worker.manages_employee(self.worker.pk))
+        admin = permissions.scope_of(self.admin)
+        self.assertTrue(admin.manages_department(self.sales.pk))
+
+    def test_scope_cached(self):
+        """Scopes are computed once, then read from the cache and the user."""
+        user = self.fresh(self.hod)
+        with self.assertNumQueries(2):
+            permissions.scope_of(user)
+        user = self.fresh(self.hod)
+        with self.assertNumQueries(0):
+            permissions.scope_of(user)
+            permissions.scope_of(user)
+
+    def test_invalidated_on_changes(self):
+        """Moving employees, changing heads and staff status refresh scopes."""
+        permissions.scope_of(self.fresh(self.hod))
+        self.seller.department = self.labs
+        self.seller.save()
+        scope = permissions.scope_of(self.fresh(self.hod))
+        self.assertEqual(scope.employees, {self.worker.pk, self.seller.pk})
+
+        self.labs.hod = self.admin
+        self.labs.save()
+        self.assertFalse(permissions.scope_of(self.fresh(self.hod)).is_manager)
+
+        self.hod.is_staff = True
+        self.hod.save()
+        self.assertTrue(permissions.scope_of(self.fresh(self.hod)).is_admin)
+
+    def test_visible_to(self):
+        """Querysets are scoped with one IN clause on the employee column."""
+        titles = {
+            self.admin: ["Task of seller", "Task of worker"],
+            self.hod: ["Task of worker"],
+            self.seller.user: ["Task of seller"],
+        }
+        for user, expected in titles.items():
+            scope = permissions.scope_of(user)
+            tasks = Task.objects.visible_to(scope).order_by("title")
+            self.assertEqual(list(tasks.values_list("title", flat=True)), expected)
+        hod = permissions.scope_of(self.hod)
+        sql = str(Task.objects.visible_to(hod).query)
+        self.assertIn('"tasks_task"."assigned_to_id" IN', sql)
+        self.assertNotIn("JOIN", sql)
+        self.assertEqual(
+            list(Goal.objects.visible_to(hod).values_list("employee", flat=True)),
+            [self.worker.pk],
+        )
+        self.assertEqual(list(Department.objects.visible_to(hod)), [self.labs])
+        worker = permissions.scope_of(self.worker.user)
+        self.assertFalse(Department.objects.visible_to(worker).exists())
+        admin = permissions.scope_of(self.admin)
+        self.assertEqual(Employee.objects.visible_to(admin).count(), 2)
+
+    def test_hod_manages_own_department(self):
+        """Heads list and edit their own department only."""
+        self.client.force_login(self.hod)
+        response = self.client.get(reverse("department-list"))
+        self.assertContains(response, "Labs")
+        self.assertNotContains(response, "Sales")
+        response = self.client.get(reverse("employee-list"))
+        self.assertContains(response, "worker")
+        self.assertNotContains(response, "seller")
+        url = reverse("edit-department", args=[self.labs.pk])
+        response = self.client.post(url, {"name": "Research", "hod": self.hod.pk})
+        self.assertRedirects(response, reverse("department-list"))
+        other = reverse("edit-department", args=[self.sales.pk])
+        self.assertEqual(self.client.get(other).status_code, 404)
+        delete = reverse("delete-department", args=[self.labs.pk])
+        self.assertEqual(self.client.get(delete).status_code, 302)
+        self.assertTrue(Department.objects.filter(pk=self.labs.pk).exists())
+
+    def test_hod_assigns_tasks_to_managed_employees(self):
+        """Heads create tasks for their employees only."""
+        self.client.force_login(self.hod)
+        data = {
+            "title": "Write report",
+            "description": "Quarterly numbers",
+            "due_date": "2024-07-01",
+            "priority": "Low",
+        }
+        response = self.client.post(
+            reverse("create-task"), {**data, "assigned_to": self.seller.pk}
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            reverse("create-task"), {**data, "assigned_to": self.worker.pk}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Task.objects.filter(title="Write report").exists())
+        response = self.client.get(reverse("assignee-autocomplete"))
+        self.assertEqual(
+            [row["id"] for row in response.json()["results"]], [self.worker.pk]
+        )
+
+    def test_employees_cannot_manage(self):
+        """Employees who head nothing are sent to log in."""
+        self.client.force_login(self.worker.user)
+        for name in ("department-list", "employee-list", "create-task"):
+            self.assertEqual(self.client.get(reverse(name)).status_code, 302)
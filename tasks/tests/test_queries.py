@@ -0,0 +1,127 @@
+"""
+Tests for listing query counts and the ``explain_queries`` command.
+"""
+
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Department, Goal, Task
+from .helpers import make_employee
+
+
+@override_settings(FRAGMENT_CACHE_TIMEOUT=0)
+class ListingQueryCountTests(TestCase):
+    """
+    Pin the number of queries each listing view runs.
+
+    Every test renders the view against a populated table; the counts must
+    not depend on the number of rows, so a new N+1 shows up as a failure.
+    Fragment caching is disabled so the full render is measured.
+    """
+
+    rows = 5
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        for index in range(cls.rows):
+            hod = User.objects.create_user(username=f"hod{index}", password="x")
+            department = Department.objects.create(name=f"Dept {index}", hod=hod)
+            make_employee(f"emp{index}", department)
+        cls.department = Department.objects.first()
+        cls.employee = make_employee("worker", cls.department)
+        for index in range(cls.rows):
+            Task.objects.create(
+                title=f"Task {index}",
+                description="",
+                assigned_to=cls.employee,
+                due_date=datetime.date(2024, 6, 1),
+            )
+            Goal.objects.create(
+                employee=cls.employee,
+                title=f"Goal {index}",
+                description="",
+                target_date=datetime.date(2024, 6, 1),
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def assert_view_queries(self, user, url_name, num):
+        """Render ``url_name`` as ``user`` and assert it runs ``num`` queries."""
+        self.client.force_login(user)
+        # Warm the per-user caches so only the steady state is measured.
+        self.client.get(reverse(url_name))
+        with self.assertNumQueries(num):
+            response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_employee_list(self):
+        """Employee rows join their user and department."""
+        response = self.assert_view_queries(self.admin, "employee-list", 3)
+        self.assertContains(response, "emp0 - Department: Dept 0")
+
+    def test_department_list(self):
+        """Department rows join their head of department."""
+        response = self.assert_view_queries(self.admin, "department-list", 3)
+        self.assertContains(response, "hod0")
+
+    def test_user_list(self):
+        """The user list runs a single query per page, without a COUNT."""
+        self.assert_view_queries(self.admin, "user-list", 3)
+
+    def test_employee_dashboard(self):
+        """The dashboard loads tasks, recurring rules, goals and journal once each."""
+        response = self.assert_view_queries(self.employee.user, "employee-dashboard", 6)
+        self.assertContains(response, "Task 0")
+        self.assertContains(response, "Goal 0")
+
+    def test_goal_dashboard(self):
+        """The goal dashboard loads goals in a single query."""
+        response = self.assert_view_queries(self.employee.user, "goal-dashboard", 3)
+        self.assertContains(response, "Goal 0")
+
+    def test_home(self):
+        """The home dashboard reads stored counters without aggregating."""
+        response = self.assert_view_queries(self.admin, "home", 3)
+        self.assertEqual(response.context["open_tasks"], self.rows)
+
+    def test_create_task_form(self):
+        """The assignee widget does not load employees until searched."""
+        response = self.assert_view_queries(self.admin, "create-task", 2)
+        self.assertContains(response, reverse("assignee-autocomplete"))
+        self.assertNotContains(response, "Emp0")
+
+
+class ExplainQueriesCommandTests(TestCase):
+    """The explain command reports plans that use the composite indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        hod = User.objects.create_user(username="hod", password="x")
+        cls.employee = make_employee(
+            "worker", Department.objects.create(name="R&D", hod=hod)
+        )
+
+    def test_plans_use_composite_indexes(self):
+        """Dashboard and time log plans name the new indexes."""
+        out = StringIO()
+        call_command("explain_queries", user="worker", stdout=out)
+        output = out.getvalue()
+        self.assertIn("task_assignee_open_due_idx", output)
+        self.assertIn("goal_employee_target_idx", output)
+        self.assertIn("timelog_employee_interval_idx", output)
+
+    def test_unknown_user(self):
+        """A username without an employee profile is rejected."""
+        with self.assertRaises(CommandError):
+            call_command("explain_queries", user="nobody", stdout=StringIO())
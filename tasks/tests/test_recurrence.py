@@ -0,0 +1,212 @@
+"""
+Tests for recurring tasks.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import recurrence
+from ..models import Department, Recurrence, Task, TimeLog
+from .helpers import make_employee
+
+
+class RecurrenceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        hod = User.objects.create_user(username="hod", password="x")
+        cls.department = Department.objects.create(name="Labs", hod=hod)
+        cls.employee = make_employee("worker", cls.department)
+        cls.other = make_employee("other", cls.department)
+        cls.today = timezone.localdate()
+
+    def add_rule(self, employee=None, **fields):
+        """Create an active rule assigned to ``employee``, daily by default."""
+        fields.setdefault("starts_on", datetime.date(2024, 1, 1))  # a Monday
+        return Recurrence.objects.create(
+            title="Stand-up notes",
+            assigned_to=employee or self.employee,
+            priority="Medium",
+            frequency=fields.pop("frequency", Recurrence.DAILY),
+            **fields,
+        )
+
+    def dates(self, rule, start, end):
+        """Return the occurrence dates of ``rule`` between two ISO dates."""
+        return [
+            day.isoformat()
+            for day in recurrence.occurrences(
+                rule,
+                datetime.date.fromisoformat(start),
+                datetime.date.fromisoformat(end),
+            )
+        ]
+
+    def test_daily_weekdays(self):
+        """Daily rules with weekdays skip the other days."""
+        rule = self.add_rule(weekdays="1,3,5")
+        self.assertEqual(
+            self.dates(rule, "2024-01-01", "2024-01-08"),
+            ["2024-01-01", "2024-01-03", "2024-01-05", "2024-01-08"],
+        )
+
+    def test_weekly_interval(self):
+        """Weekly rules repeat their weekdays every ``interval`` weeks."""
+        rule = self.add_rule(frequency=Recurrence.WEEKLY, interval=2, weekdays="2,4")
+        self.assertEqual(
+            self.dates(rule, "2024-01-01", "2024-01-21"),
+            ["2024-01-02", "2024-01-04", "2024-01-16", "2024-01-18"],
+        )
+
+    def test_monthly_clamps_to_month_end(self):
+        """Monthly rules fall on the last day of shorter months."""
+        rule = self.add_rule(
+            frequency=Recurrence.MONTHLY, starts_on=datetime.date(2024, 1, 31)
+        )
+        self.assertEqual(
+            self.dates(rule, "2024-01-01", "2024-04-30"),
+            ["2024-01-31", "2024-02-29", "2024-03-31", "2024-04-30"],
+        )
+
+    def test_far_window_and_end_date(self):
+        """Windows years after the start expand directly; ends_on stops the series."""
+        rule = self.add_rule(interval=3, ends_on=datetime.date(2030, 1, 10))
+        self.assertEqual(
+            self.dates(rule, "2030-01-01", "2030-01-31"),
+            ["2030-01-02", "2030-01-05", "2030-01-08"],
+        )
+        self.assertEqual(self.dates(rule, "2024-01-02", "2024-01-04"), ["2024-01-04"])
+
+    def test_window_after_a_gap(self):
+        """A later window that skips dates starts at its own start."""
+        rule = self.add_rule()
+        self.assertEqual(len(self.dates(rule, "2024-03-01", "2024-03-14")), 14)
+        self.assertEqual(self.dates(rule, "2024-03-21", "2024-04-03")[0], "2024-03-21")
+        self.assertEqual(self.dates(rule, "2024-04-10", "2024-04-10"), ["2024-04-10"])
+        self.assertTrue(recurrence.occurs_on(rule, datetime.date(2024, 4, 20)))
+
+    def test_expansion_is_memoized(self):
+        """Rules with the same schedule share an expansion; edits use a new one."""
+        rule = self.add_rule()
+        shared = recurrence.expansion(recurrence.Schedule.of(rule))
+        self.assertIs(recurrence.expansion(recurrence.Schedule.of(rule)), shared)
+        rule.interval = 2
+        self.assertIsNot(recurrence.expansion(recurrence.Schedule.of(rule)), shared)
+
+    def test_validation(self):
+        """Invalid weekdays and end dates before the start are rejected."""
+        rule = Recurrence(
+            title="Bad",
+            assigned_to=self.employee,
+            priority="Low",
+            frequency=Recurrence.WEEKLY,
+            weekdays="1,9",
+            starts_on=datetime.date(2024, 1, 2),
+            ends_on=datetime.date(2024, 1, 1),
+        )
+        for field, fix in (("weekdays", "1,2"), ("ends_on", None)):
+            with self.assertRaises(ValidationError) as raised:
+                rule.full_clean()
+            self.assertIn(field, raised.exception.message_dict)
+            setattr(rule, field, fix)
+        rule.full_clean()
+
+    def test_pending_skips_stored_occurrences(self):
+        """Pending occurrences omit stored ones, in two queries."""
+        rule = self.add_rule(starts_on=self.today)
+        self.add_rule(self.other, starts_on=self.today)
+        recurrence.materialize(rule, self.today)
+        with self.assertNumQueries(2):
+            pending = recurrence.pending(self.employee, days=3)
+        self.assertEqual(
+            [occurrence.due_date for occurrence in pending],
+            [self.today + datetime.timedelta(days=day) for day in (1, 2)],
+        )
+        idle = make_employee("idle", self.department)
+        with self.assertNumQueries(1):
+            self.assertEqual(recurrence.pending(idle), [])
+
+    def test_materialize_once(self):
+        """An occurrence is stored at most once, and only on its dates."""
+        rule = self.add_rule(weekdays="1")
+        monday = datetime.date(2024, 1, 8)
+        self.assertEqual(
+            recurrence.materialize(rule, monday).pk,
+            recurrence.materialize(rule, monday).pk,
+        )
+        with self.assertRaises(ValueError):
+            recurrence.materialize(rule, monday + datetime.timedelta(days=1))
+        self.assertEqual(rule.occurrences.count(), 1)
+
+    def test_log_time_on_occurrence(self):
+        """Logging time stores the occurrence as a task with the log."""
+        rule = self.add_rule(starts_on=self.today)
+        self.client.force_login(self.employee.user)
+        response = self.client.get(reverse("employee-dashboard"))
+        url = reverse("log-occurrence", args=[rule.pk, self.today.isoformat()])
+        self.assertContains(response, url)
+        start = timezone.now().replace(microsecond=0)
+        data = {
+            "start_time": start.strftime("%Y-%m-%d %H:%M:%S"),
+            "end_time": (start + datetime.timedelta(hours=1)).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            ),
+        }
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        response = self.client.post(url, data)
+        self.assertContains(response, "Overlaps the time logged")
+        task = Task.objects.get(recurrence=rule)
+        self.assertEqual(task.due_date, self.today)
+        self.assertEqual(TimeLog.objects.filter(task=task).get().duration.seconds, 3600)
+        response = self.client.get(reverse("employee-dashboard"))
+        self.assertNotContains(response, url)
+
+    def test_complete_occurrence(self):
+        """Completing an occurrence stores it as a completed task."""
+        rule = self.add_rule(starts_on=self.today)
+        self.client.force_login(self.employee.user)
+        url = reverse("log-occurrence", args=[rule.pk, self.today.isoformat()])
+        self.assertEqual(self.client.post(url, {"complete": "1"}).status_code, 302)
+        self.assertTrue(Task.objects.get(recurrence=rule).completed)
+
+    def test_occurrence_not_found(self):
+        """Invalid dates, dates off the schedule and others' rules are 404s."""
+        rule = self.add_rule(weekdays="1")
+        self.client.force_login(self.employee.user)
+        for rule_id, day in (
+            (rule.pk, "not-a-date"),
+            (rule.pk, "2024-01-09"),
+            (self.add_rule(self.other).pk, "2024-01-08"),
+        ):
+            url = reverse("log-occurrence", args=[rule_id, day])
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_create_recurrence(self):
+        """Staff create rules from the form; weekdays are stored as a list."""
+        self.client.force_login(self.admin)
+        response = self.client.post(
+            reverse("create-recurrence"),
+            {
+                "title": "Weekly report",
+                "description": "",
+                "assigned_to": self.employee.pk,
+                "priority": "High",
+                "frequency": Recurrence.WEEKLY,
+                "interval": 1,
+                "weekdays": ["1", "5"],
+                "starts_on": "2024-01-01",
+                "active": "on",
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Recurrence.objects.get().weekdays, "1,5")
+        self.client.force_login(self.employee.user)
+        response = self.client.get(reverse("create-recurrence"))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,121 @@
+"""
+Tests for columnar productivity reports.
+"""
+
+import datetime
+from array import array
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import archive, reports
+from ..models import Department, Task, TimeLog
+from .helpers import make_employee
+
+
+class ProductivityReportTests(TestCase):
+    """Columnar reports compute distributions over tasks and time logs."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        cls.department = Department.objects.create(name="R&D", hod=cls.admin)
+        employee = make_employee("worker", cls.department)
+        today = datetime.date.today()
+        for index, (priority, days) in enumerate(
+            [("High", 0), ("High", 3), ("Low", 10), ("Low", -1)]
+        ):
+            task = Task.objects.create(
+                title=f"Task {index}",
+                description="",
+                assigned_to=employee,
+                priority=priority,
+                due_date=today + datetime.timedelta(days=days),
+                completed=index < 3,
+            )
+            start = datetime.datetime(2024, 6, 1, 9, tzinfo=datetime.timezone.utc)
+            TimeLog.objects.create(
+                task=task,
+                employee=employee,
+                start_time=start,
+                end_time=start + datetime.timedelta(hours=index + 1),
+            )
+        # Completed late: finished five days after its due date.
+        Task.objects.filter(title="Task 0").update(
+            updated_at=today + datetime.timedelta(days=5)
+        )
+
+    def test_percentiles_and_histogram(self):
+        """Statistics interpolate between ranks and bucket half-open ranges."""
+        column = array("d", [1, 2, 3, 4])
+        self.assertEqual(
+            reports.percentiles(column, (0, 50, 100)), {0: 1, 50: 2.5, 100: 4}
+        )
+        self.assertEqual(reports.histogram(column, [0, 2, 4]), [1, 3])
+        self.assertEqual(reports.percentiles(array("d"), (50,)), {50: None})
+
+    def test_pure_python_percentiles_sort_in_blocks(self):
+        """Without NumPy, columns are sorted into arrays a block at a time."""
+        column = array("d", [5, 3, 9, 1, 7, 2, 8])
+        ordered = reports.sort_column(column, block=3)
+        self.assertEqual(ordered, array("d", [1, 2, 3, 5, 7, 8, 9]))
+        with mock.patch.object(reports, "np", None):
+            self.assertEqual(
+                reports.percentiles(column, (0, 50, 100)), {0: 1, 50: 5, 100: 9}
+            )
+
+    def test_on_time_by_priority(self):
+        """Late completions and open overdue tasks count as overdue."""
+        report = reports.on_time_by_priority(self.department)
+        self.assertEqual(
+            report["High"], {"on_time": 1, "overdue": 1, "on_time_rate": 0.5}
+        )
+        self.assertEqual(report["Low"]["overdue"], 1)
+        self.assertIsNone(report["Medium"]["on_time_rate"])
+
+    def test_distributions(self):
+        """Latency covers completed tasks and hours are summed per task."""
+        latency = reports.completion_latency()
+        self.assertEqual(latency["count"], 3)
+        self.assertEqual(latency["percentiles"][50], 0)
+        self.assertAlmostEqual(latency["percentiles"][99], 4.9)
+        hours = reports.hours_per_task()
+        self.assertEqual(hours["percentiles"][50], 2.5)
+
+    def test_archived_rows(self):
+        """Archived tasks and time logs stay in the reports."""
+        before = reports.productivity_report(self.department)
+        cutoff = timezone.localdate() + datetime.timedelta(days=30)
+        self.assertEqual(archive.archive_tasks(cutoff=cutoff), (3, 3))
+        self.assertEqual(reports.productivity_report(self.department), before)
+        self.assertEqual(reports.productivity_report(), before)
+
+    def test_hours_of_tasks_split_between_tiers(self):
+        """A task's archived and current logs add up to one total."""
+        task = Task.objects.get(title="Task 1")
+        start = timezone.now() - datetime.timedelta(hours=3)
+        TimeLog.objects.create(
+            task=task,
+            employee=task.assigned_to,
+            start_time=start,
+            end_time=start + datetime.timedelta(hours=2),
+        )
+        before = reports.hours_per_task(self.department)
+        cutoff = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        self.assertEqual(archive.archive_time_logs(cutoff=cutoff), 4)
+        self.assertEqual(reports.hours_per_task(self.department), before)
+        self.assertEqual(before["count"], 4)
+        self.assertEqual(before["percentiles"][99], 4)
+
+    def test_view(self):
+        """The report page renders for a department."""
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("productivity-report"), {"department": self.department.pk}
+        )
+        self.assertContains(response, "On Time vs Overdue")
@@ -0,0 +1,108 @@
+"""
+Tests for daily time rollups.
+"""
+
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import DailyTimeRollup, Department, Task, TimeLog
+from .helpers import make_employee
+
+
+class DailyTimeRollupTests(TestCase):
+    """Rollups track time logs incrementally and agree with a backfill."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        cls.department = Department.objects.create(name="R&D", hod=cls.admin)
+        cls.employee = make_employee("worker", cls.department)
+        cls.task = Task.objects.create(
+            title="Report",
+            description="",
+            assigned_to=cls.employee,
+            due_date=datetime.date(2024, 6, 30),
+        )
+
+    def log(self, day, hours):
+        """Log ``hours`` against the task starting at 9:00 on June ``day``."""
+        start = datetime.datetime(2024, 6, day, 9, tzinfo=datetime.timezone.utc)
+        return TimeLog.objects.create(
+            task=self.task,
+            employee=self.employee,
+            start_time=start,
+            end_time=start + datetime.timedelta(hours=hours),
+            duration=datetime.timedelta(hours=hours),
+        )
+
+    def snapshot(self):
+        """Return the stored rollups as comparable tuples."""
+        return sorted(
+            DailyTimeRollup.objects.values_list(
+                "date", "employee", "task", "department", "seconds", "log_count"
+            )
+        )
+
+    def test_incremental_matches_backfill(self):
+        """Saves, edits and deletes keep rollups equal to a full rebuild."""
+        self.log(3, 2)
+        moved = self.log(3, 1)
+        removed = self.log(4, 3)
+        moved.start_time += datetime.timedelta(days=7)
+        moved.end_time += datetime.timedelta(days=7)
+        moved.save()
+        removed.delete()
+        incremental = self.snapshot()
+        self.assertEqual(
+            [(row[0].day, row[4], row[5]) for row in incremental],
+            [(3, 7200, 1), (10, 3600, 1)],
+        )
+        call_command("backfill_rollups", stdout=StringIO())
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_weekly_report(self):
+        """The report sums rollups per department per week."""
+        self.log(3, 2)
+        self.log(5, 1.5)
+        self.log(12, 4)
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("time-report"), {"since": "2024-06-03", "until": "2024-06-16"}
+        )
+        self.assertEqual(response.context["rows"], [(self.department, [3.5, 4.0])])
+        self.assertEqual(
+            response.context["weeks"],
+            [datetime.date(2024, 6, 3), datetime.date(2024, 6, 10)],
+        )
+
+    def test_old_logs_keep_their_department(self):
+        """Edits and deletes after a move update the rollup of the old department."""
+        kept = self.log(3, 2)
+        removed = self.log(4, 1)
+        other = Department.objects.create(name="Ops", hod=self.admin)
+        self.employee.department = other
+        self.employee.save()
+        kept.end_time += datetime.timedelta(hours=1)
+        kept.save()
+        removed.delete()
+        self.log(5, 1)
+        incremental = self.snapshot()
+        self.assertEqual(
+            [(row[0].day, row[3], row[4], row[5]) for row in incremental],
+            [(3, self.department.pk, 10800, 1), (5, other.pk, 3600, 1)],
+        )
+        call_command("backfill_rollups", stdout=StringIO())
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_department_cascade(self):
+        """Deleting a department removes its logs and rollups cleanly."""
+        self.log(3, 2)
+        self.department.delete()
+        self.assertFalse(DailyTimeRollup.objects.exists())
@@ -0,0 +1,110 @@
+"""
+Tests for read replica routing.
+"""
+
+import datetime
+import os
+import sqlite3
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import routing, search
+from ..models import Task
+
+
+@override_settings(REPLICA_DATABASES=["replica"])
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        routing.forget_heartbeats()
+        self.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        self.client.force_login(self.admin)
+
+    def replica_queries(self, name="employee-list"):
+        """Request ``name``; return how many page queries the replica served."""
+        cache.clear()
+        with CaptureQueriesContext(connections["replica"]) as queries:
+            self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+        return sum("tasks_heartbeat" not in query["sql"] for query in queries)
+
+    def test_listing_reads_from_fresh_replica(self):
+        """Tolerant views read from a replica whose heartbeat is recent."""
+        self.assertEqual(self.replica_queries(), 0)  # lag unknown
+        routing.beat()
+        routing.forget_heartbeats()
+        self.assertGreater(self.replica_queries(), 0)
+        self.assertGreater(self.replica_queries("user-list"), 0)
+
+    def test_lag_tolerance_per_view(self):
+        """A replica lagging more than a view tolerates is skipped."""
+        routing.beat(timezone.now() - datetime.timedelta(seconds=60))
+        self.assertEqual(self.replica_queries(), 0)
+        with self.settings(REPLICA_MAX_LAG={"employee-list": 120}):
+            self.assertGreater(self.replica_queries(), 0)
+            self.assertEqual(self.replica_queries("user-list"), 0)
+
+    def test_writes_pin_session_to_primary(self):
+        """After writing, the session reads from the primary."""
+        routing.beat()
+        response = self.client.post(
+            reverse("create-department"), {"name": "Labs", "hod": self.admin.pk}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.replica_queries(), 0)
+        with self.settings(REPLICA_PIN_SECONDS=0):
+            self.assertGreater(self.replica_queries(), 0)
+
+    def test_login_does_not_pin(self):
+        """Recording last_login is not a write that pins the session."""
+        routing.beat()
+        self.client.logout()
+        self.client.post(
+            reverse("login"), {"username": "admin", "password": "password"}
+        )
+        self.assertGreater(self.replica_queries(), 0)
+
+    def test_search_reads_index_from_replica(self):
+        """The search view runs its full-text query on a fresh replica."""
+        routing.beat()
+        routing.forget_heartbeats()
+        with CaptureQueriesContext(connections["replica"]) as queries:
+            response = self.client.get(reverse("search"), {"q": "report"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any(search.TABLE in query["sql"] for query in queries))
+
+    def test_router(self):
+        """Outside requests everything uses the primary; replicas are not migrated."""
+        router = routing.ReplicaRouter()
+        routing.beat()
+        self.assertEqual(router.db_for_read(Task), "default")
+        self.assertEqual(router.db_for_write(Task), "default")
+        self.assertFalse(router.allow_migrate("replica", "tasks"))
+        self.assertIsNone(router.allow_migrate("default", "tasks"))
+
+    def test_copy_sqlite(self):
+        """A SQLite replica file receives the primary's rows and heartbeat."""
+        routing.beat()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "replica.sqlite3")
+            routing.copy_sqlite(path)
+            copy = sqlite3.connect(path)
+            try:
+                users = copy.execute(
+                    "SELECT username FROM auth_user WHERE is_staff"
+                ).fetchall()
+                beats = copy.execute("SELECT COUNT(*) FROM tasks_heartbeat").fetchone()
+            finally:
+                copy.close()
+        self.assertEqual(users, [("admin",)])
+        self.assertEqual(beats, (1,))
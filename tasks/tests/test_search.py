@@ -0,0 +1,77 @@
+"""
+Tests for full-text search.
+"""
+
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import search
+from ..models import Department, Goal, JournalEntry, Task
+from .helpers import make_employee
+
+
+class SearchTests(TestCase):
+    """The full-text index follows saves and ranks title matches first."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        department = Department.objects.create(name="R&D", hod=cls.admin)
+        cls.employee = make_employee("worker", department)
+        cls.other = make_employee("other", department)
+        cls.title_match = Task.objects.create(
+            title="Migrate database",
+            description="Move the reports.",
+            assigned_to=cls.employee,
+            due_date=datetime.date(2024, 6, 1),
+        )
+        cls.body_match = Goal.objects.create(
+            employee=cls.employee,
+            title="Learn tooling",
+            description="Read about database tuning.",
+            target_date=datetime.date(2024, 6, 1),
+        )
+        JournalEntry.objects.create(
+            employee=cls.other,
+            entry_date=datetime.date(2024, 6, 1),
+            content="Database backups ran overnight.",
+        )
+
+    def test_ranking_and_scope(self):
+        """Title hits outrank body hits; employees only see their own records."""
+        hits = search.search("databases")
+        self.assertEqual(len(hits), 3)
+        self.assertEqual(hits[0].object, self.title_match)
+        own = search.search("database", employee_id=self.employee.pk)
+        self.assertEqual({hit.kind for hit in own}, {"task", "goal"})
+
+    def test_index_follows_changes(self):
+        """Edits and deletes are reflected immediately."""
+        self.title_match.title = "Archive logs"
+        self.title_match.description = "Nothing relevant."
+        self.title_match.save()
+        self.body_match.delete()
+        self.assertEqual([hit.kind for hit in search.search("database")], ["journal"])
+
+    def test_query_syntax_is_escaped(self):
+        """FTS operators in user input are treated as plain words."""
+        self.assertEqual(search.search('"database" OR NEAR('), [])
+        self.assertEqual(len(search.search("database)")), 3)
+
+    def test_view_and_rebuild(self):
+        """The view pages results and the command restores a wiped index."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {search.TABLE}")
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.client.force_login(self.employee.user)
+        response = self.client.get(reverse("search"), {"q": "database"})
+        self.assertEqual(len(response.context["hits"]), 2)
+        self.assertFalse(response.context["has_next"])
@@ -0,0 +1,102 @@
+"""
+Tests for the SQLite production profile.
+"""
+
+import datetime
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import OperationalError, connection, connections
+from django.test import TestCase, TransactionTestCase
+
+from .. import benchmark, sqlite
+from ..models import Department, Task, TimeLog
+from .helpers import make_employee
+
+
+class SqliteProfileTests(TransactionTestCase):
+    def pragmas(self, **settings):
+        """Return the pragmas of a new connection to a database file."""
+        names = ("journal_mode", "synchronous", "busy_timeout", "cache_size")
+        with tempfile.TemporaryDirectory() as directory, self.settings(**settings):
+            wrapper = type(connections["default"])(
+                {**connection.settings_dict, "NAME": os.path.join(directory, "db")}
+            )
+            try:
+                with wrapper.cursor() as cursor:
+                    return {
+                        name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                        for name in names
+                    }
+            finally:
+                wrapper.close()
+
+    def test_pragmas(self):
+        """The production profile configures every new connection."""
+        self.assertEqual(self.pragmas()["journal_mode"], "delete")
+        configured = self.pragmas(
+            SQLITE_PRODUCTION=True, SQLITE_PRAGMAS={"busy_timeout": 1234}
+        )
+        self.assertEqual(
+            configured,
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,
+                "busy_timeout": 1234,
+                "cache_size": sqlite.PRAGMAS["cache_size"],
+            },
+        )
+
+    @mock.patch("tasks.sqlite.time.sleep")
+    def test_retry_on_lock(self, sleep):
+        """Lock errors are retried with backoff; other errors are not."""
+        write = mock.Mock(
+            side_effect=[OperationalError("database is locked")] * 2 + ["saved"]
+        )
+        self.assertEqual(sqlite.retry_on_lock(write, 1, key="value"), "saved")
+        self.assertEqual(write.call_count, 3)
+        write.assert_called_with(1, key="value")
+        self.assertEqual(sleep.call_count, 2)
+
+        write = mock.Mock(side_effect=OperationalError("no such table: nope"))
+        with self.assertRaises(OperationalError):
+            sqlite.retry_on_lock(write)
+        self.assertEqual(write.call_count, 1)
+
+        write = mock.Mock(side_effect=OperationalError("database is locked"))
+        with self.settings(SQLITE_WRITE_ATTEMPTS=3), self.assertRaises(
+            OperationalError
+        ):
+            sqlite.retry_on_lock(write)
+        self.assertEqual(write.call_count, 3)
+
+    def test_write_throughput(self):
+        """The write benchmark logs time concurrently and cleans up."""
+        admin = User.objects.create_user(username="admin", is_staff=True)
+        employee = make_employee(
+            "worker", Department.objects.create(name="Labs", hod=admin)
+        )
+        Task.objects.create(
+            title="Task",
+            description="Work",
+            assigned_to=employee,
+            due_date=datetime.date(2025, 1, 1),
+        )
+        for production in (False, True):
+            result = benchmark.write_throughput(
+                threads=2, writes=3, production=production
+            )
+            self.assertEqual(result["writes"] + result["failures"], 6)
+            self.assertGreater(result["writes_per_second"], 0)
+        self.assertFalse(TimeLog.objects.exists())
+
+
+class SqliteRetryNestedTests(TestCase):
+    def test_no_retry_inside_transaction(self):
+        """Writes inside an outer transaction fail at once."""
+        write = mock.Mock(side_effect=OperationalError("database is locked"))
+        with self.assertRaises(OperationalError):
+            sqlite.retry_on_lock(write)
+        self.assertEqual(write.call_count, 1)
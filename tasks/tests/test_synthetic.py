@@ -0,0 +1,55 @@
+"""
+Tests for the synthetic data generator.
+"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from .. import counters, synthetic
+from ..models import Employee, Task, TimeLog, Workload
+
+
+class SyntheticDataTests(TestCase):
+    rows = synthetic.ROWS_PER_EMPLOYEE * 5
+
+    def seed(self, **kwargs):
+        """Run the generator to completion and return its final counts."""
+        seeded = None
+        for seeded in synthetic.seed(rows=self.rows, chunk_size=2, **kwargs):
+            pass
+        return seeded
+
+    def test_seed(self):
+        """The requested scale is written and derived data is rebuilt."""
+        seeded = self.seed()
+        self.assertEqual(seeded.counts["Employee"], 5)
+        self.assertEqual(Employee.objects.count(), 5)
+        self.assertEqual(Task.objects.count(), 5 * synthetic.TASKS_PER_EMPLOYEE)
+        self.assertEqual(TimeLog.objects.count(), seeded.counts["TimeLog"])
+        self.assertEqual(seeded.total, self.rows + 3)  # admin, head, department
+        self.assertTrue(User.objects.get(username="synthetic-admin").is_staff)
+        self.assertTrue(
+            self.client.login(username="synthetic-0", password=synthetic.PASSWORD)
+        )
+
+        totals = counters.get_counters()
+        self.assertEqual(
+            totals[counters.OPEN_TASKS], Task.objects.filter(completed=False).count()
+        )
+        self.assertEqual(Workload.objects.count(), 5)
+
+    def test_repeatable(self):
+        """The same seed generates the same data."""
+
+        def tasks(prefix):
+            return list(
+                Task.objects.filter(assigned_to__user__username__startswith=prefix)
+                .order_by("pk")
+                .values_list("title", "due_date", "priority", "completed")
+            )
+
+        self.seed(prefix="a", derived=False)
+        self.seed(prefix="b", derived=False)
+        self.assertEqual(tasks("a-"), tasks("b-"))
+        with self.assertRaises(ValueError):
+            self.seed(prefix="a")
@@ -0,0 +1,191 @@
+"""
+Tests for the timer API.
+"""
+
+import datetime
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import models, timers
+from ..models import ActiveTimer, Department, Task, TimeLog
+from .helpers import make_employee
+
+
+class TimerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hod = User.objects.create_user(username="hod", password="x")
+        department = Department.objects.create(name="Labs", hod=hod)
+        cls.employee = make_employee("worker", department)
+        cls.other = make_employee("other", department)
+        cls.task = Task.objects.create(
+            title="Report",
+            description="",
+            assigned_to=cls.employee,
+            due_date=datetime.date(2024, 6, 30),
+        )
+        cls.start = datetime.datetime(2024, 6, 3, 9, tzinfo=datetime.timezone.utc)
+
+    def setUp(self):
+        self.client.force_login(self.employee.user)
+
+    def at(self, hours):
+        """Return the time ``hours`` after 9:00 on June 3rd."""
+        return self.start + datetime.timedelta(hours=hours)
+
+    def clock(self, hours):
+        """Set the timers' clock to ``hours`` after 9:00 on June 3rd."""
+        clock = mock.Mock(wraps=timezone, **{"now.return_value": self.at(hours)})
+        return mock.patch.object(timers, "timezone", clock)
+
+    def interval(self, start, end, task=None):
+        """Return an offline interval from ``start`` to ``end`` hours."""
+        return {
+            "task": (task or self.task).pk,
+            "start_time": self.at(start).isoformat(),
+            "end_time": self.at(end).isoformat(),
+        }
+
+    def sync(self, intervals):
+        """Submit offline ``intervals``; return the response payload."""
+        response = self.client.post(
+            reverse("sync-time-logs"), intervals, content_type="application/json"
+        )
+        self.assertIn(response.status_code, (200, 201))
+        return response.json()
+
+    def test_duration_computed_on_save(self):
+        """The duration always matches the start and end times."""
+        log = timers.record(self.employee, self.task, self.at(0), self.at(1.5))
+        log.end_time = self.at(2)
+        log.save()
+        log.refresh_from_db()
+        self.assertEqual(log.duration, datetime.timedelta(hours=2))
+
+    def test_overlaps_rejected(self):
+        """Overlapping logs are rejected; touching ones are allowed."""
+        timers.record(self.employee, self.task, self.at(0), self.at(2))
+        timers.record(self.employee, self.task, self.at(2), self.at(3))
+        timers.record(self.other, self.task, self.at(1), self.at(2))
+        with self.assertRaises(timers.Conflict):
+            timers.record(self.employee, self.task, self.at(-1), self.at(0.5))
+        with self.assertRaises(ValidationError):
+            timers.record(self.employee, self.task, self.at(5), self.at(4))
+        with self.assertRaises(ValidationError):
+            timers.record(self.employee, self.task, self.at(5), self.at(30))
+
+    def test_overlap_query_is_a_bounded_index_scan(self):
+        """The overlap check scans a bounded range of the interval index."""
+        queryset = TimeLog.objects.overlapping(self.employee, self.at(0), self.at(1))
+        self.assertIn("timelog_employee_interval_idx", queryset.explain())
+        self.assertIn(
+            str(self.at(0) - models.MAX_LOG_DURATION)[:19], str(queryset.query)
+        )
+
+    def test_log_time_form_rejects_overlap(self):
+        """The log time form reports overlaps instead of saving them."""
+        timers.record(self.employee, self.task, self.at(0), self.at(2))
+        response = self.client.post(
+            reverse("log-time", args=[self.task.pk]),
+            {
+                "start_time": self.at(1).strftime("%Y-%m-%d %H:%M:%S"),
+                "end_time": self.at(3).strftime("%Y-%m-%d %H:%M:%S"),
+            },
+        )
+        self.assertContains(response, "Overlaps the time logged")
+        self.assertEqual(TimeLog.objects.count(), 1)
+
+    def test_start_and_stop(self):
+        """The timer logs the time between start and stop from the server clock."""
+        url = reverse("timer")
+        self.assertEqual(self.client.get(url).json(), {"running": False})
+        with self.clock(0):
+            response = self.client.post(url, {"task": self.task.pk})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.post(url, {"task": self.task.pk}).status_code, 409)
+        self.assertEqual(self.client.get(url).json()["task"], self.task.pk)
+        with self.clock(1.25):
+            response = self.client.post(reverse("stop-timer"))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["duration_seconds"], 4500)
+        self.assertEqual(self.client.post(reverse("stop-timer")).status_code, 409)
+
+    def test_concurrent_start_conflicts(self):
+        """A start racing another one past the check is a conflict, not an error."""
+        self.client.post(reverse("timer"), {"task": self.task.pk})
+        with mock.patch("django.db.models.QuerySet.exists", return_value=False):
+            response = self.client.post(reverse("timer"), {"task": self.task.pk})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(ActiveTimer.objects.count(), 1)
+
+    def test_log_time_on_own_tasks_only(self):
+        """Logging time on an unknown or another employee's task is not found."""
+        task = Task.objects.create(
+            title="Other",
+            description="",
+            assigned_to=self.other,
+            due_date=datetime.date(2024, 6, 30),
+        )
+        for task_id in (task.pk, 9999):
+            response = self.client.get(reverse("log-time", args=[task_id]))
+            self.assertEqual(response.status_code, 404)
+
+    def test_start_validates_task(self):
+        """Timers only run on the employee's own tasks, for logged-in users."""
+        task = Task.objects.create(
+            title="Other",
+            description="",
+            assigned_to=self.other,
+            due_date=datetime.date(2024, 6, 30),
+        )
+        for value in (task.pk, "abc", ""):
+            response = self.client.post(reverse("timer"), {"task": value})
+            self.assertEqual(response.status_code, 400)
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("timer")).status_code, 401)
+
+    def test_discard(self):
+        """A discarded timer records nothing."""
+        self.client.post(reverse("timer"), {"task": self.task.pk})
+        self.assertEqual(self.client.delete(reverse("timer")).status_code, 204)
+        self.assertEqual(self.client.post(reverse("stop-timer")).status_code, 409)
+        self.assertFalse(TimeLog.objects.exists())
+
+    def test_sync_reconciles_batch(self):
+        """Offline intervals are recorded once; overlaps and bad rows are reported."""
+        timers.record(self.employee, self.task, self.at(0), self.at(1))
+        payload = self.sync(
+            [
+                self.interval(3, 4),
+                self.interval(0.5, 2),  # overlaps the recorded log
+                self.interval(1, 2),
+                self.interval(1.5, 2.5),  # overlaps the interval above
+                {"task": self.task.pk, "start_time": "yesterday"},
+                self.interval(5, 6, task=Task(pk=0)),
+            ]
+        )
+        self.assertEqual(
+            [
+                (log["start_time"], log["duration_seconds"])
+                for log in payload["created"]
+            ],
+            [(self.at(1).isoformat(), 3600), (self.at(3).isoformat(), 3600)],
+        )
+        self.assertEqual([error["index"] for error in payload["errors"]], [1, 3, 4, 5])
+        again = self.sync([self.interval(3, 4), self.interval(6, 7)])
+        self.assertEqual(again["duplicates"], [0])
+        self.assertEqual(len(again["created"]), 1)
+        self.assertEqual(TimeLog.objects.count(), 4)
+
+    def test_sync_rejects_malformed_body(self):
+        """Bodies that are not a JSON list are rejected."""
+        for body in ("{", '{"task": 1}'):
+            response = self.client.post(
+                reverse("sync-time-logs"), body, content_type="application/json"
+            )
+            self.assertEqual(response.status_code, 400)
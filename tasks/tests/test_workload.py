@@ -0,0 +1,104 @@
+"""
+Tests for employee workloads.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Department, Task, TimeLog, Workload
+from .helpers import make_employee
+
+
+class WorkloadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        hod = User.objects.create_user(username="hod", password="x")
+        cls.department = Department.objects.create(name="Labs", hod=hod)
+        cls.busy = make_employee("busy", cls.department)
+        cls.free = make_employee("free", cls.department)
+        cls.today = timezone.localdate()
+
+    def add_task(self, employee, priority="Medium", days=3, **fields):
+        """Assign a task due in ``days`` days to ``employee``."""
+        return Task.objects.create(
+            title="Task",
+            description="",
+            assigned_to=employee,
+            priority=priority,
+            due_date=self.today + datetime.timedelta(days=days),
+            **fields,
+        )
+
+    def test_maintained_from_signals(self):
+        """Task and time log changes refresh the owner's workload row."""
+        self.add_task(self.busy, "High", days=5)
+        task = self.add_task(self.busy, "Low", days=2)
+        self.add_task(self.busy, completed=True)
+        now = timezone.now()
+        TimeLog.objects.create(
+            task=task,
+            employee=self.busy,
+            start_time=now - datetime.timedelta(hours=2),
+            end_time=now,
+            duration=datetime.timedelta(hours=2),
+        )
+        TimeLog.objects.create(
+            task=task,
+            employee=self.busy,
+            start_time=now - datetime.timedelta(days=9),
+            end_time=now - datetime.timedelta(days=9),
+            duration=datetime.timedelta(hours=5),
+        )
+        load = Workload.objects.get(employee=self.busy)
+        self.assertEqual((load.open_tasks, load.weighted_load), (2, 4))
+        self.assertEqual(load.seconds_last_7_days, 7200)
+        self.assertEqual(load.next_due_date, task.due_date)
+
+        task.assigned_to = self.free
+        task.save()
+        self.assertEqual(Workload.objects.get(employee=self.busy).weighted_load, 3)
+        self.assertEqual(Workload.objects.get(employee=self.free).weighted_load, 1)
+
+    def test_deleting_an_employee_drops_the_row(self):
+        """Cascaded task deletes do not leave a row for a deleted employee."""
+        self.add_task(self.busy)
+        self.busy.delete()
+        self.assertFalse(Workload.objects.filter(employee_id=self.busy.pk).exists())
+
+    def test_autocomplete_sorts_by_load_in_one_query(self):
+        """The assignment endpoint searches and orders by load in one query."""
+        self.add_task(self.busy, "High")
+        self.client.force_login(self.admin)
+        url = reverse("assignee-autocomplete")
+        self.client.get(url)
+        with self.assertNumQueries(3):
+            data = self.client.get(url).json()
+        self.assertEqual([row["username"] for row in data["results"]], ["free", "busy"])
+        self.assertEqual(data["results"][1]["weighted_load"], 3)
+        self.assertFalse(data["pagination"]["more"])
+
+        data = self.client.get(url, {"q": "bus"}).json()
+        self.assertEqual([row["username"] for row in data["results"]], ["busy"])
+
+    def test_create_task_assigns_selected_employee(self):
+        """The task is assigned to the employee picked in the form."""
+        self.client.force_login(self.admin)
+        self.client.post(
+            reverse("create-task"),
+            {
+                "title": "Review",
+                "description": "Quarterly review",
+                "assigned_to": self.free.pk,
+                "due_date": "2030-01-01",
+                "priority": "High",
+            },
+        )
+        self.assertEqual(Task.objects.get(title="Review").assigned_to, self.free)
+        self.assertEqual(Workload.objects.get(employee=self.free).weighted_load, 3)
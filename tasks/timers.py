@@ -0,0 +1,224 @@
+"""
+Timer based time logging.
+
+Employees start a timer on one of their tasks and stop it to record a
+``TimeLog``, so the start and end times, and the duration computed from
+them, come from the server's clock. Every log written here is checked for
+overlaps with the employee's other logs by
+:meth:`~tasks.models.TimeLogQuerySet.overlapping`, a bounded range scan of
+the ``(employee, start_time, end_time)`` index.
+
+Clients that were offline submit the intervals they timed in one batch;
+:func:`reconcile` records them in one transaction, skipping intervals that
+were already recorded and reporting those that are invalid or overlap.
+
+Callers run the writing functions through :func:`tasks.sqlite.retry_on_lock`,
+which wraps them in a transaction.
+"""
+
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import outbox
+from .models import ActiveTimer, Employee, Task, TimeLog
+
+
+class Conflict(ValueError):
+    """The change clashes with a running timer or with existing logs."""
+
+
+@dataclass
+class Reconciled:
+    """
+    Outcome of a batch of offline intervals.
+
+    Attributes:
+        created (list): Time logs recorded.
+        duplicates (list): Indexes of intervals recorded before.
+        errors (list): ``{"index": n, "errors": [messages]}`` entries for
+            intervals that were rejected, indexed from 0.
+    """
+
+    created: list = field(default_factory=list)
+    duplicates: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+
+
+def _lock(employee):
+    """
+    Serialize the time logging of ``employee`` on databases that can.
+
+    The change feed is locked first, as every time log write does.
+    """
+    outbox.lock()
+    if connection.features.has_select_for_update:
+        list(Employee.objects.select_for_update().filter(pk=employee.pk).values("pk"))
+
+
+def _overlap_error(log):
+    """Return a ``Conflict`` naming the existing ``log``."""
+    return Conflict(
+        f"Overlaps the time logged from {log.start_time:%Y-%m-%d %H:%M} "
+        f"to {log.end_time:%Y-%m-%d %H:%M}."
+    )
+
+
+def record(employee, task, start_time, end_time):
+    """
+    Save a time log of ``employee`` on ``task`` from ``start_time`` to ``end_time``.
+
+    Raises ``ValidationError`` for an invalid interval and :class:`Conflict`
+    when it overlaps another of the employee's logs.
+    """
+    log = TimeLog(
+        task=task, employee=employee, start_time=start_time, end_time=end_time
+    )
+    log.clean()
+    _lock(employee)
+    existing = TimeLog.objects.overlapping(employee, start_time, end_time).first()
+    if existing is not None:
+        raise _overlap_error(existing)
+    log.save()
+    return log
+
+
+def running(employee):
+    """Return the running timer of ``employee``, or ``None``."""
+    return ActiveTimer.objects.select_related("task").filter(employee=employee).first()
+
+
+def start(employee, task, at=None):
+    """Start a timer on ``task``; raises :class:`Conflict` if one is running."""
+    if ActiveTimer.objects.filter(employee=employee).exists():
+        raise Conflict("A timer is already running.")
+    try:
+        # A concurrent start may have won since the check.
+        with transaction.atomic():
+            return ActiveTimer.objects.create(
+                employee=employee, task=task, started_at=at or timezone.now()
+            )
+    except IntegrityError as exc:
+        raise Conflict("A timer is already running.") from exc
+
+
+def stop(employee, at=None):
+    """
+    Stop the running timer of ``employee`` and return the log recorded.
+
+    Raises :class:`Conflict` when no timer runs or its interval overlaps
+    another log, and ``ValidationError`` when it ran for too long; the
+    timer keeps running in both cases so it can be discarded instead.
+    """
+    timer = running(employee)
+    if timer is None:
+        raise Conflict("No timer is running.")
+    log = record(employee, timer.task, timer.started_at, at or timezone.now())
+    timer.delete()
+    return log
+
+
+def discard(employee):
+    """Delete the running timer of ``employee``; return whether one ran."""
+    deleted, _ = ActiveTimer.objects.filter(employee=employee).delete()
+    return bool(deleted)
+
+
+def _parse(interval, tasks):
+    """Return ``(task id, start, end)`` of an offline interval; raises ``ValueError``."""
+    if not isinstance(interval, dict):
+        raise ValueError("Expected an object.")
+    task_id = interval.get("task")
+    if task_id not in tasks:
+        raise ValueError(f"Unknown task {task_id!r}.")
+    times = []
+    for name in ("start_time", "end_time"):
+        value = interval.get(name)
+        moment = parse_datetime(value) if isinstance(value, str) else None
+        if moment is None:
+            raise ValueError(f"'{name}' must be an ISO 8601 date and time.")
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        times.append(moment)
+    return task_id, times[0], times[1]
+
+
+def _validate(employee, intervals, result):
+    """
+    Return ``(start, end, task, index)`` of the valid ``intervals``, by start.
+
+    The errors of the others are added to ``result``.
+    """
+    tasks = {
+        task.pk: task
+        for task in Task.objects.filter(
+            assigned_to=employee,
+            pk__in=[
+                item.get("task")
+                for item in intervals
+                if isinstance(item, dict) and isinstance(item.get("task"), int)
+            ],
+        )
+    }
+    parsed = []
+    for index, interval in enumerate(intervals):
+        try:
+            task_id, begin, end = _parse(interval, tasks)
+            TimeLog(start_time=begin, end_time=end).clean()
+        except ValidationError as exc:
+            result.errors.append({"index": index, "errors": exc.messages})
+        except ValueError as exc:
+            result.errors.append({"index": index, "errors": [str(exc)]})
+        else:
+            parsed.append((begin, end, tasks[task_id], index))
+    return sorted(parsed, key=lambda item: (item[0], item[3]))
+
+
+def reconcile(employee, intervals):
+    """
+    Record the offline ``intervals`` of ``employee`` and return :class:`Reconciled`.
+
+    Each interval is ``{"task": id, "start_time": iso, "end_time": iso}`` on
+    one of the employee's tasks. Intervals identical to a recorded log are
+    duplicates of an earlier submission; those overlapping a recorded log
+    or an earlier interval of the batch are rejected. The existing logs are
+    read with one overlap query spanning the whole batch.
+    """
+    result = Reconciled()
+    parsed = _validate(employee, intervals, result)
+    if not parsed:
+        return result
+
+    _lock(employee)
+    span_start = min(begin for begin, _, _, _ in parsed)
+    span_end = max(end for _, end, _, _ in parsed)
+    recorded = list(
+        TimeLog.objects.overlapping(employee, span_start, span_end).only(
+            "task_id", "start_time", "end_time"
+        )
+    )
+    for begin, end, task, index in parsed:
+        if any(
+            (log.task_id, log.start_time, log.end_time) == (task.pk, begin, end)
+            for log in recorded
+        ):
+            result.duplicates.append(index)
+            continue
+        clash = next(
+            (log for log in recorded if log.start_time < end and log.end_time > begin),
+            None,
+        )
+        if clash is not None:
+            result.errors.append(
+                {"index": index, "errors": [str(_overlap_error(clash))]}
+            )
+            continue
+        log = TimeLog(task=task, employee=employee, start_time=begin, end_time=end)
+        log.save()
+        recorded.append(log)
+        result.created.append(log)
+    result.errors.sort(key=lambda error: error["index"])
+    return result
@@ -5,9 +5,10 @@ This module defines all the URL routes for the tasks app, including
 authentication, task management, department management, and employee management.
 """
 
-from django.urls import path
+from django.contrib.auth import views as auth_views
+from django.urls import path, reverse_lazy
 
-from . import views
+from . import async_views, views
 
 # URL patterns for tasks
 urlpatterns = [
@@ -15,10 +16,66 @@ urlpatterns = [
     path("login/", views.user_login, name="login"),
     path("logout/", views.user_logout, name="logout"),
     path("home/", views.home, name="home"),
+    path("search/", views.search_view, name="search"),
+    path("metrics", views.metrics_view, name="metrics"),
+    path("changes", views.changes_feed, name="changes"),
     path("users/", views.user_list, name="user-list"),
     path("create_task/", views.create_task, name="create-task"),
+    path("tasks/bulk/", views.bulk_create_tasks, name="bulk-create-tasks"),
+    path("users/onboard/", views.onboard_people, name="onboard-people"),
+    path(
+        "reset/<uidb64>/<token>/",
+        auth_views.PasswordResetConfirmView.as_view(
+            success_url=reverse_lazy("password_reset_complete")
+        ),
+        name="password_reset_confirm",
+    ),
+    path(
+        "reset/done/",
+        auth_views.PasswordResetCompleteView.as_view(),
+        name="password_reset_complete",
+    ),
+    path(
+        "tasks/assignees/",
+        views.assignee_autocomplete,
+        name="assignee-autocomplete",
+    ),
+    path("export/<str:kind>/", views.export_data, name="export"),
+    path("reports/time/", views.time_report, name="time-report"),
+    path(
+        "reports/productivity/",
+        views.productivity_report,
+        name="productivity-report",
+    ),
     path("employee_dashboard/", views.employee_dashboard, name="employee-dashboard"),
     path("log_time/<int:task_id>/", views.log_time, name="log-time"),
+    path("history/", views.history, name="history"),
+    # JSON API
+    path("api/<str:resource>/", views.api_list, name="api-list"),
+    path("api/<str:resource>/<int:pk>/", views.api_detail, name="api-detail"),
+    path("timer/", views.timer, name="timer"),
+    path("timer/stop/", views.stop_timer, name="stop-timer"),
+    path("timer/sync/", views.sync_time_logs, name="sync-time-logs"),
+    path(
+        "recurring/<int:rule_id>/<str:day>/",
+        views.log_occurrence,
+        name="log-occurrence",
+    ),
+    path("recurring/new/", views.create_recurrence, name="create-recurrence"),
+    # Goal URLs
+    path("create_goal/", views.create_goal, name="create-goal"),
+    path("goal_dashboard/", views.goal_dashboard, name="goal-dashboard"),
+    # Async (ASGI) dashboard URLs
+    path(
+        "async/employee_dashboard/",
+        async_views.employee_dashboard,
+        name="async-employee-dashboard",
+    ),
+    path(
+        "async/goal_dashboard/",
+        async_views.goal_dashboard,
+        name="async-goal-dashboard",
+    ),
     # Department URLs
     path("create_department/", views.create_department, name="create-department"),
     path("department_list/", views.department_list, name="department-list"),
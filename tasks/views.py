@@ -5,23 +5,76 @@ This module contains views for managing tasks, departments, employees, goals,
 and user authentication, including login, logout, user creation, and task management.
 """
 
+import csv
+import datetime
+import functools
+import io
+import json
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import User
-from django.core.paginator import Paginator
+from django.core.exceptions import ValidationError
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseNotAllowed,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
-
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.http import require_GET, require_POST
+
+from . import (
+    api,
+    archive,
+    bulk,
+    caching,
+    counters,
+    exports,
+    jobs,
+    metrics,
+    onboarding,
+    outbox,
+    permissions,
+    recurrence,
+    reports,
+    rollups,
+    routing,
+    search,
+    sqlite,
+    timers,
+    workload,
+)
 from .forms import (
     DepartmentForm,
     EmployeeForm,
     GoalForm,
+    RecurrenceForm,
     TaskForm,
     TimeLogForm,
     UserCreationForm,
     UserEditForm,
 )
-from .models import Department, Employee, Goal, Task
+from .models import Department, Employee, Goal, JournalEntry, Recurrence, Task
+from .pagination import InvalidCursor, decode_cursor, encode_cursor, paginate
+
+# Number of rows shown per page in every listing view.
+PAGE_SIZE = 10
+
+# Cache namespaces (see ``tasks.caching``) each cached listing depends on.
+DEPARTMENT_LIST_NAMESPACES = ("departments", "users")
+EMPLOYEE_LIST_NAMESPACES = ("employees", "departments", "users")
+
+# Seconds of replica lag (see ``tasks.routing``) each kind of page tolerates.
+DASHBOARD_LAG = 5
+LISTING_LAG = 30
+REPORT_LAG = 300
 
 
 # Admin and HOD Views
@@ -30,6 +83,11 @@ def is_admin(user):
     return user.is_staff
 
 
+def is_manager(user):
+    """Check if the user is an admin or heads a department."""
+    return permissions.is_manager(user)
+
+
 @login_required
 @user_passes_test(is_admin)
 def add_user(request):
@@ -99,44 +157,595 @@ def edit_user(request, user_id):
 
 
 @login_required
+@user_passes_test(is_manager)
 def create_task(request):
-    """Create a new task. Only accessible by admin or HOD users."""
-    if request.user.is_staff:
-        if request.method == "POST":
-            form = TaskForm(request.POST)
-            if form.is_valid():
-                task = form.save(commit=False)
-                task.assigned_to = Employee.objects.get(user=request.user)
-                task.save()
-                return redirect("employee-dashboard")
-        form = TaskForm()
-        return render(request, "tasks/create_tasks.html", {"form": form})
+    """
+    Create a new task. Only accessible by admin or HOD users.
+
+    Heads of department assign tasks to the employees they manage.
+    """
+    form = TaskForm(request.POST or None, user=request.user)
+    if request.method == "POST" and form.is_valid():
+        sqlite.retry_on_lock(form.save)
+        return redirect("employee-dashboard")
+    return render(request, "tasks/create_tasks.html", {"form": form})
+
+
+@login_required
+@user_passes_test(is_admin)
+def create_recurrence(request):
+    """Create a recurring task. Only accessible by admin staff."""
+    form = RecurrenceForm(request.POST or None)
+    if request.method == "POST" and form.is_valid():
+        form.save()
+        messages.success(request, "Recurring task created successfully.")
+        return redirect("home")
+    return render(request, "tasks/create_recurrence.html", {"form": form})
+
+
+@login_required
+@user_passes_test(is_manager)
+def assignee_autocomplete(request):
+    """
+    Search employees to assign a task to, least loaded first.
+
+    Answers ``?q=<text>&offset=<n>`` in Select2's format with each
+    employee's workload, from a single query. Heads of department only
+    find the employees they manage.
+    """
+    text = request.GET.get("q", "").strip()
+    try:
+        offset = max(int(request.GET.get("offset", 0)), 0)
+    except ValueError:
+        offset = 0
+    rows = workload.candidates(
+        text,
+        limit=PAGE_SIZE,
+        offset=offset,
+        employees=Employee.objects.visible_to(permissions.scope_of(request.user)),
+    )
+    results = [
+        {
+            "id": row["pk"],
+            "text": f"{row['user__first_name']} {row['user__last_name']}".strip()
+            or row["user__username"],
+            "username": row["user__username"],
+            "department": row["department__name"],
+            "position": row["position"],
+            "open_tasks": row["workload__open_tasks"] or 0,
+            "weighted_load": row["workload__weighted_load"] or 0,
+            "hours_last_7_days": round(
+                (row["workload__seconds_last_7_days"] or 0) / 3600, 1
+            ),
+            "next_due_date": row["workload__next_due_date"],
+        }
+        for row in rows[:PAGE_SIZE]
+    ]
+    return JsonResponse(
+        {"results": results, "pagination": {"more": len(rows) > PAGE_SIZE}}
+    )
+
+
+@login_required
+@user_passes_test(is_admin)
+@require_POST
+def bulk_create_tasks(request):
+    """
+    Create many tasks from an uploaded CSV/JSON file or a JSON request body.
+
+    Responds with the number of tasks created and the errors of each invalid
+    row. Pass ``partial=1`` to insert the valid rows despite errors.
+    """
+    upload = request.FILES.get("file")
+    if upload is not None:
+        fmt = "json" if upload.name.endswith((".json", ".jsonl")) else "csv"
+        stream = upload
+    else:
+        fmt = "json"
+        stream = io.BytesIO(request.body)
+
+    try:
+        rows = bulk.read_rows(stream, fmt)
+    except (ValueError, csv.Error) as exc:
+        return JsonResponse({"error": f"Could not parse {fmt}: {exc}"}, status=400)
+
+    partial = request.GET.get("partial") == "1"
+    result = bulk.import_tasks(rows, partial=partial)
+    status = 201 if result.created else 400
+    return JsonResponse(
+        {"created": result.created, "errors": result.errors}, status=status
+    )
+
+
+@login_required
+@user_passes_test(is_admin)
+@require_POST
+def onboard_people(request):
+    """
+    Create users and employees from an uploaded CSV file.
+
+    The whole file is imported before the response is returned, so the
+    writes belong to the request, and the response holds one JSON line of
+    progress per chunk. Users get unusable passwords and are emailed a link
+    to choose one by the job queue, so no password is hashed in the request.
+    """
+    upload = request.FILES.get("file")
+    if upload is None:
+        return JsonResponse({"error": "Upload a CSV file as 'file'."}, status=400)
+    rows = csv.DictReader(io.TextIOWrapper(upload.file, encoding="utf-8-sig"))
+
+    lines = []
+    for step in onboarding.import_people(rows, hash_passwords=False):
+        if step.user_ids:
+            jobs.enqueue("onboarding_invites", {"user_ids": step.user_ids})
+        line = {
+            "processed": step.processed,
+            "created": step.created,
+            "errors": step.errors,
+        }
+        lines.append(json.dumps(line) + "\n")
+    return HttpResponse("".join(lines), content_type="application/x-ndjson")
+
+
+@login_required
+@user_passes_test(is_admin)
+def export_data(request, kind):
+    """
+    Stream an export of tasks, time logs, goals or journal entries.
+
+    Supports ``format`` (csv or jsonl) and the ``department``, ``employee``,
+    ``since`` and ``until`` filters.
+    """
+    if kind not in exports.EXPORTS:
+        raise Http404(f"Unknown export '{kind}'.")
+    fmt = request.GET.get("format", "csv")
+    if fmt not in exports.FORMATS:
+        return HttpResponseBadRequest(f"Unsupported format '{fmt}'.")
+    try:
+        filters = {
+            "department": _optional_int(request.GET.get("department")),
+            "employee": _optional_int(request.GET.get("employee")),
+            "since": exports.parse_filter_date(request.GET.get("since")),
+            "until": exports.parse_filter_date(request.GET.get("until")),
+        }
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    content_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    response = StreamingHttpResponse(
+        exports.export_lines(kind, fmt, **filters), content_type=content_type
+    )
+    response["Content-Disposition"] = f'attachment; filename="{kind}.{fmt}"'
+    return response
+
+
+def _optional_int(value):
+    """Parse an optional integer query parameter."""
+    return int(value) if value else None
+
+
+@login_required
+@user_passes_test(is_admin)
+@routing.replica_reads(REPORT_LAG)
+def time_report(request):
+    """Show hours logged per department per week, a quarter by default."""
+    today = timezone.localdate()
+    try:
+        until = exports.parse_filter_date(request.GET.get("until")) or today
+        since = exports.parse_filter_date(request.GET.get("since")) or (
+            until - datetime.timedelta(weeks=13)
+        )
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    weeks, rows = rollups.department_weekly_hours(since, until)
+    context = {"since": since, "until": until, "weeks": weeks, "rows": rows}
+    return render(request, "tasks/time_report.html", context)
+
+
+@login_required
+@user_passes_test(is_admin)
+@routing.replica_reads(REPORT_LAG)
+def productivity_report(request):
+    """Show task latency, on-time rates and hours per task distributions."""
+    try:
+        department_id = _optional_int(request.GET.get("department"))
+    except ValueError:
+        return HttpResponseBadRequest("Invalid department.")
+    department = None
+    if department_id is not None:
+        department = get_object_or_404(Department, pk=department_id)
+
+    context = {
+        "department": department,
+        "departments": Department.objects.order_by("name"),
+        "report": reports.productivity_report(department),
+    }
+    return render(request, "tasks/productivity_report.html", context)
+
+
+def _machine_access(request, setting):
+    """
+    Whether ``request`` may read a feed meant for other systems.
+
+    They send ``Authorization: Bearer <token>`` with the token in
+    ``setting``; without a configured token only staff users may read it.
+    """
+    token = getattr(settings, setting, "")
+    if token:
+        return request.headers.get("Authorization") == f"Bearer {token}"
+    return request.user.is_staff
+
+
+def metrics_view(request):
+    """
+    Expose request metrics in the Prometheus text format.
+
+    Scrapers authenticate with ``Authorization: Bearer <METRICS_TOKEN>``;
+    without a configured token only staff users may read the metrics.
+    """
+    if not _machine_access(request, "METRICS_TOKEN"):
+        return HttpResponse("Forbidden", status=403, content_type="text/plain")
+    return HttpResponse(
+        metrics.REGISTRY.render(), content_type="text/plain; version=0.0.4"
+    )
+
+
+def changes_feed(request):
+    """
+    Stream the change events after ``?since=<sequence>`` as JSON lines.
+
+    Returns at most ``limit`` events (``CHANGES_PAGE_SIZE`` by default);
+    ``X-Latest-Sequence`` tells consumers whether more are waiting.
+    Consumers authenticate with ``Authorization: Bearer <CHANGES_TOKEN>``;
+    without a configured token only staff users may read the feed.
+    """
+    if not _machine_access(request, "CHANGES_TOKEN"):
+        return HttpResponse("Forbidden", status=403, content_type="text/plain")
+    page_size = getattr(settings, "CHANGES_PAGE_SIZE", 1000)
+    try:
+        since = int(request.GET.get("since", 0))
+        limit = int(request.GET.get("limit", page_size))
+    except ValueError:
+        return HttpResponseBadRequest("'since' and 'limit' must be integers.")
+    if since < 0 or not 0 < limit <= page_size:
+        return HttpResponseBadRequest(
+            f"'since' must be positive and 'limit' between 1 and {page_size}."
+        )
+    events = outbox.changes(since, limit)
+    response = StreamingHttpResponse(
+        map(outbox.to_line, events), content_type="application/x-ndjson"
+    )
+    response["X-Latest-Sequence"] = str(outbox.latest())
+    return response
 
-    return redirect("unauthorized")  # or render a 403 page
+
+@login_required
+@routing.replica_reads(LISTING_LAG)
+def search_view(request):
+    """
+    Search tasks, goals and journal entries, best matches first.
+
+    Staff search everything; other users search only their own records.
+    """
+    query = request.GET.get("q", "").strip()
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page = 1
+
+    hits = []
+    if query and (request.user.is_staff or request.employee is not None):
+        employee_id = None if request.user.is_staff else request.employee.pk
+        # Fetch one extra hit to learn whether a next page exists.
+        hits = search.search(
+            query, employee_id, limit=PAGE_SIZE + 1, offset=(page - 1) * PAGE_SIZE
+        )
+
+    context = {
+        "query": query,
+        "hits": hits[:PAGE_SIZE],
+        "page": page,
+        "has_next": len(hits) > PAGE_SIZE,
+    }
+    return render(request, "tasks/search.html", context)
 
 
 # Employee Views
 @login_required
+@routing.replica_reads(DASHBOARD_LAG)
+@caching.conditional(caching.employee_namespaces)
 def employee_dashboard(request):
-    """Display the employee's dashboard with assigned tasks."""
-    tasks = Task.objects.filter(assigned_to__user=request.user)
-    return render(request, "tasks/employee_dashboard.html", {"tasks": tasks})
+    """Display the employee's dashboard with tasks, goals and journal entries."""
+    employee = request.employee
+    tasks = SimpleLazyObject(
+        lambda: paginate(
+            request,
+            Task.objects.for_employee(employee),
+            PAGE_SIZE,
+            ("completed", "due_date"),
+        )
+    )
+    context = {
+        "tasks": tasks,
+        "goals": Goal.objects.for_employee(employee)[:PAGE_SIZE],
+        "journal_entries": JournalEntry.objects.for_employee(employee)[:PAGE_SIZE],
+        # Called by the template, so cached renders skip the expansion.
+        "recurring": functools.partial(recurrence.pending, employee),
+        "fragment_key": caching.page_key(
+            request, *caching.employee_namespaces(request)
+        ),
+        "fragment_timeout": caching.fragment_timeout(),
+    }
+    return render(request, "tasks/employee_dashboard.html", context)
 
 
 @login_required
 def log_time(request, task_id):
-    """Log working time for a specific task."""
-    task = Task.objects.get(id=task_id)
+    """Log working time for one of the employee's tasks, rejecting overlaps."""
+    task = get_object_or_404(Task, pk=task_id, assigned_to=request.employee)
+    form = TimeLogForm(request.POST or None)
+    if request.method == "POST" and form.is_valid():
+        try:
+            sqlite.retry_on_lock(
+                timers.record,
+                request.employee,
+                task,
+                form.cleaned_data["start_time"],
+                form.cleaned_data["end_time"],
+            )
+        except timers.Conflict as exc:
+            form.add_error(None, str(exc))
+        else:
+            return redirect("employee-dashboard")
+    return render(request, "tasks/log_time.html", {"form": form, "task": task})
+
+
+@login_required
+def log_occurrence(request, rule_id, day):
+    """
+    Log time against, or complete, one occurrence of a recurring task.
+
+    The occurrence is only stored as a ``Task`` when the form is submitted.
+    """
+    rule = get_object_or_404(Recurrence, pk=rule_id, assigned_to=request.employee)
+    try:
+        day = datetime.date.fromisoformat(day)
+    except ValueError as exc:
+        raise Http404("Invalid date.") from exc
+    if not recurrence.occurs_on(rule, day):
+        raise Http404("The task does not recur on that date.")
+    occurrence = recurrence.Occurrence(rule, day)
+
+    form = TimeLogForm()
     if request.method == "POST":
+        if "complete" in request.POST:
+            sqlite.retry_on_lock(_complete_occurrence, rule, day)
+            return redirect("employee-dashboard")
         form = TimeLogForm(request.POST)
         if form.is_valid():
-            log = form.save(commit=False)
-            log.task = task
-            log.employee = Employee.objects.get(user=request.user)
-            log.save()
-            return redirect("employee-dashboard")
-    form = TimeLogForm()
-    return render(request, "tasks/log_time.html", {"form": form, "task": task})
+
+            def save():
+                task = recurrence.materialize(rule, day)
+                start, end = (
+                    form.cleaned_data["start_time"],
+                    form.cleaned_data["end_time"],
+                )
+                return timers.record(request.employee, task, start, end)
+
+            try:
+                sqlite.retry_on_lock(save)
+            except timers.Conflict as exc:
+                form.add_error(None, str(exc))
+            else:
+                return redirect("employee-dashboard")
+    context = {"form": form, "task": occurrence, "occurrence": occurrence}
+    return render(request, "tasks/log_time.html", context)
+
+
+def _complete_occurrence(rule, day):
+    """Store the occurrence of ``rule`` on ``day`` as a completed task."""
+    task = recurrence.materialize(rule, day)
+    if not task.completed:
+        task.completed = True
+        task.save()
+
+
+# Timer API
+def _time_log_json(log):
+    """Return the JSON representation of a time log."""
+    return {
+        "id": log.pk,
+        "task": log.task_id,
+        "start_time": log.start_time.isoformat(),
+        "end_time": log.end_time.isoformat(),
+        "duration_seconds": int(log.duration.total_seconds()),
+    }
+
+
+def _employee_api(view):
+    """Require a logged-in employee; answer JSON errors otherwise."""
+
+    @functools.wraps(view)
+    def inner(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({"error": "Log in first."}, status=401)
+        if request.employee is None:
+            return JsonResponse({"error": "No employee profile."}, status=403)
+        return view(request, *args, **kwargs)
+
+    return inner
+
+
+@_employee_api
+def timer(request):
+    """
+    Show (GET), start (POST) or discard (DELETE) the employee's timer.
+
+    Starting takes ``task`` (one of the employee's tasks) as form data.
+    Times come from the server's clock.
+    """
+    if request.method == "POST":
+        task_id = request.POST.get("task", "")
+        task = None
+        if task_id.isdigit():
+            task = Task.objects.filter(
+                pk=int(task_id), assigned_to=request.employee
+            ).first()
+        if task is None:
+            return JsonResponse({"error": "Unknown task."}, status=400)
+        try:
+            running = sqlite.retry_on_lock(timers.start, request.employee, task)
+        except timers.Conflict as exc:
+            return JsonResponse({"error": str(exc)}, status=409)
+        status = 201
+    elif request.method == "DELETE":
+        sqlite.retry_on_lock(timers.discard, request.employee)
+        return HttpResponse(status=204)
+    elif request.method == "GET":
+        running = timers.running(request.employee)
+        status = 200
+    else:
+        return HttpResponseNotAllowed(["GET", "POST", "DELETE"])
+    if running is None:
+        return JsonResponse({"running": False})
+    payload = {
+        "running": True,
+        "task": running.task_id,
+        "started_at": running.started_at.isoformat(),
+    }
+    return JsonResponse(payload, status=status)
+
+
+@require_POST
+@_employee_api
+def stop_timer(request):
+    """Stop the employee's timer and record the time log."""
+    try:
+        log = sqlite.retry_on_lock(timers.stop, request.employee)
+    except timers.Conflict as exc:
+        return JsonResponse({"error": str(exc)}, status=409)
+    except ValidationError as exc:
+        return JsonResponse({"error": " ".join(exc.messages)}, status=400)
+    return JsonResponse(_time_log_json(log), status=201)
+
+
+@require_POST
+@_employee_api
+def sync_time_logs(request):
+    """
+    Record a batch of intervals timed offline, in one transaction.
+
+    Takes a JSON list of ``{"task", "start_time", "end_time"}`` objects and
+    answers with the logs created, the indexes of intervals already
+    recorded and the errors of rejected ones.
+    """
+    try:
+        intervals = json.loads(request.body)
+    except ValueError as exc:
+        return JsonResponse({"error": f"Could not parse JSON: {exc}"}, status=400)
+    if not isinstance(intervals, list):
+        return JsonResponse({"error": "Send a list of intervals."}, status=400)
+    result = sqlite.retry_on_lock(timers.reconcile, request.employee, intervals)
+    return JsonResponse(
+        {
+            "created": [_time_log_json(log) for log in result.created],
+            "duplicates": result.duplicates,
+            "errors": result.errors,
+        },
+        status=201 if result.created else 200,
+    )
+
+
+# JSON API
+def _api_user(view):
+    """Require a logged-in user; answer JSON errors otherwise."""
+
+    @functools.wraps(view)
+    def inner(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({"error": "Log in first."}, status=401)
+        return view(request, *args, **kwargs)
+
+    return inner
+
+
+def _api_namespaces(request):
+    """Namespaces versioning the API resource requested, for its ``ETag``."""
+    resource = api.RESOURCES.get(request.resolver_match.kwargs["resource"])
+    if resource is None:
+        return api.SCOPE_NAMESPACES
+    return api.namespaces(resource, api.parse_list(request.GET.get("include")))
+
+
+def _api_request(request, definition):
+    """
+    Return the columns and includes a request asks of ``definition``.
+
+    Raises ``ValueError`` for unknown fields or includes.
+    """
+    include = api.parse_list(request.GET.get("include"))
+    fields = api.parse_list(request.GET.get("fields"))
+    return api.select(definition, fields, include), include
+
+
+def _api_not_found(resource):
+    """Return the JSON response for an unknown resource."""
+    return JsonResponse({"error": f"No resource '{resource}'."}, status=404)
+
+
+@require_GET
+@_api_user
+@caching.conditional(_api_namespaces)
+def api_list(request, resource):
+    """
+    List the rows of an API resource the user may see, by id.
+
+    Supports ``fields``, ``include``, ``cursor`` and ``limit`` (at most
+    ``API_PAGE_SIZE``); see ``tasks.api``.
+    """
+    definition = api.RESOURCES.get(resource)
+    if definition is None:
+        return _api_not_found(resource)
+    page_size = getattr(settings, "API_PAGE_SIZE", 100)
+    try:
+        columns, include = _api_request(request, definition)
+        limit = int(request.GET.get("limit", page_size))
+        if not 0 < limit <= page_size:
+            raise ValueError(f"'limit' must be between 1 and {page_size}.")
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    queryset = definition.model.objects.visible_to(permissions.scope_of(request.user))
+    page = paginate(request, api.values(queryset, columns), limit, ("id",))
+    rows = list(page)
+    body = {
+        "data": rows,
+        "included": api.included(definition, rows, include),
+        "next": page.next_cursor,
+        "previous": page.previous_cursor,
+    }
+    return JsonResponse(body, encoder=api.Encoder)
+
+
+@require_GET
+@_api_user
+@caching.conditional(_api_namespaces)
+def api_detail(request, resource, pk):
+    """Return one row of an API resource; supports ``fields`` and ``include``."""
+    definition = api.RESOURCES.get(resource)
+    if definition is None:
+        return _api_not_found(resource)
+    try:
+        columns, include = _api_request(request, definition)
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    scope = permissions.scope_of(request.user)
+    queryset = definition.model.objects.visible_to(scope).filter(pk=pk)
+    row = api.values(queryset, columns).first()
+    if row is None:
+        return JsonResponse({"error": "Not found."}, status=404)
+    body = {"data": row, "included": api.included(definition, [row], include)}
+    return JsonResponse(body, encoder=api.Encoder)
 
 
 # Goal Views
@@ -147,7 +756,7 @@ def create_goal(request):
         form = GoalForm(request.POST)
         if form.is_valid():
             goal = form.save(commit=False)
-            goal.employee = Employee.objects.get(user=request.user)
+            goal.employee = request.employee
             goal.save()
             return redirect("employee-dashboard")
     form = GoalForm()
@@ -155,15 +764,49 @@ def create_goal(request):
 
 
 @login_required
+@routing.replica_reads(DASHBOARD_LAG)
 def goal_dashboard(request):
     """Display the goals for the logged-in employee."""
-    goals = Goal.objects.filter(employee__user=request.user)
+    goals = Goal.objects.for_employee(request.employee)
     return render(request, "tasks/goal_dashboard.html", {"goals": goals})
 
 
+# History Views
+@login_required
+@routing.replica_reads(LISTING_LAG)
+def history(request):
+    """
+    List the employee's completed tasks, or time logs, archived ones included.
+
+    ``?show=logs`` lists time logs; ``?before=`` continues after a page.
+    """
+    show_logs = request.GET.get("show") == "logs"
+    if show_logs:
+        read, field = archive.time_log_history, "start_time"
+    else:
+        read, field = archive.task_history, "due_date"
+    try:
+        before = None
+        if request.GET.get("before"):
+            before, _ = decode_cursor(request.GET["before"])
+        rows = read(request.employee, before, PAGE_SIZE + 1)
+    except (InvalidCursor, ValidationError, ValueError):
+        return HttpResponseBadRequest("Invalid cursor.")
+    next_cursor = None
+    if len(rows) > PAGE_SIZE:
+        rows = rows[:PAGE_SIZE]
+        next_cursor = encode_cursor([rows[-1][field], rows[-1]["id"]])
+    if show_logs:
+        titles = archive.task_titles({row["task_id"] for row in rows})
+        for row in rows:
+            row["title"] = titles.get(row["task_id"], "")
+    context = {"rows": rows, "show_logs": show_logs, "next_cursor": next_cursor}
+    return render(request, "tasks/history.html", context)
+
+
 # Admin Views for Departments and Employees
 @login_required
-@user_passes_test(lambda u: u.is_staff)  # Restrict to admin staff only
+@user_passes_test(is_admin)
 def create_department(request):
     """Create a new department. Only accessible by admin staff."""
     if request.method == "POST":
@@ -176,15 +819,31 @@ def create_department(request):
 
 
 @login_required
-@user_passes_test(lambda u: u.is_staff)
+@user_passes_test(is_manager)
+@routing.replica_reads(LISTING_LAG)
+@caching.conditional(lambda request: DEPARTMENT_LIST_NAMESPACES)
 def department_list(request):
-    """List all departments. Only accessible by admin staff."""
-    departments = Department.objects.all()
-    return render(request, "tasks/department_list.html", {"departments": departments})
+    """List the departments the admin staff or HOD manages."""
+    departments = SimpleLazyObject(
+        lambda: paginate(
+            request,
+            Department.objects.visible_to(
+                permissions.scope_of(request.user)
+            ).with_related(),
+            PAGE_SIZE,
+            ("name",),
+        )
+    )
+    context = {
+        "departments": departments,
+        "fragment_key": caching.page_key(request, *DEPARTMENT_LIST_NAMESPACES),
+        "fragment_timeout": caching.fragment_timeout(),
+    }
+    return render(request, "tasks/department_list.html", context)
 
 
 @login_required
-@user_passes_test(lambda u: u.is_staff)  # Restrict to admin staff only
+@user_passes_test(is_admin)
 def create_employee(request):
     """Create a new employee record. Only accessible by admin staff."""
     if request.method == "POST":
@@ -197,58 +856,85 @@ def create_employee(request):
 
 
 @login_required
-@user_passes_test(lambda u: u.is_staff)
+@user_passes_test(is_manager)
+@routing.replica_reads(LISTING_LAG)
+@caching.conditional(lambda request: EMPLOYEE_LIST_NAMESPACES)
 def employee_list(request):
-    """List all employees. Only accessible by admin staff."""
-    employees = Employee.objects.all()
-    return render(request, "tasks/employee_list.html", {"employees": employees})
+    """List the employees the admin staff or HOD manages."""
+    employees = SimpleLazyObject(
+        lambda: paginate(
+            request,
+            Employee.objects.visible_to(
+                permissions.scope_of(request.user)
+            ).with_related(),
+            PAGE_SIZE,
+            ("user__username",),
+        )
+    )
+    context = {
+        "employees": employees,
+        "fragment_key": caching.page_key(request, *EMPLOYEE_LIST_NAMESPACES),
+        "fragment_timeout": caching.fragment_timeout(),
+    }
+    return render(request, "tasks/employee_list.html", context)
 
 
 @login_required
+@routing.replica_reads(LISTING_LAG)
 def home(request):
     """Home page view for logged-in users."""
     user = request.user
-    department = Department.objects.all().count()
-    employees = User.objects.all().count()
+    totals = counters.get_counters()
     context = {
         "user": user,
-        "department": department,
-        "employees": employees,
+        "department": totals[counters.DEPARTMENTS],
+        "employees": totals[counters.USERS],
+        "open_tasks": totals[counters.OPEN_TASKS],
+        "overdue_tasks": totals[counters.OVERDUE_TASKS],
+        "journal_entries": totals[counters.JOURNAL_ENTRIES],
+        "hours_logged": round(totals[counters.SECONDS_LOGGED] / 3600, 1),
     }
 
     return render(request, "tasks/home.html", context)
 
 
 @login_required
-@user_passes_test(lambda u: u.is_staff)
+@user_passes_test(is_admin)
+@routing.replica_reads(LISTING_LAG)
 def user_list(request):
-    """List all users with pagination. Only accessible by admin staff."""
-    users = User.objects.all().order_by("username")
-    paginator = Paginator(users, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
-
-    return render(request, "tasks/user-list.html", {"users": page_obj})
+    """List all users with keyset pagination. Only accessible by admin staff."""
+    users = paginate(request, User.objects.all(), PAGE_SIZE, ("username",))
+    return render(request, "tasks/user-list.html", {"users": users})
 
 
+@login_required
+@user_passes_test(is_manager)
 def edit_department(request, department_id):
-    """Edit an existing department."""
-    department = get_object_or_404(Department, id=department_id)
-    if request.method == "POST":
-        form = DepartmentForm(request.POST, instance=department)
-        if form.is_valid():
-            form.save()
-            messages.success(request, "Department updated successfully.")
-            return redirect("all_departments")
-    form = DepartmentForm(instance=department)
+    """Edit an existing department. Only accessible by admin staff or its HOD."""
+    scope = permissions.scope_of(request.user)
+    department = get_object_or_404(
+        Department.objects.visible_to(scope), id=department_id
+    )
+    form = DepartmentForm(request.POST or None, instance=department)
+    if request.method == "POST" and form.is_valid():
+        form.save()
+        messages.success(request, "Department updated successfully.")
+        return redirect("department-list")
     return render(
         request, "tasks/edit_department.html", {"form": form, "department": department}
     )
 
 
+@login_required
+@user_passes_test(is_admin)
 def delete_department(request, department_id):
-    """Delete an existing department."""
-    department = get_object_or_404(Department, id=department_id)
-    department.delete()
+    """
+    Delete an existing department. Only accessible by admin staff.
+
+    The department is hidden at once and its employees, tasks and logs are
+    deleted in the background by ``tasks.archive.purge_department``.
+    """
+    department = get_object_or_404(Department.objects.active(), id=department_id)
+    archive.mark_deleted(department)
     messages.success(request, "Department deleted successfully.")
     return redirect("department-list")
@@ -0,0 +1,140 @@
+"""
+Per-employee workload used to pick assignees.
+
+Each employee has one ``Workload`` row holding their open task count, that
+count weighted by priority, the time logged in the last seven days and
+their next deadline. :func:`refresh` recomputes the rows of the employees
+touched by a ``Task`` or ``TimeLog`` save (see ``tasks.signals``) with two
+grouped queries and one upsert. The daily ``workload_refresh`` job
+refreshes everyone so time logged more than seven days ago drops out.
+
+:func:`candidates` backs the assignment autocomplete: one query that joins
+employees to their workload, filters by name and orders by load.
+"""
+
+import datetime
+
+from django.db.models import Case, Count, F, Min, Q, Sum, Value, When
+from django.utils import timezone
+
+from .models import Employee, Task, TimeLog, Workload
+
+PRIORITY_WEIGHTS = {"Low": 1, "Medium": 2, "High": 3}
+
+WINDOW = datetime.timedelta(days=7)
+
+# Employees refreshed per batch of queries.
+CHUNK_SIZE = 1000
+
+FIELDS = ("open_tasks", "weighted_load", "seconds_last_7_days", "next_due_date")
+
+
+def _weight():
+    """Return an expression of a task's priority weight."""
+    return Case(
+        *(When(priority=name, then=Value(w)) for name, w in PRIORITY_WEIGHTS.items()),
+        default=Value(0),
+    )
+
+
+def _refresh_chunk(employee_ids, since):
+    """Recompute and upsert the workload rows of ``employee_ids``."""
+    tasks = {
+        row["assigned_to"]: row
+        for row in Task.objects.filter(assigned_to__in=employee_ids, completed=False)
+        .values("assigned_to")
+        .annotate(
+            open_tasks=Count("id"),
+            weighted_load=Sum(_weight()),
+            next_due_date=Min("due_date"),
+        )
+        .order_by()
+    }
+    logged = dict(
+        TimeLog.objects.filter(employee__in=employee_ids, start_time__gte=since)
+        .values("employee")
+        .annotate(total=Sum("duration"))
+        .values_list("employee", "total")
+        .order_by()
+    )
+    empty = {"open_tasks": 0, "weighted_load": 0, "next_due_date": None}
+    rows = []
+    for employee_id in employee_ids:
+        row = tasks.get(employee_id, empty)
+        total = logged.get(employee_id)
+        rows.append(
+            Workload(
+                employee_id=employee_id,
+                open_tasks=row["open_tasks"],
+                weighted_load=row["weighted_load"],
+                next_due_date=row["next_due_date"],
+                seconds_last_7_days=int(total.total_seconds()) if total else 0,
+            )
+        )
+    Workload.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["employee"],
+        update_fields=FIELDS + ("updated_at",),
+    )
+    return len(rows)
+
+
+def refresh(employee_ids=None):
+    """
+    Recompute the workload of ``employee_ids``, or of everyone for ``None``.
+
+    Ids of employees that no longer exist are skipped. Returns the number
+    of rows written.
+    """
+    employees = Employee.objects.order_by("pk")
+    if employee_ids is not None:
+        employee_ids = set(employee_ids) - {None}
+        if not employee_ids:
+            return 0
+        employees = employees.filter(pk__in=employee_ids)
+    since = timezone.now() - WINDOW
+    ids = list(employees.values_list("pk", flat=True))
+    return sum(
+        _refresh_chunk(ids[start : start + CHUNK_SIZE], since)
+        for start in range(0, len(ids), CHUNK_SIZE)
+    )
+
+
+def candidates(text="", limit=20, offset=0, employees=None):
+    """
+    Return active employees matching ``text`` as dicts, least loaded first.
+
+    ``employees`` narrows the search to a queryset, e.g. the employees a
+    head of department manages. Employees without a workload row yet sort
+    as unloaded. Fetches one row more than ``limit`` so callers can tell
+    whether more results exist.
+    """
+    if employees is None:
+        employees = Employee.objects.all()
+    employees = employees.filter(is_active=True)
+    for word in text.split():
+        employees = employees.filter(
+            Q(user__username__icontains=word)
+            | Q(user__first_name__icontains=word)
+            | Q(user__last_name__icontains=word)
+            | Q(department__name__icontains=word)
+        )
+    return list(
+        employees.order_by(
+            F("workload__weighted_load").asc(nulls_first=True),
+            F("workload__open_tasks").asc(nulls_first=True),
+            "user__first_name",
+            "pk",
+        ).values(
+            "pk",
+            "position",
+            "user__username",
+            "user__first_name",
+            "user__last_name",
+            "department__name",
+            *(f"workload__{name}" for name in FIELDS),
+        )[
+            offset : offset + limit + 1
+        ]
+    )